@@ -1,47 +1,238 @@
 import functools
+import inspect
 import logging
+import random
+import reprlib
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Union
 
 from amqp_fabric.abstract_service_api import AbstractServiceApi
 
+from .exceptions import StreamingNotAvailable
+from .metrics import ApiCallMetrics, result_size
+from .period_streamer import (
+    DEFAULT_CHUNK_ROWS,
+    DEFAULT_CHUNK_SECONDS,
+    DEFAULT_CHUNK_TAGS,
+)
+
 log = logging.getLogger(__name__)
 
+TRACE_CONFIG_KEY = "trace"
+
+# Read-only methods a batch may run concurrently - other calls run alone, in order
+BATCH_PARALLEL_METHODS = {
+    "health_check",
+    "list_supported_connectors",
+    "target_info",
+    "list_connections",
+    "connection_status",
+    "get_connection_stats",
+    "is_connected",
+    "connection_info",
+    "read_tag_attributes",
+    "list_tags",
+    "read_tag_values",
+    "read_tag_values_multi",
+    "read_tag_values_period",
+    "list_manipulated_tags",
+    "list_jobs",
+    "get_api_stats",
+    "get_job_stats",
+    "list_job_tags",
+}
+BATCH_MAX_WORKERS = 8
+
+# Parameters of traced calls are logged abbreviated (no full frames or tag lists)
+_params_repr = reprlib.Repr()
+_params_repr.maxstring = 120
+_params_repr.maxother = 120
+
+
+def _format_params(args, kwargs):
+    params = [_params_repr.repr(a) for a in args]
+    params += [f"{k}={_params_repr.repr(v)}" for k, v in kwargs.items()]
+    return ", ".join(params)
+
+
+def _format_result(result):
+    if isinstance(result, (dict, list, tuple)) or hasattr(result, "shape"):
+        return f"{type(result).__name__}[{result_size(result)}]"
+    return _params_repr.repr(result)
+
+
+class ApiTracer:
+    """Per method latency, error and result size metrics of API calls.
+
+    Calls slower than 'slow_call_seconds' and failed calls are always logged,
+    'sample_rate' of the other calls is logged in detail (debug level).
+    """
+
+    def __init__(self, slow_call_seconds=0.5, sample_rate=1.0):
+        self.slow_call_seconds = slow_call_seconds
+        self.sample_rate = sample_rate
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _method_metrics(self, method):
+        metrics = self._metrics.get(method)
+        if metrics is None:
+            metrics = self._metrics[method] = ApiCallMetrics()
+        return metrics
+
+    def record(self, method, duration, args, kwargs, result=None, error=None):
+        slow = duration > self.slow_call_seconds
+        with self._lock:
+            metrics = self._method_metrics(method)
+            metrics.calls += 1
+            metrics.latency.add(duration)
+            metrics.latency_histogram.add(duration)
+            if slow:
+                metrics.slow_calls += 1
+            if error is None:
+                metrics.result_size.add(result_size(result))
+            else:
+                metrics.record_error(error)
+
+        if error is not None:
+            log.error(
+                f"{method}({_format_params(args, kwargs)}) => Exception {type(error)} raise: {error}"
+            )
+            log.exception(error)
+        elif slow:
+            log.warning(
+                f"SLOW API CALL: ({duration:.3f} sec.) {method}({_format_params(args, kwargs)}) "
+                f"=> {_format_result(result)}"
+            )
+        elif log.isEnabledFor(logging.DEBUG) and random.random() < self.sample_rate:
+            log.debug(
+                f"{method}({_format_params(args, kwargs)}) => {_format_result(result)} "
+                f"({duration:.3f} sec.)"
+            )
+
+    def stats(self, method=None):
+        with self._lock:
+            if method is not None:
+                metrics = self._metrics.get(method)
+                return metrics.as_dict() if metrics else None
+            return {method: m.as_dict() for method, m in self._metrics.items()}
+
+
+def plan_batch(api, calls, parallel=True):
+    """Validate batch calls and split them into runs of concurrent read-only calls
+    separated by other calls (see ServiceApi.execute_batch)
+
+    :return: [(method, bound method, kwargs)], [[call index]]
+    """
+    funcs = []
+    for call in calls:
+        method = call["method"]
+        if (
+            method.startswith("_")
+            or method == "execute_batch"
+            or not callable(getattr(ServiceApi, method, None))
+            # Streams publish their results rather than returning them
+            or inspect.iscoroutinefunction(getattr(ServiceApi, method))
+        ):
+            raise ValueError(f"Unknown API method '{method}'")
+        funcs.append((method, getattr(api, method), call.get("kwargs") or {}))
+
+    runs = []
+    for i, (method, _, _) in enumerate(funcs):
+        if (
+            parallel
+            and method in BATCH_PARALLEL_METHODS
+            and runs
+            and funcs[runs[-1][-1]][0] in BATCH_PARALLEL_METHODS
+        ):
+            runs[-1].append(i)
+        else:
+            runs.append([i])
+
+    return funcs, runs
+
+
+def batch_result(func, kwargs):
+    try:
+        return {"result": func(**kwargs)}
+    except Exception as e:
+        return {"error": str(e), "error_type": type(e).__name__}
+
+
+async def trace_async_call(api, method, coro, args, kwargs):
+    """Await API method call recording its metrics and trace (see ApiTracer) - e.g.
+    batch executed by AsyncApiDispatcher rather than by the API method itself"""
+    start = time.perf_counter()
+    try:
+        result = await coro
+    except Exception as e:
+        api._tracer.record(method, time.perf_counter() - start, args, kwargs, error=e)
+        raise e
+
+    api._tracer.record(method, time.perf_counter() - start, args, kwargs, result=result)
+    return result
+
 
 def traceapi(func):
-    """Decorates a function to show its trace."""
+    """Decorates API method to record its metrics and trace (see ApiTracer)"""
 
     @functools.wraps(func)
-    def traceapi_closure(*args, **kwargs):
+    def traceapi_closure(self, *args, **kwargs):
         """The closure."""
-
-        params_str = ", ".join([f"{a}={kwargs[a]}" for a in kwargs])
+        start = time.perf_counter()
         try:
-            curr_time = time.time()
-            result = func(*args, **kwargs)
-            if time.time() - curr_time > 0.5:
-                log.warning(
-                    f"SLOW API CALL: ({time.time() - curr_time} sec.) {func.__name__}({params_str}) => {result}"
-                )
-            else:
-                log.debug(f"{func.__name__}({params_str}) => {result}")
-            return result
+            result = func(self, *args, **kwargs)
         except Exception as e:
-            log.error(
-                f"{func.__name__}({params_str}) => Exception {type(e)} raise: {e}"
+            self._tracer.record(
+                func.__name__, time.perf_counter() - start, args, kwargs, error=e
             )
-            log.exception(e)
             raise e
 
+        self._tracer.record(
+            func.__name__, time.perf_counter() - start, args, kwargs, result=result
+        )
+        return result
+
+    @functools.wraps(func)
+    async def traceapi_async_closure(self, *args, **kwargs):
+        return await trace_async_call(
+            self, func.__name__, func(self, *args, **kwargs), args, kwargs
+        )
+
+    if inspect.iscoroutinefunction(func):
+        return traceapi_async_closure
     return traceapi_closure
 
 
 class ServiceApi(AbstractServiceApi):
-    def __init__(self, scheduler, connection_manager, data_exchanger, safe_manipulator):
+    def __init__(
+        self,
+        scheduler,
+        connection_manager,
+        data_exchanger,
+        safe_manipulator,
+        config=None,
+        period_streamer=None,
+    ):
         self._scheduler = scheduler
+        self._period_streamer = period_streamer
         self._connection_manager = connection_manager
         self._data_exchanger = data_exchanger
         self._safe_manipulator = safe_manipulator
+        self._multi_reads = {}  # conn_name -> read thread
+        self._multi_reads_lock = threading.Lock()
+        self._tracer = (
+            ApiTracer(
+                slow_call_seconds=config.get(
+                    f"{TRACE_CONFIG_KEY}.api_slow_call_seconds", 0.5
+                ),
+                sample_rate=config.get(f"{TRACE_CONFIG_KEY}.api_sample_rate", 1.0),
+            )
+            if config
+            else ApiTracer()
+        )
 
     @traceapi
     def list_supported_connectors(self):
@@ -60,12 +251,44 @@ class ServiceApi(AbstractServiceApi):
 
     @traceapi
     def list_connections(self):
-        """List configured connections with connection status and type
+        """List configured connections with connection status, type and circuit
+        breaker state of guarded connections ('closed', 'open' or 'half_open')
 
         :return:
         """
         return self._connection_manager.list_connections()
 
+    @traceapi
+    def connection_status(self, conn_name: str = None):
+        """Connection status: 'connected', 'disconnected', 'connecting' (agent startup),
+        'reconnecting', 'timeout' (startup connection still in progress) or 'failed'
+
+        :param conn_name: connection name, all the connections if None
+        :return: status (or {conn_name: status})
+        """
+        if conn_name is not None:
+            return self._connection_manager.connection_status(conn_name)
+
+        return {
+            conn: self._connection_manager.connection_status(conn)
+            for conn in self._connection_manager.list_connections(include_details=False)
+        }
+
+    @traceapi
+    def get_connection_stats(self, conn_name: str = None):
+        """Limits usage of connections: calls queued and active, wait time percentiles
+
+        :param conn_name: connection name, all the connections if None
+        :return: stats (None if unlimited) or {conn_name: stats}
+        """
+        if conn_name is not None:
+            return self._connection_manager.connection_stats(conn_name)
+
+        return {
+            conn: self._connection_manager.connection_stats(conn)
+            for conn in self._connection_manager.list_connections(include_details=False)
+        }
+
     @traceapi
     def create_connection(
         self,
@@ -73,6 +296,9 @@ class ServiceApi(AbstractServiceApi):
         conn_type: str,
         enabled=False,
         ignore_existing=False,
+        pool_size: int = 1,
+        limits: dict = None,
+        circuit_breaker: dict = None,
         **kwargs,
     ):
         """Create new data connection
@@ -81,6 +307,9 @@ class ServiceApi(AbstractServiceApi):
         :param conn_type:
         :param enabled: Should be enabled by default
         :param ignore_existing:
+        :param pool_size: Connector sessions serving reads in parallel (if supported by the target)
+        :param limits: {"max_concurrency": N, "requests_per_second": R, "rows_per_second": R}
+        :param circuit_breaker: {"enabled": bool, "failure_threshold": N, "reset_timeout": S}
         :param kwargs:
         :return:
         """
@@ -89,6 +318,9 @@ class ServiceApi(AbstractServiceApi):
             conn_type,
             enabled=enabled,
             ignore_existing=ignore_existing,
+            pool_size=pool_size,
+            limits=limits,
+            circuit_breaker=circuit_breaker,
             **kwargs,
         )
 
@@ -193,6 +425,80 @@ class ServiceApi(AbstractServiceApi):
         """
         return self._connection_manager.connection(conn_name).read_tag_values(tags)
 
+    @traceapi
+    def read_tag_values_multi(self, tags: dict, timeout: float = 10):
+        """Read tag values of several connections concurrently (snapshot)
+
+        :param tags: {conn_name: [tags]}
+        :param timeout: Seconds to wait for each connection (connections are read
+            concurrently, all reads start together - the call takes up to 'timeout'
+            in total)
+        :return: {"values": {conn_name: {tag: values}}, "errors": {conn_name:
+            {"error": message, "error_type": name}}} - failed and timed out
+            connections are reported in errors, as are connections whose read of a
+            previous call is still running (not read again)
+        """
+        if not tags:
+            return {"values": {}, "errors": {}}
+
+        values = {}
+        errors = {}
+        results = {}  # conn_name -> (values, error)
+
+        # Reads past the timeout are abandoned (left running) - a single read per
+        # connection at a time
+        reads = {}
+        with self._multi_reads_lock:
+            for conn_name in tags:
+                running = self._multi_reads.get(conn_name)
+                if running is not None and running.is_alive():
+                    errors[conn_name] = {
+                        "error": "Previous read still running",
+                        "error_type": "TimeoutError",
+                    }
+                    continue
+
+                reads[conn_name] = self._multi_reads[conn_name] = threading.Thread(
+                    target=self._multi_read,
+                    args=(conn_name, tags[conn_name], results),
+                    name=f"multi-read-{conn_name}",
+                    daemon=True,
+                )
+
+        for read in reads.values():
+            read.start()
+
+        deadline = time.monotonic() + timeout
+        for read in reads.values():
+            read.join(max(0, deadline - time.monotonic()))
+
+        for conn_name, read in reads.items():
+            if read.is_alive():
+                errors[conn_name] = {
+                    "error": f"Read timeout after {timeout}s",
+                    "error_type": "TimeoutError",
+                }
+                continue
+
+            with self._multi_reads_lock:
+                if self._multi_reads.get(conn_name) is read:
+                    del self._multi_reads[conn_name]
+
+            result, e = results[conn_name]
+            if e is not None:
+                errors[conn_name] = {"error": str(e), "error_type": type(e).__name__}
+            else:
+                values[conn_name] = result
+
+        return {"values": values, "errors": errors}
+
+    def _multi_read(self, conn_name, tags, results):
+        try:
+            conn = self._connection_manager.connection(conn_name)
+            results[conn_name] = (conn.read_tag_values(tags), None)
+        except Exception as e:
+            results[conn_name] = (None, e)
+
     @traceapi
     def read_tag_values_period(
         self,
@@ -221,6 +527,50 @@ class ServiceApi(AbstractServiceApi):
             progress_callback=progress_callback,
         )
 
+    @traceapi
+    async def stream_tag_values_period(
+        self,
+        conn_name: str,
+        tags: list,
+        first_timestamp,
+        last_timestamp,
+        time_frequency=None,
+        stream_id: str = None,
+        chunk_seconds: int = DEFAULT_CHUNK_SECONDS,
+        chunk_tags: int = DEFAULT_CHUNK_TAGS,
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    ):
+        """Stream tag values period to the data exchange as ordered chunks (dataframes
+        of up to 'chunk_rows' rows and 'chunk_tags' tags, read 'chunk_seconds' at a time)
+        followed by a summary frame - for periods too large for a single response
+
+        :param conn_name:
+        :param tags:
+        :param first_timestamp:
+        :param last_timestamp:
+        :param time_frequency:
+        :param stream_id: 'stream_id' header of the published frames (generated if None)
+        :param chunk_seconds:
+        :param chunk_tags:
+        :param chunk_rows:
+        :return: stream summary (stream_id, status, chunks and rows published)
+        :raises StreamingNotAvailable: The API has no data exchange to stream to
+        """
+        if self._period_streamer is None:
+            raise StreamingNotAvailable("Streaming requires broker connection")
+
+        return await self._period_streamer.stream(
+            conn_name,
+            tags,
+            first_timestamp,
+            last_timestamp,
+            time_frequency=time_frequency,
+            stream_id=stream_id,
+            chunk_seconds=chunk_seconds,
+            chunk_tags=chunk_tags,
+            chunk_rows=chunk_rows,
+        )
+
     @traceapi
     def delete_tag(self, conn_name: str, tags: list):
         """Delete Tag
@@ -338,6 +688,18 @@ class ServiceApi(AbstractServiceApi):
         seconds: int,
         update_on_conflict: bool = False,
         from_cache: bool = True,
+        read_timeout: float = None,
+        payload_format: str = None,
+        report_by_exception: bool = False,
+        deadband: Union[float, dict] = 0,
+        deadband_type: str = "absolute",
+        keyframe_seconds: float = None,
+        phase_policy: str = None,
+        phase_offset: float = 0,
+        period_ms: int = None,
+        batch_samples: int = None,
+        batch_ms: int = None,
+        adaptive_rate: bool = None,
     ):
         """Create new DAQ job
 
@@ -346,6 +708,18 @@ class ServiceApi(AbstractServiceApi):
         :param tags:
         :param seconds:
         :param update_on_conflict:
+        :param read_timeout: Seconds before a stuck read is abandoned (None - agent default)
+        :param payload_format: 'json', 'columnar' or 'indexed' (None - agent default)
+        :param report_by_exception: Publish only changed tags (beyond deadband or quality change)
+        :param deadband: Deadband for all tags or {tag: deadband}
+        :param deadband_type: 'absolute' or 'percent'
+        :param keyframe_seconds: Full snapshot period (None - agent default)
+        :param phase_policy: 'auto', 'stagger' or 'align' (None - agent default)
+        :param phase_offset: Seconds after wall-clock interval boundary ('align' policy)
+        :param period_ms: High-rate scan period in milliseconds (min 50ms, overrides seconds)
+        :param batch_samples: Publish samples in batches of N samples
+        :param batch_ms: Publish batch at most T milliseconds after its first sample
+        :param adaptive_rate: Stretch interval on sustained overruns (None - agent default)
         :return:
         """
         self._scheduler.create_scan_job(
@@ -355,6 +729,18 @@ class ServiceApi(AbstractServiceApi):
             seconds=seconds,
             update_on_conflict=update_on_conflict,
             from_cache=from_cache,
+            read_timeout=read_timeout,
+            payload_format=payload_format,
+            report_by_exception=report_by_exception,
+            deadband=deadband,
+            deadband_type=deadband_type,
+            keyframe_seconds=keyframe_seconds,
+            phase_policy=phase_policy,
+            phase_offset=phase_offset,
+            period_ms=period_ms,
+            batch_samples=batch_samples,
+            batch_ms=batch_ms,
+            adaptive_rate=adaptive_rate,
         )
 
     @traceapi
@@ -366,6 +752,25 @@ class ServiceApi(AbstractServiceApi):
         """
         self._scheduler.remove_job(job_id)
 
+    def get_api_stats(self, method: str = None):
+        """Return API calls metrics: calls, errors and slow calls counters, latency
+        percentiles and histogram, result size percentiles
+
+        :param method: API method name (all the called methods if not specified)
+        :return: stats (None if not called yet) or {method: stats}
+        """
+        return self._tracer.stats(method)
+
+    @traceapi
+    def get_job_stats(self, job_id: str = None):
+        """Return DAQ job scan metrics: read/serialize/publish time percentiles, payload size,
+        published, skipped, coalesced and overrun scans counters and last error
+
+        :param job_id: job id (all the jobs if not specified)
+        :return:
+        """
+        return self._scheduler.job_stats(job_id)
+
     @traceapi
     def list_job_tags(self, job_id: str):
         """Return list of tags in the job
@@ -395,6 +800,17 @@ class ServiceApi(AbstractServiceApi):
         """
         self._scheduler.remove_tags(job_id, tags)
 
+    @traceapi
+    def update_job_tags(self, job_id: str, add: list = None, remove: list = None):
+        """Add and remove job tags in a single step
+
+        :param job_id:
+        :param add: tags to add
+        :param remove: tags to remove
+        :return: {"added": [...], "removed": [...]} - tags actually changed
+        """
+        return self._scheduler.update_tags(job_id, add=add, remove=remove)
+
     @traceapi
     def provision_config(self, config: dict):
         """Provision configuration as a single command (including jobs and manipulated tags)
@@ -425,13 +841,48 @@ class ServiceApi(AbstractServiceApi):
                 else:  # add missing tags
                     # TODO: check if sample rate is the same
 
-                    existing_tags = self._scheduler.list_job_tags(job_id=job_id)
-                    missing_tags = [
-                        tag for tag in tags_to_add if tag not in existing_tags
-                    ]
-                    self._scheduler.add_job_tags(job_id=job_id, tags=missing_tags)
+                    self._scheduler.update_tags(job_id=job_id, add=tags_to_add)
 
             # Add manipulated items
             self._safe_manipulator.register_tags(
                 conn_name, config[conn_name]["manipulated_tags"]
             )
+
+    @traceapi
+    def execute_batch(self, calls: list, parallel=True):
+        """Execute several API calls in one round trip
+
+        Consecutive read-only calls (BATCH_PARALLEL_METHODS) run concurrently, any
+        other call waits for the previous calls and runs alone, so calls depending
+        on earlier ones (e.g. create connection, then read) keep their order.
+
+        :param calls: [{"method": name, "kwargs": {...}}, ...]
+        :param parallel: Run read-only calls concurrently (otherwise one by one)
+        :return: [{"result": ...} or {"error": message, "error_type": name}, ...]
+            in calls order
+        """
+        funcs, runs = plan_batch(self, calls, parallel)
+        results = [None] * len(funcs)
+
+        def _execute(i):
+            _, func, kwargs = funcs[i]
+            results[i] = batch_result(func, kwargs)
+
+        executor = None
+        try:
+            for run in runs:
+                if len(run) == 1:
+                    _execute(run[0])
+                    continue
+
+                if executor is None:
+                    executor = ThreadPoolExecutor(
+                        max_workers=min(len(funcs), BATCH_MAX_WORKERS),
+                        thread_name_prefix="api-batch",
+                    )
+                list(executor.map(_execute, run))
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False)
+
+        return results
@@ -0,0 +1,140 @@
+import asyncio
+import functools
+import inspect
+import logging
+from types import MethodType
+
+from .api import batch_result, plan_batch, trace_async_call
+
+log = logging.getLogger(__name__)
+
+# Long-running API methods (target browsing, snapshots, history reads and copies) run off
+# the event loop - other methods are quick and run on the loop as before
+HEAVY_METHODS = {
+    "target_info",
+    "list_tags",
+    "read_tag_attributes",
+    "read_tag_values_multi",
+    "read_tag_values_period",
+    "copy_period",
+    "copy_attributes",
+}
+
+
+# Quick calls reaching a target - they may wait on the connection limits (rate,
+# concurrency), so they run off the event loop as well
+TARGET_METHODS = {
+    "connection_info",
+    "read_tag_values",
+    "delete_tag",
+    "write_manipulated_tags",
+}
+
+# Calls reaching the DAQ scheduler - the worker processes pool waits for the worker
+# replies, so they run off the event loop with it
+JOB_METHODS = {
+    "delete_connection",
+    "list_jobs",
+    "create_job",
+    "remove_job",
+    "get_job_stats",
+    "list_job_tags",
+    "add_job_tags",
+    "remove_job_tags",
+    "update_job_tags",
+    "provision_config",
+}
+
+
+class AsyncApiDispatcher:
+    """Exposes ServiceApi methods for RPC registration, running the blocking ones in
+    executors so that they don't stall scan jobs and other RPC calls.
+
+    The RPC contract is unchanged - the dispatcher has the same public methods
+    (and signatures) as the wrapped API. Heavy calls run in a bounded executor (and
+    wait for a free thread without blocking the event loop), calls reaching targets
+    in a separate one so that they don't queue behind the heavy ones (as do the DAQ
+    job calls if the scheduler is the worker processes pool). Batches are
+    dispatched call by call, the remaining (quick) calls run on the loop.
+    """
+
+    def __init__(self, api, executor, target_executor=None, job_executor=None):
+        """
+        :param api: ServiceApi
+        :param executor: Bounded executor of heavy calls (owned by the caller - the
+            dispatcher methods are all exposed over RPC)
+        :param target_executor: Executor of quick calls reaching targets (on the loop
+            if None)
+        :param job_executor: Executor of DAQ job calls (on the loop if None - the
+            in-process scheduler is not thread safe)
+        """
+        self._api = api
+        self._executor = executor
+        self._target_executor = target_executor
+        self._job_executor = job_executor
+
+        for name in dir(api):
+            func = getattr(api, name)
+            if name.startswith("_") or not isinstance(func, MethodType):
+                continue
+
+            # Bound methods are registered by the broker connector
+            setattr(self, name, MethodType(self._dispatcher(name, func), self))
+
+    def _method_executor(self, name):
+        """Executor running the method (None - runs on the loop)"""
+        if name in HEAVY_METHODS:
+            return self._executor
+        if name in TARGET_METHODS:
+            return self._target_executor
+        if name in JOB_METHODS:
+            return self._job_executor
+        return None
+
+    def _dispatcher(self, name, func):
+        @functools.wraps(func)
+        async def dispatch(_self, *args, **kwargs):
+            if name == "execute_batch":
+                # Calls of the batch are traced by the API methods themselves
+                return await trace_async_call(
+                    self._api, name, self._execute_batch(*args, **kwargs), args, kwargs
+                )
+            if inspect.iscoroutinefunction(func):
+                # Waits for its blocking work in executor itself
+                return await func(*args, **kwargs)
+
+            executor = self._method_executor(name)
+            if executor is None:
+                return func(*args, **kwargs)
+
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                executor, functools.partial(func, *args, **kwargs)
+            )
+
+        return dispatch
+
+    async def _execute_batch(self, calls: list, parallel=True):
+        funcs, runs = plan_batch(self._api, calls, parallel)
+        results = [None] * len(funcs)
+        loop = asyncio.get_running_loop()
+
+        for run in runs:
+            # Blocking calls of the run are executed concurrently, quick ones meanwhile
+            blocking = [i for i in run if self._method_executor(funcs[i][0])]
+            futures = [
+                loop.run_in_executor(
+                    self._method_executor(funcs[i][0]),
+                    batch_result,
+                    funcs[i][1],
+                    funcs[i][2],
+                )
+                for i in blocking
+            ]
+            for i in run:
+                if i not in blocking:
+                    results[i] = batch_result(funcs[i][1], funcs[i][2])
+            for i, result in zip(blocking, await asyncio.gather(*futures)):
+                results[i] = result
+
+        return results
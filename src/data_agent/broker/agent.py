@@ -1,14 +1,24 @@
+import asyncio
+import functools
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
 
 from amqp_fabric.amq_broker_connector import AmqBrokerConnector
 
 from data_agent import __version__
 from data_agent.api import ServiceApi
+from data_agent.api_dispatcher import AsyncApiDispatcher
 from data_agent.config_manager import ConfigManager
 from data_agent.connection_manager import ConnectionManager
-from data_agent.daq_scheduler import create_daq_scheduler
+from data_agent.daq_scheduler import (
+    DAQ_CONFIG_KEY,
+    DAQ_SETTINGS_KEY,
+    create_daq_scheduler,
+)
+from data_agent.daq_workers import AmqBrokerFactory, DAQWorkerPool
 from data_agent.exchanger import DataExchanger
+from data_agent.period_streamer import PeriodStreamer
 from data_agent.safe_manipulator import SafeManipulator
 
 log = logging.getLogger(__name__)
@@ -21,9 +31,11 @@ class BrokerAgent:
     _safe_manipulator = None
     _data_exchanger = None
     _scheduler = None
+    _api_executor = None
+    _api_target_executor = None
 
     async def init(self, loop, is_service=False, enable_persistance=True):
-        self._config = ConfigManager(loop=loop, enable_persistance=enable_persistance)
+        self._config = ConfigManager(loop=loop, enable_persistence=enable_persistance)
 
         service_config = self._config.get("service")
         broker_config = self._config.get("broker")
@@ -60,31 +72,87 @@ class BrokerAgent:
             if handler.get_name() == "amqp":
                 await self._broker_conn.init_logging_handler(handler)
 
-        self._connection_manager = ConnectionManager(config=self._config)
-        self._safe_manipulator = SafeManipulator(
-            connection_manager=self._connection_manager,
+        # Connections are brought up in background - RPC is served meanwhile. Worker
+        # processes scan the connections of their jobs with their own sessions - the
+        # agent connects these only once an API call needs them
+        worker_processes = self._config.get(f"{DAQ_SETTINGS_KEY}.worker_processes", 0)
+        self._connection_manager = ConnectionManager(
             config=self._config,
+            background_startup=True,
+            deferred_connections=(
+                {
+                    job["conn_name"]
+                    for job in self._config.get(DAQ_CONFIG_KEY, {}).values()
+                }
+                if worker_processes
+                else None
+            ),
         )
-        self._scheduler = create_daq_scheduler(
-            broker=self._broker_conn,
-            conn_manager=self._connection_manager,
+        self._safe_manipulator = SafeManipulator(
+            connection_manager=self._connection_manager,
             config=self._config,
         )
+        if worker_processes:
+            # Scan jobs run in worker processes with their own connectors and broker
+            # connection - the pool waits for the workers to recreate the jobs
+            pool = functools.partial(
+                DAQWorkerPool,
+                config=self._config,
+                broker_factory=AmqBrokerFactory(
+                    amqp_uri=broker_config.uri,
+                    service_domain=service_config.domain,
+                    service_id=service_config.id,
+                    service_type=service_config.type,
+                    timeout=broker_config.timeout,
+                ),
+                processes=worker_processes,
+            )
+            self._scheduler = await asyncio.get_running_loop().run_in_executor(
+                None, pool
+            )
+        else:
+            self._scheduler = create_daq_scheduler(
+                broker=self._broker_conn,
+                conn_manager=self._connection_manager,
+                config=self._config,
+            )
         self._data_exchanger = DataExchanger(self._connection_manager)
+
+        # Long-running API calls (and stream reads) don't block the event loop
+        self._api_executor = ThreadPoolExecutor(
+            max_workers=broker_config.get("rpc_heavy_concurrency", 2),
+            thread_name_prefix="api-heavy",
+        )
+        # Calls reaching targets may wait on connection limits
+        self._api_target_executor = ThreadPoolExecutor(
+            max_workers=broker_config.get("rpc_target_concurrency", 8),
+            thread_name_prefix="api-target",
+        )
         api = ServiceApi(
             self._scheduler,
             self._connection_manager,
             self._data_exchanger,
             self._safe_manipulator,
+            config=self._config,
+            period_streamer=PeriodStreamer(
+                self._connection_manager, self._broker_conn, self._api_executor
+            ),
+        )
+        await self._broker_conn.rpc_register(
+            AsyncApiDispatcher(
+                api,
+                self._api_executor,
+                self._api_target_executor,
+                job_executor=self._api_target_executor if worker_processes else None,
+            )
         )
-        await self._broker_conn.rpc_register(api)
 
         log.info("")
         log.info(
             "************ Data Agent Service Initialized *************************"
         )
         log.info(
-            f" Supported connectors: {list(self._connection_manager.list_supported_connectors().keys())}"
+            f" Supported connectors: {self._connection_manager.list_connector_types()}"
         )
         log.info(
             "***********************************************************************"
@@ -93,6 +161,8 @@ class BrokerAgent:
     async def close(self):
         log.info("************ Starting Agent Termination *************************")
         self._scheduler.shutdown()
+        self._api_executor.shutdown(wait=False, cancel_futures=True)
+        self._api_target_executor.shutdown(wait=False, cancel_futures=True)
         self._connection_manager.close()
         await self._broker_conn.close()
         self._config = None
@@ -101,6 +171,8 @@ class BrokerAgent:
         self._safe_manipulator = None
         self._data_exchanger = None
         self._scheduler = None
+        self._api_executor = None
+        self._api_target_executor = None
         log.info("")
         log.info(
             "************ Data Agent Service Gracefully Finished ********************"
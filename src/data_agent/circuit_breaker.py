@@ -0,0 +1,177 @@
+import logging
+import threading
+import time
+
+from .exceptions import ConnectionCircuitOpen, ErrorWritingReadonlyTag
+
+log = logging.getLogger(__name__)
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+# Calls reaching the target - their failures trip the breaker
+GUARDED_METHODS = {
+    "list_tags",
+    "read_tag_attributes",
+    "read_tag_values",
+    "read_tag_values_period",
+    "write_tag_values",
+    "write_tag_attributes",
+    "delete_tag",
+    "register_group",
+    "read_group_values",
+    "write_group_values",
+    "write_group_values_period",
+}
+
+# Errors caused by the caller rather than the target
+CALLER_ERRORS = (ValueError, TypeError, KeyError, ErrorWritingReadonlyTag)
+
+
+class CircuitBreaker:
+    """Closed/open/half-open circuit breaker of a single connection.
+
+    After 'failure_threshold' consecutive failures the circuit opens and calls fail
+    fast. Once 'reset_timeout' seconds passed, a single trial call (probe) is let
+    through - its success closes the circuit, its failure opens it again. A probe
+    stuck for another 'reset_timeout' is given up and the next call probes instead.
+    """
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=30):
+        if failure_threshold < 1:
+            raise ValueError("Circuit breaker failure threshold must be at least 1")
+
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = CIRCUIT_CLOSED
+        self._failures = 0
+        self._opened_at = None
+        self._probe_started = None
+        self._lock = threading.Lock()
+        self.trips = 0
+        self.rejected = 0
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._state == CIRCUIT_OPEN and self._probe_due():
+                return CIRCUIT_HALF_OPEN
+            return self._state
+
+    def _probe_due(self):
+        return time.monotonic() - self._opened_at >= self.reset_timeout
+
+    def before_call(self):
+        """Let the call through or fail fast
+
+        :return: True if the call is the trial probe of half-open circuit
+        """
+        with self._lock:
+            if self._state == CIRCUIT_CLOSED:
+                return False
+
+            if self._state == CIRCUIT_OPEN and self._probe_due():
+                self._state = CIRCUIT_HALF_OPEN
+
+            if self._state == CIRCUIT_HALF_OPEN and (
+                self._probe_started is None
+                or time.monotonic() - self._probe_started >= self.reset_timeout
+            ):
+                self._probe_started = time.monotonic()
+                return True
+
+            self.rejected += 1
+            retry_in = max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+            raise ConnectionCircuitOpen(
+                f"Connection '{self.name}' circuit is open (retry in {retry_in:.0f}s)"
+            )
+
+    def record_success(self, probe=False):
+        with self._lock:
+            if probe:
+                log.info(f"Connection '{self.name}': probe succeeded, circuit closed.")
+                self._close()
+            elif self._state == CIRCUIT_CLOSED:
+                self._failures = 0
+
+    def record_failure(self, probe=False):
+        """Count failed call (late results of calls made before the circuit opened
+        are ignored)"""
+        with self._lock:
+            if not probe and self._state != CIRCUIT_CLOSED:
+                return
+
+            self._failures += 1
+            if probe or self._failures >= self.failure_threshold:
+                self._state = CIRCUIT_OPEN
+                self._opened_at = time.monotonic()
+                self._probe_started = None
+                self.trips += 1
+                log.warning(
+                    f"Connection '{self.name}': circuit opened after {self._failures} "
+                    f"failures, probing in {self.reset_timeout}s."
+                )
+
+    def reset(self):
+        with self._lock:
+            self._close()
+
+    def _close(self):
+        self._state = CIRCUIT_CLOSED
+        self._failures = 0
+        self._probe_started = None
+
+    def stats(self):
+        with self._lock:
+            failures = self._failures
+        return {
+            "state": self.state,
+            "failures": failures,
+            "trips": self.trips,
+            "rejected": self.rejected,
+        }
+
+
+class BreakerConnection:
+    """Connection proxy failing calls fast while the connection circuit is open"""
+
+    def __init__(self, conn, breaker):
+        self._conn = conn
+        self.breaker = breaker
+
+    def __getattr__(self, name):
+        if name == "_conn":
+            raise AttributeError(name)
+
+        attr = getattr(self._conn, name)
+        if name in GUARDED_METHODS and callable(attr):
+
+            def guarded(*args, **kwargs):
+                probe = self.breaker.before_call()
+                try:
+                    result = attr(*args, **kwargs)
+                except CALLER_ERRORS:
+                    self.breaker.record_success(probe)
+                    raise
+                except Exception:
+                    self.breaker.record_failure(probe)
+                    raise
+                self.breaker.record_success(probe)
+                return result
+
+            return guarded
+        return attr
+
+    @property
+    def connected(self):
+        return self._conn.connected
+
+    def connect(self):
+        self._conn.connect()
+        # Target is reachable again
+        self.breaker.reset()
+
+    def disconnect(self):
+        self._conn.disconnect()
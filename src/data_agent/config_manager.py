@@ -34,9 +34,15 @@ def deep_diff(current, default):
 
 class ConfigManager:
     def __init__(
-        self, loop=None, parser=None, config_file: str = None, enable_persistence=True
+        self,
+        loop=None,
+        parser=None,
+        config_file: str = None,
+        enable_persistence=True,
+        log_suffix: str = None,
     ):
         self._enable_persistence = enable_persistence
+        self._log_suffix = log_suffix
         self._lock = threading.RLock()
         self.base_path = self._determine_base_path(config_file)
         os.makedirs(self.base_path, exist_ok=True)
@@ -119,14 +125,10 @@ class ConfigManager:
         os.makedirs(self.logs_dir, exist_ok=True)
 
         handlers = self.settings.get("log.handlers")
-        handlers["file"]["filename"] = str(
-            os.path.join(self.logs_dir, self.settings.get("log.handlers.file.filename"))
-        )
-        handlers["err_file"]["filename"] = str(
-            os.path.join(
-                self.logs_dir, self.settings.get("log.handlers.err_file.filename")
+        for handler in ["file", "err_file"]:
+            handlers[handler]["filename"] = self._log_file_path(
+                self.settings.get(f"log.handlers.{handler}.filename")
             )
-        )
         self.settings.set("log.handlers", handlers)
 
         log.debug(
@@ -145,6 +147,13 @@ class ConfigManager:
             loop.set_debug(enabled=True)
             log.info("Asyncio debug mode enabled!")
 
+    def _log_file_path(self, filename: str) -> str:
+        # E.g. data-agent.log -> data-agent-worker-0.log
+        if self._log_suffix:
+            root, ext = os.path.splitext(filename)
+            filename = f"{root}-{self._log_suffix}{ext}"
+        return str(os.path.join(self.logs_dir, filename))
+
     def _default_config_path(self) -> str:
         module_dir = os.path.dirname(os.path.abspath(__file__))
         return os.path.join(module_dir, sys.platform, "config_default.yaml")
@@ -167,31 +176,38 @@ class ConfigManager:
 
     def set(self, key: str, value: Any, persist: bool = True):
         with self._lock:
-            self.settings.set(key, value)
+            # Replace the value (settings are merge enabled - lists would be extended)
+            self._remove(key)
+            self.settings.set(key, value, merge=False)
             if persist:
                 self._persist()
 
     def remove(self, key: str, persist: bool = True):
         with self._lock:
-            keys = key.split(".")
-            cfg = self.settings
-            for k in keys[:-1]:
-                cfg = cfg.get(k)
-                if cfg is None:
-                    return  # Key path does not exist, nothing to remove
-
-            # Finally remove only the leaf
-            if isinstance(cfg, dict):
-                cfg.pop(keys[-1], None)
-            else:
-                try:
-                    delattr(cfg, keys[-1])
-                except AttributeError:
-                    pass
+            if not self._remove(key):
+                return  # Key path does not exist, nothing to remove
 
             if persist:
                 self._persist()
 
+    def _remove(self, key: str) -> bool:
+        keys = key.split(".")
+        cfg = self.settings
+        for k in keys[:-1]:
+            cfg = cfg.get(k)
+            if cfg is None:
+                return False
+
+        # Finally remove only the leaf
+        if isinstance(cfg, dict):
+            cfg.pop(keys[-1], None)
+        else:
+            try:
+                delattr(cfg, keys[-1])
+            except AttributeError:
+                pass
+        return True
+
     def persist(self):
         with self._lock:
             self._persist()
@@ -200,7 +216,8 @@ class ConfigManager:
         if self._enable_persistence:
             current = self.settings.as_dict()
             diff = deep_diff(current, self._default_settings)
-            loaders.write(self.dynamic_config, DynaBox(diff), merge=True)
+            # Diff holds the complete dynamic config - overwrite (merging would keep removed items)
+            loaders.write(self.dynamic_config, DynaBox(diff), merge=False)
 
     def reload(self):
         with self._lock:
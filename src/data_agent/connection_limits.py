@@ -0,0 +1,164 @@
+import threading
+import time
+
+from data_agent.metrics import RollingStats, result_size
+
+# Calls reaching the target - connect/disconnect and metadata are not limited
+LIMITED_METHODS = {
+    "list_tags",
+    "read_tag_attributes",
+    "read_tag_values",
+    "read_tag_values_period",
+    "write_tag_values",
+    "write_tag_attributes",
+    "delete_tag",
+    "register_group",
+    "read_group_values",
+    "write_group_values",
+    "write_group_values_period",
+}
+
+
+class TokenBucket:
+    """Token bucket allowing bursts of up to 'burst' tokens (default - one second of rate).
+
+    Tokens may be charged after the fact (e.g. rows read) - the debt delays the next
+    acquirers. The debt is capped at 'burst' tokens, so a single large call (e.g.
+    history read) delays the following ones by at most burst / rate seconds.
+    """
+
+    def __init__(self, rate, burst=None):
+        if rate <= 0:
+            raise ValueError("Token bucket rate must be positive")
+
+        self._rate = rate
+        self._burst = burst or rate
+        self._tokens = self._burst
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self):
+        return self._rate
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self._burst, self._tokens + (now - self._last) * self._rate)
+        self._last = now
+
+    def reserve(self, tokens=1):
+        """Take tokens (possibly into debt)
+
+        :return: seconds to wait before the tokens are available
+        """
+        with self._lock:
+            self._refill()
+            self._tokens = max(self._tokens - tokens, -self._burst)
+            return max(0.0, -self._tokens / self._rate)
+
+    def acquire(self, tokens=1):
+        time.sleep(self.reserve(tokens))
+
+
+class ConnectionLimiter:
+    """Limits of calls to a single connection target"""
+
+    def __init__(
+        self, max_concurrency=None, requests_per_second=None, rows_per_second=None
+    ):
+        self._slots = (
+            threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        )
+        self._requests = (
+            TokenBucket(requests_per_second) if requests_per_second else None
+        )
+        self._rows = TokenBucket(rows_per_second) if rows_per_second else None
+        self._max_concurrency = max_concurrency
+
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.active = 0
+        self.calls = 0
+        self.rows = 0
+        self.wait_time = RollingStats()
+
+    def call(self, func, *args, **kwargs):
+        start = time.monotonic()
+        with self._lock:
+            self.queued += 1
+
+        try:
+            if self._requests:
+                self._requests.acquire()
+            if self._rows:
+                # Wait for the rows debt of previous calls
+                self._rows.acquire(0)
+            if self._slots:
+                self._slots.acquire()
+        finally:
+            with self._lock:
+                self.queued -= 1
+
+        with self._lock:
+            self.active += 1
+            self.calls += 1
+        self.wait_time.add(time.monotonic() - start)
+
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            with self._lock:
+                self.active -= 1
+            if self._slots:
+                self._slots.release()
+
+        rows = result_size(result)
+        with self._lock:
+            self.rows += rows
+        if self._rows:
+            self._rows.reserve(rows)
+
+        return result
+
+    def stats(self):
+        return {
+            "max_concurrency": self._max_concurrency,
+            "requests_per_second": self._requests.rate if self._requests else None,
+            "rows_per_second": self._rows.rate if self._rows else None,
+            "queued": self.queued,
+            "active": self.active,
+            "calls": self.calls,
+            "rows": self.rows,
+            "wait_time": self.wait_time.summary(),
+        }
+
+
+class LimitedConnection:
+    """Connection proxy applying ConnectionLimiter to calls reaching the target"""
+
+    def __init__(self, conn, limiter):
+        self._conn = conn
+        self.limiter = limiter
+
+    def __getattr__(self, name):
+        if name == "_conn":
+            raise AttributeError(name)
+
+        attr = getattr(self._conn, name)
+        if name in LIMITED_METHODS and callable(attr):
+
+            def limited(*args, **kwargs):
+                return self.limiter.call(attr, *args, **kwargs)
+
+            return limited
+        return attr
+
+    @property
+    def connected(self):
+        return self._conn.connected
+
+    def connect(self):
+        self._conn.connect()
+
+    def disconnect(self):
+        self._conn.disconnect()
@@ -1,17 +1,34 @@
 import logging
-import sys
-from importlib.metadata import entry_points
-
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .circuit_breaker import BreakerConnection, CircuitBreaker
+from .connection_limits import ConnectionLimiter, LimitedConnection
+from .connection_pool import ConnectionPool
+from .connector_registry import ConnectorRegistry, list_plugins, supported_connectors
 from .exceptions import (
     ConnectionAlreadyExists,
     ConnectionNotActive,
     ConnectionRedefinitionNotSupported,
     UnrecognizedConnection,
-    UnrecognizedConnectionType,
 )
 
 log = logging.getLogger(__name__)
 
+RECONNECT_CONFIG_KEY = "reconnect"
+STARTUP_CONFIG_KEY = "startup"
+CIRCUIT_BREAKER_CONFIG_KEY = "circuit_breaker"
+
+STATUS_CONNECTED = "connected"
+STATUS_DISCONNECTED = "disconnected"
+STATUS_CONNECTING = "connecting"  # Startup connection attempt in progress
+STATUS_RECONNECTING = "reconnecting"
+STATUS_TIMEOUT = (
+    "timeout"  # Startup attempt exceeded connect_timeout (still in progress)
+)
+STATUS_FAILED = "failed"  # Startup attempt failed
+
 
 def _validate_connection_exists(func):
     def wrapper(self, *args, **kwargs):
@@ -46,17 +63,82 @@ def _validate_connection_enabled(func):
     return wrapper
 
 
+class ReconnectSupervisor:
+    """Reconnects a dropped connection on a background thread.
+
+    Attempts are retried with exponential backoff (initial_delay doubled on each
+    failure up to max_delay) and jitter (delay is randomized between 50% and 100%),
+    so connections dropped together do not hammer their targets in sync.
+    """
+
+    def __init__(self, conn, initial_delay=1, max_delay=60):
+        self._conn = conn
+        self._initial_delay = initial_delay
+        self._max_delay = max_delay
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name=f"reconnect-{conn.name}", daemon=True
+        )
+        self.attempts = 0
+
+    @property
+    def running(self):
+        return self._thread.is_alive() and not self._stop_event.is_set()
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def backoff_delay(self, attempt):
+        delay = min(self._max_delay, self._initial_delay * 2 ** min(attempt, 32))
+        return delay * random.uniform(0.5, 1)
+
+    def _run(self):
+        while not self._stop_event.is_set() and not self._conn.connected:
+            try:
+                self._conn.connect()
+            except Exception as e:
+                log.warning(
+                    f"Reconnecting '{self._conn.name}' failed (attempt {self.attempts + 1}) - {e}"
+                )
+
+            self.attempts += 1
+            if self._conn.connected:
+                log.info(
+                    f"Connection '{self._conn.name}' restored after {self.attempts} attempt(s)."
+                )
+                return
+
+            self._stop_event.wait(self.backoff_delay(self.attempts - 1))
+
+
 class ConnectionManager:
-    def __init__(self, config, extra_connectors=None):
+    def __init__(
+        self,
+        config,
+        extra_connectors=None,
+        background_startup=False,
+        deferred_connections=None,
+    ):
+        """
+        :param config:
+        :param extra_connectors: {conn_type: connector class} in addition to plugins
+        :param background_startup: Return without waiting for enabled connections to connect
+        :param deferred_connections: Enabled connections connected on their first use
+            instead of at startup (e.g. scanned by DAQ worker processes)
+        """
         self._config = config
         self._connections_map = {}
-        self._connector_classes = {
-            entry.name: entry.load() for entry in self.list_plugins()
-        }
-
-        if extra_connectors:
-            for conn in extra_connectors:
-                self._connector_classes[conn] = extra_connectors[conn]
+        self._reconnect_supervisors = {}
+        self._reconnect_lock = threading.Lock()
+        self._startup_attempts = {}
+        self._startup_status = {}
+        self._startup_thread = None
+        self._deferred = set(deferred_connections or [])
+        # Connector plugins are imported once a connection of their type is created
+        self._connector_registry = ConnectorRegistry(extra_connectors)
 
         # Recreate connections from config
         connections = self._config.connections
@@ -64,25 +146,133 @@ class ConnectionManager:
             self._create_connection(
                 conn_name=conn,
                 conn_type=connections[conn]["type"],
+                pool_size=connections[conn].get("pool_size", 1),
+                limits=connections[conn].get("limits"),
+                circuit_breaker=connections[conn].get("circuit_breaker"),
                 **connections[conn]["params"],
             )
-            if connections[conn]["enabled"]:
-                try:
-                    self.enable_connection(conn)
-                except Exception as e:
-                    log.error(f"Error enabling connection {conn} - {e}. ")
-                    # self.disable_connection(conn)
+
+        enabled = [
+            conn
+            for conn in connections
+            if connections[conn]["enabled"] and conn not in self._deferred
+        ]
+        if enabled:
+            if background_startup:
+                self._startup_thread = threading.Thread(
+                    target=self._connect_all,
+                    args=(enabled,),
+                    name="connections-startup",
+                    daemon=True,
+                )
+                self._startup_thread.start()
+            else:
+                self._connect_all(enabled)
 
         log.info(
-            f"ConnectionManager initialized: supported connection types: {list(self._connector_classes.keys())}, "
+            f"ConnectionManager initialized: supported connection types: {self._connector_registry.types()}, "
             f"configured connections: {list(self._connections_map.keys()) if self._connections_map else ''}"
         )
 
     def __del__(self):
         self.close()
 
+    def _connect_all(self, conn_names):
+        """Connect enabled connections concurrently (at most max_parallel_connects at a time)"""
+        max_parallel = self._config.get(
+            f"{STARTUP_CONFIG_KEY}.max_parallel_connects", 8
+        )
+        timeout = self._config.get(f"{STARTUP_CONFIG_KEY}.connect_timeout", 30)
+
+        with self._reconnect_lock:
+            for conn_name in conn_names:
+                self._startup_status[conn_name] = STATUS_CONNECTING
+
+        with ThreadPoolExecutor(
+            max_workers=max_parallel, thread_name_prefix="connections-startup"
+        ) as executor:
+            for conn_name in conn_names:
+                executor.submit(self._startup_connect, conn_name, timeout)
+
+        connected = sum(
+            1
+            for conn_name in conn_names
+            if conn_name in self._connections_map
+            and self._connections_map[conn_name].connected
+        )
+        log.info(
+            f"Connections startup finished: {connected}/{len(conn_names)} connected."
+        )
+
+    def _startup_connect(self, conn_name, timeout):
+        conn = self._connections_map.get(conn_name)
+        if conn is None:
+            return  # Deleted meanwhile
+
+        # The attempt is abandoned (left running) after timeout to free the slot
+        attempt = threading.Thread(
+            target=self._startup_attempt,
+            args=(conn_name, conn),
+            name=f"connect-{conn_name}",
+            daemon=True,
+        )
+        with self._reconnect_lock:
+            # Disabled or deleted while waiting for a slot
+            if self._startup_status.get(conn_name) != STATUS_CONNECTING:
+                return
+
+            # Connected (or being reconnected) while waiting for a slot
+            supervisor = self._reconnect_supervisors.get(conn_name)
+            if conn.connected or (supervisor and supervisor.running):
+                del self._startup_status[conn_name]
+                return
+
+            self._startup_attempts[conn_name] = attempt
+        attempt.start()
+        attempt.join(timeout or None)
+
+        if attempt.is_alive():
+            with self._reconnect_lock:
+                if self._startup_attempts.get(conn_name) is attempt:
+                    self._startup_status[conn_name] = STATUS_TIMEOUT
+            log.error(
+                f"Connection '{conn_name}' not established within {timeout}s, still trying."
+            )
+
+    def _startup_attempt(self, conn_name, conn):
+        try:
+            conn.connect()
+            status = None
+        except Exception as e:
+            log.error(f"Error enabling connection {conn_name} - {e}. ")
+            status = STATUS_FAILED
+
+        with self._reconnect_lock:
+            current = (
+                self._startup_attempts.get(conn_name) is threading.current_thread()
+            )
+            if current:
+                del self._startup_attempts[conn_name]
+                self._startup_status.pop(conn_name, None)
+                if status:
+                    self._startup_status[conn_name] = status
+
+        # Connection was deleted or disabled while connecting
+        if status is None and not current:
+            conn.disconnect()
+
+    def wait_startup(self, timeout=None):
+        """Wait for background startup connection attempts to finish
+
+        :return: True if finished
+        """
+        if self._startup_thread:
+            self._startup_thread.join(timeout)
+            return not self._startup_thread.is_alive()
+        return True
+
     def close(self):
-        if not self._connector_classes:
+        if not self._connector_registry:
             return
 
         # Remove connections, but not from persistance
@@ -90,7 +280,7 @@ class ConnectionManager:
         for conn in existing_connections:
             self._delete_connection(conn)
 
-        self._connector_classes = None
+        self._connector_registry = None
         log.info("ConnectionManager terminated successfully.")
 
     def reset(self):
@@ -100,28 +290,21 @@ class ConnectionManager:
 
     @staticmethod
     def list_plugins():
-        if sys.version_info[:3] < (3, 10):
-            return entry_points().get("data_agent.connectors", [])
-
-        return entry_points(group="data_agent.connectors")
+        return list_plugins()
 
     @staticmethod
     def list_supported_connectors():
-        entries = {
-            entry.name: entry.load() for entry in ConnectionManager.list_plugins()
-        }
+        # Plugins metadata is loaded once per process
+        return supported_connectors()
 
-        return {
-            entry: {
-                "category": entries[entry].CATEGORY,
-                "connection_fields": entries[entry].list_connection_fields(),
-            }
-            for entry in entries
-            if entries[entry].plugin_supported()
-        }
+    def list_connector_types(self):
+        """Names of available connection types (without importing the plugins)"""
+        return self._connector_registry.types()
 
     def target_info(self, target_ref, conn_type):
-        return self._connector_classes[conn_type].target_info(target_ref)
+        return self._connector_registry.connector_class(conn_type).target_info(
+            target_ref
+        )
 
     def list_connections(self, include_details=True):
         if not include_details:
@@ -133,16 +316,76 @@ class ConnectionManager:
     def is_connected(self, conn_name):
         return self._connections_map[conn_name].connected
 
+    @_validate_connection_exists
+    def connection_stats(self, conn_name):
+        """Limits, queue depth and wait times of limited connection (None if unlimited)"""
+        limiter = getattr(self._connections_map[conn_name], "limiter", None)
+        return limiter.stats() if limiter else None
+
+    def record_failure(self, conn_name):
+        """Count failure observed by the caller (e.g. abandoned read) towards the
+        connection circuit breaker"""
+        conn = self._connections_map.get(conn_name)
+        breaker = getattr(conn, "breaker", None)
+        if breaker:
+            breaker.record_failure()
+
+    @_validate_connection_exists
+    def connection_status(self, conn_name):
+        """Connection status: 'connected', 'disconnected', 'connecting' (startup),
+        'reconnecting', 'timeout' (startup attempt still running) or 'failed' (startup)
+        """
+        if self._connections_map[conn_name].connected:
+            return STATUS_CONNECTED
+        if self.is_reconnecting(conn_name):
+            return STATUS_RECONNECTING
+        return self._startup_status.get(conn_name, STATUS_DISCONNECTED)
+
     @_validate_connection_exists
     def connection(self, conn_name, check_enabled=True):
         if check_enabled and not self._connections_map[conn_name].connected:
-            raise ConnectionNotActive("Connection not active")
+            if not self._connect_deferred(conn_name):
+                raise ConnectionNotActive("Connection not active")
 
         return self._connections_map[conn_name]
 
+    def _connect_deferred(self, conn_name):
+        with self._reconnect_lock:
+            if conn_name not in self._deferred:
+                return False
+            self._deferred.discard(conn_name)
+
+        log.info(f"Connecting deferred connection '{conn_name}' on first use...")
+        self._connections_map[conn_name].connect()
+        return True
+
     def create_connection(
-        self, conn_name, conn_type, enabled=False, ignore_existing=False, **kwargs
+        self,
+        conn_name,
+        conn_type,
+        enabled=False,
+        ignore_existing=False,
+        pool_size=1,
+        limits=None,
+        circuit_breaker=None,
+        **kwargs,
     ):
+        """Create new connection
+
+        :param conn_name:
+        :param conn_type:
+        :param enabled: Connect right away
+        :param ignore_existing: Return existing connection of the same type
+        :param pool_size: Connector sessions serving reads of the connection in parallel
+        :param limits: Target protection {"max_concurrency": N, "requests_per_second": R,
+            "rows_per_second": R} - any subset (None - unlimited)
+        :param circuit_breaker: {"enabled": bool, "failure_threshold": N, "reset_timeout": S}
+            overriding 'circuit_breaker' config defaults (None - defaults)
+        :param kwargs: connector parameters
+        """
+        if pool_size < 1:
+            raise ValueError("Connection pool size must be at least 1")
+
         if conn_name in self._connections_map.keys():
             if not ignore_existing:
                 raise ConnectionAlreadyExists(
@@ -158,33 +401,65 @@ class ConnectionManager:
             return self._conn_descriptor(self._connections_map[conn_name])
 
         conn = self._create_connection(
-            conn_name=conn_name, conn_type=conn_type, **kwargs
+            conn_name=conn_name,
+            conn_type=conn_type,
+            pool_size=pool_size,
+            limits=limits,
+            circuit_breaker=circuit_breaker,
+            **kwargs,
         )
         if enabled:
             conn.connect()
 
-        self._config.set(
-            f"connections.{conn_name}",
-            {"type": conn_type, "params": kwargs, "enabled": enabled},
-        )
+        conn_config = {"type": conn_type, "params": kwargs, "enabled": enabled}
+        if pool_size > 1:
+            conn_config["pool_size"] = pool_size
+        if limits:
+            conn_config["limits"] = limits
+        if circuit_breaker:
+            conn_config["circuit_breaker"] = circuit_breaker
+        self._config.set(f"connections.{conn_name}", conn_config)
 
         log.info(f"Connection '{conn_name}' of type '{conn_type}' created.")
         return self._conn_descriptor(conn)
 
-    def _create_connection(self, conn_name, conn_type, **kwargs):
-        if conn_type not in self._connector_classes.keys():
-            raise UnrecognizedConnectionType(
-                f'Unrecognized connection type "{conn_type}".'
+    def _create_connection(
+        self,
+        conn_name,
+        conn_type,
+        pool_size=1,
+        limits=None,
+        circuit_breaker=None,
+        **kwargs,
+    ):
+        connector_class = self._connector_registry.connector_class(conn_type)
+        if pool_size > 1:
+            conn = ConnectionPool(
+                connector_class, conn_name=conn_name, pool_size=pool_size, **kwargs
             )
+        else:
+            conn = connector_class(conn_name=conn_name, **kwargs)
 
-        self._connections_map[conn_name] = self._connector_classes[conn_type](
-            conn_name=conn_name, **kwargs
-        )
-        return self._connections_map[conn_name]
+        # Every path reaching the target (API, DAQ, exchanger, harvester) is limited
+        if limits:
+            conn = LimitedConnection(conn, ConnectionLimiter(**limits))
+
+        # Open circuit fails calls before they queue on the limits
+        breaker_options = {
+            **self._config.get(CIRCUIT_BREAKER_CONFIG_KEY, {}),
+            **(circuit_breaker or {}),
+        }
+        if breaker_options.pop("enabled", False):
+            conn = BreakerConnection(
+                conn, CircuitBreaker(name=conn_name, **breaker_options)
+            )
+
+        self._connections_map[conn_name] = conn
+        return conn
 
     @staticmethod
     def _conn_descriptor(conn):
-        return {
+        descriptor = {
             "name": conn.name,
             "type": conn.TYPE,
             "category": conn.CATEGORY,
@@ -194,12 +469,22 @@ class ConnectionManager:
             "enabled": conn.connected,
         }
 
+        # Circuit state of guarded connections: 'closed', 'open' or 'half_open'
+        breaker = getattr(conn, "breaker", None)
+        if breaker:
+            descriptor["circuit"] = breaker.state
+
+        return descriptor
+
     @_validate_connection_exists
     def delete_connection(self, conn_name):
         self._delete_connection(conn_name)
         self._config.remove(f"connections.{conn_name}")
 
     def _delete_connection(self, conn_name):
+        self._stop_reconnect(conn_name)
+        self._forget_startup(conn_name)
+
         if self._connections_map[conn_name].connected:
             log.debug(f"Disconnecting '{conn_name}' connection...")
             self._connections_map[conn_name].disconnect()
@@ -208,6 +493,9 @@ class ConnectionManager:
 
     @_validate_connection_exists
     def enable_connection(self, conn_name):
+        with self._reconnect_lock:
+            self._deferred.discard(conn_name)
+
         if not self._connections_map[conn_name].connected:
             self._connections_map[conn_name].connect()
 
@@ -215,7 +503,62 @@ class ConnectionManager:
 
     @_validate_connection_exists
     def disable_connection(self, conn_name):
+        self._stop_reconnect(conn_name)
+        self._forget_startup(conn_name)
+
         if self._connections_map[conn_name].connected:
             self._connections_map[conn_name].disconnect()
 
         self._config.set(f"connections.{conn_name}.enabled", False)
+
+    @_validate_connection_exists
+    def reconnect(self, conn_name):
+        """Start reconnecting dropped connection in background (unless already in progress)
+
+        :param conn_name:
+        :return: True if connection is being reconnected
+        """
+        with self._reconnect_lock:
+            supervisor = self._reconnect_supervisors.get(conn_name)
+            if supervisor and supervisor.running:
+                return True
+
+            # Startup attempt in progress (or waiting for a startup slot)
+            if (
+                conn_name in self._startup_attempts
+                or self._startup_status.get(conn_name) == STATUS_CONNECTING
+            ):
+                return True
+
+            conn = self._connections_map[conn_name]
+            if conn.connected:
+                return False
+
+            log.info(f"Reconnecting to '{conn_name}' {conn.TYPE} Server...")
+            supervisor = ReconnectSupervisor(
+                conn,
+                initial_delay=self._config.get(
+                    f"{RECONNECT_CONFIG_KEY}.initial_delay", 1
+                ),
+                max_delay=self._config.get(f"{RECONNECT_CONFIG_KEY}.max_delay", 60),
+            )
+            self._reconnect_supervisors[conn_name] = supervisor
+            supervisor.start()
+            return True
+
+    @_validate_connection_exists
+    def is_reconnecting(self, conn_name):
+        supervisor = self._reconnect_supervisors.get(conn_name)
+        return bool(supervisor and supervisor.running)
+
+    def _forget_startup(self, conn_name):
+        with self._reconnect_lock:
+            self._deferred.discard(conn_name)
+            self._startup_attempts.pop(conn_name, None)
+            self._startup_status.pop(conn_name, None)
+
+    def _stop_reconnect(self, conn_name):
+        with self._reconnect_lock:
+            supervisor = self._reconnect_supervisors.pop(conn_name, None)
+        if supervisor:
+            supervisor.stop()
@@ -0,0 +1,98 @@
+import logging
+import queue
+
+log = logging.getLogger(__name__)
+
+# Stateless calls served by any idle session - anything else goes to the primary one
+POOLED_METHODS = {
+    "list_tags",
+    "read_tag_attributes",
+    "read_tag_values",
+    "read_tag_values_period",
+}
+
+
+class ConnectionPool:
+    """Connection served by several connector sessions.
+
+    Looks like a single connector to its users. Stateless reads are routed to an
+    idle session (waiting for one if all are busy), so concurrent callers are
+    served in parallel. Other calls (writes, groups etc.) and attributes go to the
+    primary session. Secondary sessions failing to connect are left out of the pool.
+    """
+
+    def __init__(self, connector_class, conn_name, pool_size, **kwargs):
+        self._sessions = [
+            connector_class(conn_name=conn_name, **kwargs) for _ in range(pool_size)
+        ]
+        self._idle = queue.Queue()  # (session, epoch) - idle sessions
+        self._epoch = 0  # Sessions checked out before (re)connect are not returned
+
+    def __getattr__(self, name):
+        if name == "_sessions":
+            raise AttributeError(name)
+
+        attr = getattr(self._sessions[0], name)
+        if name in POOLED_METHODS and callable(attr):
+            return self._pooled_method(name)
+        return attr
+
+    @property
+    def pool_size(self):
+        return len(self._sessions)
+
+    @property
+    def connected(self):
+        return self._sessions[0].connected
+
+    def connect(self):
+        self.disconnect()
+
+        # Primary session is required
+        self._sessions[0].connect()
+        self._idle.put((self._sessions[0], self._epoch))
+
+        for i, session in enumerate(self._sessions[1:], start=1):
+            try:
+                session.connect()
+                self._idle.put((session, self._epoch))
+            except Exception as e:
+                log.warning(
+                    f"Connection '{session.name}': session {i} failed to connect - {e}."
+                )
+
+        log.debug(
+            f"Connection '{self._sessions[0].name}': {self._idle.qsize()}/{self.pool_size} sessions connected."
+        )
+
+    def disconnect(self):
+        self._epoch += 1
+        while not self._idle.empty():
+            self._idle.get_nowait()
+
+        for session in self._sessions:
+            if session.connected:
+                session.disconnect()
+
+    def _pooled_method(self, name):
+        def call(*args, **kwargs):
+            while True:
+                if not self.connected:
+                    # Primary session raises the connector's error
+                    return getattr(self._sessions[0], name)(*args, **kwargs)
+                try:
+                    # Epoch of the checkout is the one the session was queued with
+                    session, epoch = self._idle.get(timeout=1)
+                except queue.Empty:
+                    continue
+                if epoch == self._epoch:
+                    break
+                # Returned while being reconnected - already queued again
+
+            try:
+                return getattr(session, name)(*args, **kwargs)
+            finally:
+                if epoch == self._epoch:
+                    self._idle.put((session, epoch))
+
+        return call
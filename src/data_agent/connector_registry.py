@@ -0,0 +1,89 @@
+import logging
+import sys
+import threading
+from importlib.metadata import entry_points
+
+from data_agent.exceptions import UnrecognizedConnectionType
+
+log = logging.getLogger(__name__)
+
+CONNECTORS_ENTRY_POINT_GROUP = "data_agent.connectors"
+
+# Plugin metadata by entry point value (module:class), shared by all the registries
+_metadata_cache = {}
+_metadata_lock = threading.Lock()
+
+
+def list_plugins():
+    if sys.version_info[:3] < (3, 10):
+        return entry_points().get(CONNECTORS_ENTRY_POINT_GROUP, [])
+
+    return entry_points(group=CONNECTORS_ENTRY_POINT_GROUP)
+
+
+def plugin_metadata(entry):
+    """Connector plugin metadata (None if not supported on this platform).
+
+    The plugin is imported on first request only - the metadata is cached for
+    the process lifetime.
+    """
+    with _metadata_lock:
+        if entry.value not in _metadata_cache:
+            try:
+                cls = entry.load()
+                _metadata_cache[entry.value] = (
+                    {
+                        "category": cls.CATEGORY,
+                        "connection_fields": cls.list_connection_fields(),
+                    }
+                    if cls.plugin_supported()
+                    else None
+                )
+            except Exception as e:
+                log.warning(f"Error loading connector plugin '{entry.name}' - {e}")
+                _metadata_cache[entry.value] = None
+
+        return _metadata_cache[entry.value]
+
+
+def supported_connectors():
+    """Metadata of connector plugins supported on this platform"""
+    connectors = {}
+    for entry in list_plugins():
+        metadata = plugin_metadata(entry)
+        if metadata is not None:
+            connectors[entry.name] = metadata
+    return connectors
+
+
+class ConnectorRegistry:
+    """Connector classes by connection type, imported on demand.
+
+    Plugin entry points are only listed on creation - a connector module (with
+    the vendor SDKs it imports) is loaded once a connection of its type is
+    created or its target is queried.
+    """
+
+    def __init__(self, extra_connectors=None):
+        self._entries = {entry.name: entry for entry in list_plugins()}
+        self._classes = dict(extra_connectors or {})
+        self._lock = threading.Lock()
+
+    def __contains__(self, conn_type):
+        return conn_type in self._classes or conn_type in self._entries
+
+    def types(self):
+        return list(dict.fromkeys([*self._entries, *self._classes]))
+
+    def connector_class(self, conn_type):
+        with self._lock:
+            if conn_type not in self._classes:
+                if conn_type not in self._entries:
+                    raise UnrecognizedConnectionType(
+                        f'Unrecognized connection type "{conn_type}".'
+                    )
+
+                self._classes[conn_type] = self._entries[conn_type].load()
+                log.debug(f"Connector plugin '{conn_type}' loaded.")
+
+            return self._classes[conn_type]
@@ -0,0 +1,98 @@
+import numbers
+
+import numpy as np
+
+DEADBAND_ABSOLUTE = "absolute"
+DEADBAND_PERCENT = "percent"
+DEADBAND_TYPES = [DEADBAND_ABSOLUTE, DEADBAND_PERCENT]
+
+
+def _as_float(value):
+    if isinstance(value, numbers.Real) and not isinstance(value, bool):
+        return float(value)
+    return np.nan
+
+
+class DeadbandFilter:
+    """Report-by-exception filter of a single DAQ job.
+
+    Last published values, qualities and deadbands are kept in arrays following
+    the job tags order, so each scan is compared in a few vectorized operations.
+    A tag is reported when its quality changed, its numeric value moved beyond the
+    deadband (absolute or percent of last published value) or its non-numeric
+    value changed.
+    """
+
+    def __init__(self, tags, deadband=0, deadband_type=DEADBAND_ABSOLUTE):
+        if deadband_type not in DEADBAND_TYPES:
+            raise ValueError(f"Unsupported deadband type '{deadband_type}'")
+
+        self._tags = list(tags)
+        self._index = {tag: i for i, tag in enumerate(self._tags)}
+        self._is_percent = deadband_type == DEADBAND_PERCENT
+
+        size = len(self._tags)
+        self._values = np.full(size, np.nan)
+        self._raw_values = np.empty(size, dtype=object)
+        self._qualities = np.empty(size, dtype=object)
+        self._published = np.zeros(size, dtype=bool)
+
+        if isinstance(deadband, dict):
+            self._deadbands = np.array(
+                [float(deadband.get(tag, 0)) for tag in self._tags]
+            )
+        else:
+            self._deadbands = np.full(size, float(deadband))
+
+    @property
+    def tags(self):
+        return self._tags
+
+    def filter(self, tag_values, keyframe=False):
+        """Return positions (in job tags order) of tags which should be reported
+        and remember their values as last published.
+        """
+        tags = [tag for tag in tag_values if tag in self._index]
+        positions = np.fromiter(
+            (self._index[tag] for tag in tags), dtype=np.int64, count=len(tags)
+        )
+
+        raw_values = np.empty(len(tags), dtype=object)
+        raw_values[:] = [tag_values[tag]["Value"] for tag in tags]
+        qualities = np.empty(len(tags), dtype=object)
+        qualities[:] = [tag_values[tag]["Quality"] for tag in tags]
+        values = np.fromiter(
+            (_as_float(v) for v in raw_values), dtype=np.float64, count=len(tags)
+        )
+
+        if keyframe:
+            report = np.ones(len(tags), dtype=bool)
+
+        else:
+            last_values = self._values[positions]
+            numeric = ~np.isnan(values)
+
+            threshold = self._deadbands[positions]
+            if self._is_percent:
+                threshold = threshold / 100 * np.abs(last_values)
+
+            with np.errstate(invalid="ignore"):
+                value_changed = np.where(
+                    numeric,
+                    np.isnan(last_values) | (np.abs(values - last_values) > threshold),
+                    raw_values != self._raw_values[positions],
+                )
+
+            report = (
+                ~self._published[positions]
+                | (qualities != self._qualities[positions])
+                | value_changed
+            )
+
+        reported = positions[report]
+        self._values[reported] = values[report]
+        self._raw_values[reported] = raw_values[report]
+        self._qualities[reported] = qualities[report]
+        self._published[reported] = True
+
+        return sorted(reported.tolist())
@@ -1,16 +1,98 @@
+import asyncio
 import json
 import logging
+import os
 import time
-from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 
+from apscheduler.events import EVENT_JOB_MAX_INSTANCES
+from apscheduler.jobstores.base import JobLookupError
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers import interval
 
-from .exceptions import DaqJobAlreadyExists
+from .daq_deadband import DEADBAND_ABSOLUTE, DEADBAND_TYPES, DeadbandFilter
+from .exceptions import (
+    ConnectionCircuitOpen,
+    DaqJobAlreadyExists,
+    TagsGroupNotFound,
+)
+from .metrics import ScanJobMetrics
+from .msg_packer import (
+    SCAN_CODEC_JSON,
+    SCAN_CODEC_MSGPACK,
+    encode_batch_frame,
+    encode_frame,
+    encode_schema_frame,
+    indexed_values_frame,
+    scan_values_frame,
+)
+from .spool import Spool
+from .tag_set import TagSet
 
 log = logging.getLogger(__name__)
 
 DAQ_CONFIG_KEY = "daq_jobs"
+DAQ_SETTINGS_KEY = "daq"
+SPOOL_SETTINGS_KEY = "spool"
+SPOOL_REPLAY_INTERVAL = 0.1
+
+PAYLOAD_FORMAT_JSON = "json"
+PAYLOAD_FORMAT_COLUMNAR = "columnar"
+PAYLOAD_FORMAT_INDEXED = "indexed"
+PAYLOAD_CODECS = {
+    PAYLOAD_FORMAT_JSON: SCAN_CODEC_JSON,
+    PAYLOAD_FORMAT_COLUMNAR: SCAN_CODEC_MSGPACK,
+    PAYLOAD_FORMAT_INDEXED: SCAN_CODEC_MSGPACK,
+}
+
+PHASE_AUTO = "auto"  # Join jobs of the same connection/interval, otherwise start now
+PHASE_STAGGER = (
+    "stagger"  # Spread scan groups of the same interval evenly within the interval
+)
+PHASE_ALIGN = "align"  # Fire on wall-clock interval boundaries (plus phase_offset)
+PHASE_POLICIES = [PHASE_AUTO, PHASE_STAGGER, PHASE_ALIGN]
+
+HIGH_RATE_MIN_PERIOD_MS = 50
+
+# Degraded job steps back once its reads fit into this part of the lower step interval
+ADAPTIVE_RECOVER_RATIO = 0.5
+
+# Optional job settings (persisted along with the job) and their defaults
+JOB_OPTIONS = {
+    "read_timeout": None,  # None - use agent default
+    "payload_format": None,  # None - use agent default
+    "report_by_exception": False,
+    "deadband": 0,  # Single value or {tag: deadband}
+    "deadband_type": DEADBAND_ABSOLUTE,
+    "keyframe_seconds": None,  # Full snapshot interval (None - use agent default)
+    "phase_policy": None,  # None - use agent default
+    "phase_offset": 0,  # Seconds after wall-clock interval boundary ('align' policy)
+    "period_ms": None,  # High-rate scan period (overrides seconds)
+    "batch_samples": None,  # Publish once N samples accumulated
+    "batch_ms": None,  # Publish accumulated samples at most T milliseconds after the first one
+    "adaptive_rate": None,  # Stretch interval on sustained overruns (None - use agent default)
+}
+
+
+class _ScanBatch:
+    """Union of tags requested by jobs of the same scan group on a single tick"""
+
+    def __init__(self, loop):
+        self.tags = {}  # Used as insertion ordered set
+        self.job_ids = set()
+        self.future = loop.create_future()
+        self.timer = None
+        self.timeout = None  # Shortest read timeout of the jobs
+
+        # Avoid "exception never retrieved" warnings if all the jobs timed out
+        self.future.add_done_callback(lambda f: f.cancelled() or f.exception())
+
+    def add(self, job_id, tags, timeout=None):
+        self.job_ids.add(job_id)
+        self.tags.update(dict.fromkeys(tags))
+        if timeout:
+            self.timeout = min(self.timeout or timeout, timeout)
 
 
 class DAQScheduler(AsyncIOScheduler):
@@ -28,8 +110,60 @@ class DAQScheduler(AsyncIOScheduler):
         self._job_state = {}
         self._config = config
         self._total_iterations_counter = 0
+        self._max_workers_per_connection = self._config.get(
+            f"{DAQ_SETTINGS_KEY}.max_workers_per_connection", 1
+        )
+        self._default_read_timeout = self._config.get(
+            f"{DAQ_SETTINGS_KEY}.read_timeout", 0
+        )
+        self._default_payload_format = self._config.get(
+            f"{DAQ_SETTINGS_KEY}.payload_format", PAYLOAD_FORMAT_JSON
+        )
+        self._default_keyframe_seconds = self._config.get(
+            f"{DAQ_SETTINGS_KEY}.keyframe_seconds", 300
+        )
+        self._default_phase_policy = self._config.get(
+            f"{DAQ_SETTINGS_KEY}.phase_policy", PHASE_AUTO
+        )
+        adaptive_rate = self._config.get(f"{DAQ_SETTINGS_KEY}.adaptive_rate", {})
+        self._default_adaptive_rate = adaptive_rate.get("enabled", False)
+        self._adaptive_overruns = adaptive_rate.get("overruns", 3)
+        self._adaptive_step = adaptive_rate.get("step", 2)
+        self._adaptive_max_factor = adaptive_rate.get("max_factor", 8)
+        self._adaptive_recover_scans = adaptive_rate.get("recover_scans", 10)
+        self._coalesce_window = (
+            self._config.get(f"{DAQ_SETTINGS_KEY}.coalesce_window_ms", 100) / 1000
+        )
+        self._read_executors = {}
+        self._pending_reads = {}
+        self._scan_groups = {}
+        self._pending_batches = {}
+        self._registered_groups = {}
+        self._job_metrics = {}
+        self._stats_interval = self._config.get(f"{DAQ_SETTINGS_KEY}.stats_interval", 0)
+        self._stats_task = None
+        self._high_rate_tasks = {}
+        self._spool = None
+        self._spool_task = None
+        if self._config.get(f"{SPOOL_SETTINGS_KEY}.enabled", False):
+            self._spool = Spool(
+                os.path.join(
+                    self._config.base_path,
+                    self._config.get(f"{SPOOL_SETTINGS_KEY}.directory", "spool"),
+                ),
+                max_size=self._config.get(f"{SPOOL_SETTINGS_KEY}.max_size_mb", 512)
+                * 2**20,
+                segment_size=self._config.get(
+                    f"{SPOOL_SETTINGS_KEY}.segment_size_mb", 16
+                )
+                * 2**20,
+            )
+        self._spool_replay_rate = self._config.get(
+            f"{SPOOL_SETTINGS_KEY}.replay_rate", 1000
+        )
 
         super(DAQScheduler, self).__init__(gconfig={}, options=options)
+        self.add_listener(self._on_job_max_instances, EVENT_JOB_MAX_INSTANCES)
 
         # Recreate jobs from config
         jobs = self._config.get(f"{DAQ_CONFIG_KEY}")
@@ -44,6 +178,10 @@ class DAQScheduler(AsyncIOScheduler):
                     tags=jobs[job_id]["tags"],
                     seconds=jobs[job_id]["seconds"],
                     from_cache=jobs[job_id]["from_cache"],
+                    **{
+                        opt: jobs[job_id].get(opt, default)
+                        for opt, default in JOB_OPTIONS.items()
+                    },
                 )
             except Exception as e:
                 log.exception(f'Error starting job - "{job_id}" - {e}')
@@ -53,54 +191,808 @@ class DAQScheduler(AsyncIOScheduler):
         for job_id in jobs:
             self.remove_job(job_id, persist=persist)
 
-    async def _job_func(self, job_id, conn, broker, tags, from_cache, refresh_rate_ms):
+    def start(self, paused=False):
+        super().start(paused=paused)
+
+        if self._stats_interval:
+            self._stats_task = self._eventloop.create_task(self._publish_stats_loop())
+
+        if self._spool is not None:
+            self._spool_task = self._eventloop.create_task(self._replay_spool_loop())
+
+        for job in self.get_jobs():
+            if job.args[6]["period_ms"]:
+                self._start_high_rate(job.id)
+
+    def shutdown(self, wait=True):
+        super().shutdown(wait=wait)
+
+        for job_id in list(self._high_rate_tasks):
+            self._stop_high_rate(job_id)
+
+        for job_id in list(self._job_state):
+            self._flush_batch(job_id)
+
+        if self._stats_task:
+            self._stats_task.cancel()
+            self._stats_task = None
+
+        if self._spool_task:
+            self._spool_task.cancel()
+            self._spool_task = None
+
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
+
+        # Reads still running were abandoned (timed out) - don't block the loop on them
+        for executor in self._read_executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+        self._read_executors = {}
+
+    def _connection_executor(self, conn):
+        if conn.name not in self._read_executors:
+            # Pooled connections serve as many reads in parallel as their sessions
+            self._read_executors[conn.name] = ThreadPoolExecutor(
+                max_workers=max(
+                    self._max_workers_per_connection, getattr(conn, "pool_size", 1)
+                ),
+                thread_name_prefix=f"daq-{conn.name}",
+            )
+        return self._read_executors[conn.name]
+
+    async def _run_in_executor(self, job_id, conn, timeout, func, *args):
+        """Run a blocking connector call on the connection's workers.
+
+        The call is abandoned (but keeps running on its worker) if not completed
+        within timeout seconds - the job skips its next scans until it is done.
+        """
+        future = self._connection_executor(conn).submit(func, *args)
+        self._pending_reads[job_id] = future
+
+        try:
+            return await asyncio.wait_for(
+                asyncio.wrap_future(future), timeout=timeout or None
+            )
+        except asyncio.TimeoutError:
+            log.warning(
+                f"Job '{job_id}': call to '{conn.name}' abandoned after {timeout}s timeout."
+            )
+            raise
+
+    def _start_high_rate(self, job_id):
+        self._stop_high_rate(job_id)
+        self._high_rate_tasks[job_id] = self._eventloop.create_task(
+            self._high_rate_loop(job_id)
+        )
+
+    def _stop_high_rate(self, job_id):
+        task = self._high_rate_tasks.pop(job_id, None)
+        if task:
+            task.cancel()
+
+    async def _high_rate_loop(self, job_id):
+        """Scan loop of a high-rate job.
+
+        Scans are scheduled on the event loop monotonic clock against a fixed grid
+        (start + n * period), so delays of single scans do not accumulate as drift.
+        Ticks missed by scans longer than the period are skipped. The lateness of
+        each scan start is reported as jitter.
+        """
+        loop = asyncio.get_running_loop()
+        task = asyncio.current_task()
+        job = self.get_job(job_id)
+        period = job.args[6]["period_ms"] / 1000
+        metrics = self._job_metrics[job_id]
+
+        next_time = loop.time() + period
+        # Cancellation may be swallowed by wait_for of a read completing at the same time
+        while self._high_rate_tasks.get(job_id) is task and not task.cancelling():
+            await asyncio.sleep(max(0.0, next_time - loop.time()))
+            metrics.jitter.add((loop.time() - next_time) * 1000)
+
+            await self._job_func(*job.args)
+
+            next_time += period
+            missed = int((loop.time() - next_time) // period) + 1
+            if missed > 0:
+                metrics.skipped += missed
+                next_time += missed * period
+
+    @staticmethod
+    def _scan_group_key(job):
+        """Jobs sharing connection, interval, phase and cache mode are read together"""
+        seconds = job.trigger.interval.total_seconds()
+        phase = round(job.trigger.start_date.timestamp() % seconds, 3)
+        return job.args[1].name, seconds, phase, job.args[4]
+
+    def _scan_trigger(self, job_id, conn_name, seconds, from_cache, options):
+        """Create interval trigger according to the job phase policy.
+
+        Unless aligned to wall-clock, jobs are kept in phase with other jobs of the
+        same connection and interval so they are read together.
+        """
+        policy = options["phase_policy"] or self._default_phase_policy
+        if policy == PHASE_ALIGN:
+            return self._phase_trigger(seconds, options["phase_offset"])
+
+        for job in self.get_jobs():
+            if (
+                job.id != job_id
+                and job.args[1].name == conn_name
+                and job.args[4] == from_cache
+                and job.trigger.interval == timedelta(seconds=seconds)
+            ):
+                return interval.IntervalTrigger(
+                    seconds=seconds, start_date=job.trigger.start_date
+                )
+
+        if policy == PHASE_STAGGER:
+            return self._phase_trigger(seconds, self._stagger_phase(job_id, seconds))
+
+        return interval.IntervalTrigger(seconds=seconds)
+
+    @staticmethod
+    def _phase_trigger(seconds, phase):
+        """Interval trigger firing 'phase' seconds after wall-clock interval boundaries"""
+        now = time.time()
+        start = now - now % seconds + phase % seconds
+        return interval.IntervalTrigger(
+            seconds=seconds, start_date=datetime.fromtimestamp(start, tz=timezone.utc)
+        )
+
+    def _stagger_phase(self, job_id, seconds):
+        """Middle of the largest gap between phases of other scan groups with the same interval"""
+        phases = sorted(
+            {
+                key[2]
+                for key, job_ids in self._scan_groups.items()
+                if key[1] == seconds and job_ids - {job_id}
+            }
+        )
+        if not phases:
+            return 0
+
+        gaps = [
+            (end - start, start)
+            for start, end in zip(phases, phases[1:] + [phases[0] + seconds])
+        ]
+        size, start = max(gaps, key=lambda gap: gap[0])
+        return round((start + size / 2) % seconds, 3)
+
+    def _join_scan_group(self, job):
+        self._leave_scan_group(job.id)
+
+        key = self._scan_group_key(job)
+        self._scan_groups.setdefault(key, set()).add(job.id)
+        self._job_state[job.id]["scan_group"] = key
+
+    def _leave_scan_group(self, job_id):
+        key = self._job_state.get(job_id, {}).get("scan_group")
+        if key in self._scan_groups:
+            self._scan_groups[key].discard(job_id)
+            if not self._scan_groups[key]:
+                del self._scan_groups[key]
+                self._unregister_group(key)
+
+    def _scan_group_tags(self, key):
+        """Ordered union of tags of all the scan group jobs"""
+        tags = {}
+        for job_id in sorted(self._scan_groups.get(key, [])):
+            tags.update(dict.fromkeys(self._job_state[job_id]["tags"]))
+        return tuple(tags)
+
+    @staticmethod
+    def _supports_groups(conn):
+        return callable(getattr(conn, "register_group", None)) and callable(
+            getattr(conn, "read_group_values", None)
+        )
+
+    def _read_scan_group(self, conn, key, tags):
+        """Read scan group tags through connector group subscription.
+
+        Runs on connection workers. The group is (re)registered whenever the group
+        tags changed or the connector lost it (e.g. after reconnect). Connectors
+        failing to register the group are read directly with read_tag_values.
+        """
+        group_name = self._group_id(key)
+        registration = (conn.name, group_name)
+
+        registered = self._registered_groups.get(registration)
+        groups = conn.list_groups()
+        if (
+            registered is None
+            or registered[0] != tags
+            or (registered[1] and group_name not in groups)
+        ):
+            if group_name in groups:
+                conn.unregister_group(group_name)
+
+            try:
+                conn.register_group(
+                    group_name=group_name,
+                    tags=list(tags),
+                    refresh_rate_ms=int(key[1] * 1000),
+                )
+                log.info(
+                    f"Group '{group_name}' registered on '{conn.name}' ({len(tags)} tags)."
+                )
+                registered = (tags, True)
+            except Exception as e:
+                log.warning(
+                    f"Cannot register group '{group_name}' on '{conn.name}' - {e}. "
+                    f"Reading tags directly."
+                )
+                registered = (tags, False)
+
+            self._registered_groups[registration] = registered
+
+        if not registered[1]:
+            return conn.read_tag_values(list(tags))
+
+        try:
+            return conn.read_group_values(group_name, from_cache=key[3])
+        except TagsGroupNotFound:
+            # Register again on next scan
+            self._registered_groups.pop(registration, None)
+            raise
+
+    def _forget_groups(self, conn_name):
+        """Drop group registrations of reconnected connection"""
+        for registration in list(self._registered_groups):
+            if registration[0] == conn_name:
+                self._registered_groups.pop(registration, None)
+
+    def _unregister_group(self, key):
+        group_name = self._group_id(key)
+        registered = self._registered_groups.pop((key[0], group_name), None)
+        if not registered or not registered[1]:
+            return
+
+        try:
+            conn = self._connection_manager.connection(key[0], check_enabled=False)
+            if conn.connected:
+                self._connection_executor(conn).submit(
+                    conn.unregister_group, group_name
+                )
+        except Exception as e:
+            log.warning(f"Error unregistering group '{group_name}' - {e}")
+
+    async def _read_coalesced(self, job_id, conn, tags, timeout):
+        """Read job tags as part of a single union read of its scan group.
+
+        The read is issued once all the group jobs requested their tags (or when
+        the coalescing window expires), results are then split between the jobs.
+        """
+        loop = asyncio.get_running_loop()
+        key = self._job_state[job_id]["scan_group"]
+
+        batch = self._pending_batches.get(key)
+        if batch is None:
+            batch = self._pending_batches[key] = _ScanBatch(loop)
+            batch.timer = loop.call_later(
+                self._coalesce_window, self._fire_batch, key, conn
+            )
+        batch.add(job_id, tags, timeout)
+
+        if batch.job_ids >= self._scan_groups.get(key, set()):
+            self._fire_batch(key, conn)
+
+        try:
+            values = await asyncio.wait_for(
+                asyncio.shield(batch.future), timeout=timeout or None
+            )
+        except asyncio.TimeoutError:
+            log.warning(
+                f"Job '{job_id}': read from '{conn.name}' abandoned after {timeout}s timeout."
+            )
+            raise
+
+        if len(self._scan_groups.get(key, [])) <= 1:
+            return values
+
+        return {tag: values[tag] for tag in tags if tag in values}
+
+    def _fire_batch(self, key, conn):
+        batch = self._pending_batches.pop(key, None)
+        if batch is None:
+            return
+
+        batch.timer.cancel()
+        if len(batch.job_ids) > 1:
+            for job_id in batch.job_ids:
+                self._job_metrics[job_id].coalesced += 1
+            log.debug(
+                f"Coalesced read of jobs {sorted(batch.job_ids)} from '{conn.name}' "
+                f"({len(batch.tags)} tags)"
+            )
+
+        if self._supports_groups(conn):
+            future = self._connection_executor(conn).submit(
+                self._read_scan_group, conn, key, self._scan_group_tags(key)
+            )
+        else:
+            future = self._connection_executor(conn).submit(
+                conn.read_tag_values, list(batch.tags)
+            )
+        for job_id in batch.job_ids:
+            self._pending_reads[job_id] = future
+
+        # Abandoned read counts once towards the circuit breaker, not once per job
+        loop = asyncio.get_running_loop()
+        timeout_timer = batch.timeout and loop.call_later(
+            batch.timeout,
+            lambda: future.done() or self._connection_manager.record_failure(conn.name),
+        )
+
+        async def _complete():
+            try:
+                batch.future.set_result(await asyncio.wrap_future(future))
+            except Exception as e:
+                batch.future.set_exception(e)
+            finally:
+                if timeout_timer:
+                    timeout_timer.cancel()
+
+        asyncio.ensure_future(_complete())
+
+    def _sample_frame(
+        self,
+        payload_format,
+        job_id,
+        tags,
+        tag_values,
+        sample_id,
+        keyframe=None,
+        positions=None,
+    ):
+        if payload_format == PAYLOAD_FORMAT_COLUMNAR:
+            return scan_values_frame(tag_values, sample_id, keyframe=keyframe)
+
+        if payload_format == PAYLOAD_FORMAT_INDEXED:
+            return indexed_values_frame(
+                tag_values,
+                tags,
+                self._job_state[job_id]["schema_version"],
+                sample_id,
+                positions=positions,
+                keyframe=keyframe,
+            )
+
+        payload = {
+            "sample_id": sample_id,
+            "data": tag_values,
+        }
+        if keyframe is not None:
+            payload["keyframe"] = keyframe
+        return payload
+
+    def _publish_samples(self, job_id, broker, payload_format, samples, batch=False):
+        metrics = self._job_metrics[job_id]
+
+        start_time = time.perf_counter()
+        if payload_format == PAYLOAD_FORMAT_JSON:
+            msg = json.dumps(
+                {"samples": samples} if batch else samples[0],
+                sort_keys=True,
+                default=str,
+            ).encode()
+        elif batch:
+            msg = encode_batch_frame(samples)
+        else:
+            msg = encode_frame(samples[0])
+        metrics.serialize_time.add(time.perf_counter() - start_time)
+        metrics.payload_bytes.add(len(msg))
+
+        headers = {"job_id": job_id, "codec": PAYLOAD_CODECS[payload_format]}
+        if batch:
+            headers["frame_type"] = "batch"
+        elif payload_format == PAYLOAD_FORMAT_INDEXED:
+            headers["frame_type"] = "values"
+
+        start_time = time.perf_counter()
+        if self._publish(broker, msg, headers):
+            metrics.publish_time.add(time.perf_counter() - start_time)
+            metrics.published += 1
+        else:
+            metrics.spooled += 1
+
+    def _publish(self, broker, msg, headers):
+        """Publish message to broker, or to the spool while the broker is down
+        (and until already spooled messages are replayed - to keep messages order)
+
+        :return: True if published to broker
+        """
+        if self._spool is not None and (
+            len(self._spool) or not self._broker_available(broker)
+        ):
+            self._spool.append(msg, headers)
+            return False
+
+        broker.publish_data(msg, headers=headers)
+        return True
+
+    @staticmethod
+    def _broker_available(broker):
+        # AmqBrokerConnector doesn't expose its state - check its robust AMQP connection
+        conn = getattr(broker, "_broker_conn", None)
+        if conn is None:
+            return True
+        return not conn.is_closed and getattr(conn, "transport", None) is not None
+
+    async def _replay_spool_loop(self):
+        """Replay spooled messages in order (at most replay_rate messages per second)
+        once the broker is available again
+        """
+        chunk = max(1, int(self._spool_replay_rate * SPOOL_REPLAY_INTERVAL))
+        while True:
+            await asyncio.sleep(SPOOL_REPLAY_INTERVAL)
+            if not len(self._spool) or not self._broker_available(self._broker_conn):
+                continue
+
+            try:
+                for _ in range(chunk):
+                    message = self._spool.peek()
+                    if message is None:
+                        break
+
+                    data, headers = message
+                    self._broker_conn.publish_data(data, headers=headers)
+                    self._spool.pop()
+
+                if not len(self._spool):
+                    log.info("All spooled messages replayed.")
+            except Exception as e:
+                log.exception(f"Error replaying spooled messages - {e}")
+
+    def _publish_status(self, job_id, broker, payload_format, status, **details):
+        """Publish job status sample (e.g. 'disconnected') in place of scan values"""
+        self._flush_batch(job_id)
+
+        state = self._job_state[job_id]
+        frame = {
+            "sample_id": state["iter_counter"],
+            "status": status,
+            "timestamp": time.time(),
+            **details,
+        }
+        state["iter_counter"] += 1
+
+        # Report all the tags once values are available again
+        state.pop("deadband_schema_version", None)
+
+        if payload_format == PAYLOAD_FORMAT_JSON:
+            msg = json.dumps(frame, sort_keys=True).encode()
+        else:
+            msg = encode_frame(
+                {"codec": SCAN_CODEC_MSGPACK, "frame_type": "status", **frame}
+            )
+
+        self._publish(
+            broker,
+            msg,
+            {
+                "job_id": job_id,
+                "codec": PAYLOAD_CODECS[payload_format],
+                "frame_type": "status",
+            },
+        )
+
+    def _batch_sample(self, job_id, broker, payload_format, options, sample):
+        """Accumulate job sample until batch_samples are collected or batch_ms expired"""
+        state = self._job_state[job_id]
+
+        batch = state.get("batch")
+        if batch is None:
+            batch = state["batch"] = {
+                "broker": broker,
+                "payload_format": payload_format,
+                "samples": [],
+                "timer": None,
+            }
+            if options["batch_ms"]:
+                batch["timer"] = asyncio.get_running_loop().call_later(
+                    options["batch_ms"] / 1000, self._flush_batch, job_id
+                )
+
+        batch["samples"].append(sample)
+        if (
+            options["batch_samples"]
+            and len(batch["samples"]) >= options["batch_samples"]
+        ):
+            self._flush_batch(job_id)
+
+    def _flush_batch(self, job_id):
+        """Publish job samples accumulated so far (if any)"""
+        batch = self._job_state.get(job_id, {}).pop("batch", None)
+        if batch is None:
+            return
+
+        if batch["timer"]:
+            batch["timer"].cancel()
+
         try:
-            # Reconnect if needed
+            self._publish_samples(
+                job_id,
+                batch["broker"],
+                batch["payload_format"],
+                batch["samples"],
+                batch=True,
+            )
+        except Exception as e:
+            self._job_metrics[job_id].record_error(e)
+            log.exception(f'Error publishing batch of job "{job_id}" - {e}')
+
+    def _deadband_filter(self, job_id, tags, options):
+        """Return job's report-by-exception filter and whether a keyframe is due"""
+        state = self._job_state[job_id]
+
+        # Filter arrays follow job tags order - rebuild whenever the tags change
+        if state.get("deadband_schema_version") != state["schema_version"]:
+            state["deadband_filter"] = DeadbandFilter(
+                tags, options["deadband"], options["deadband_type"]
+            )
+            state["deadband_schema_version"] = state["schema_version"]
+            state["last_keyframe"] = None
+
+        keyframe_seconds = options["keyframe_seconds"] or self._default_keyframe_seconds
+        now = time.monotonic()
+        keyframe = (
+            state["last_keyframe"] is None
+            or now - state["last_keyframe"] >= keyframe_seconds
+        )
+        if keyframe:
+            state["last_keyframe"] = now
+
+        return state["deadband_filter"], keyframe
+
+    async def _job_func(
+        self, job_id, conn, broker, tags, from_cache, refresh_rate_ms, options
+    ):
+        read_timeout = self._read_timeout(options["read_timeout"])
+        payload_format = options["payload_format"] or self._default_payload_format
+        metrics = self._job_metrics[job_id]
+        metrics.runs += 1
+
+        try:
+            # Previous (abandoned) read is still stuck on the connection workers
+            pending = self._pending_reads.get(job_id)
+            if pending and not pending.done():
+                metrics.skipped += 1
+                log.warning(
+                    f"Job '{job_id}': previous read from '{conn.name}' still running, skipping scan."
+                )
+                return
+
+            # Dropped connection is reconnected in background by connection manager
             if not conn.connected:
-                log.info(f"Reconnecting to '{conn.name}' {conn.TYPE}  Server...")
-                conn.connect()
-                log.info(conn.connection_info())
-
-            # if not self._group_id(job_id) in conn.list_groups():
-            #     log.info(f"Re-registering group {self._group_id(job_id)}...")
-            #     conn.register_group(
-            #         group_name=self._group_id(job_id),
-            #         tags=tags,
-            #         refresh_rate_ms=refresh_rate_ms,
-            #     )
+                self._connection_manager.reconnect(conn.name)
+                self._forget_groups(conn.name)
+                metrics.disconnected += 1
+                self._publish_status(job_id, broker, payload_format, "disconnected")
+                return
 
             # Read data
             start_time = time.time()
-            # tag_values = conn.read_group_values(
-            #     self._group_id(job_id), from_cache=from_cache
-            # )
-            tag_values = conn.read_tag_values(tags)
+            if options["period_ms"]:
+                # High-rate jobs can't afford waiting for the coalescing window
+                tag_values = await self._run_in_executor(
+                    job_id, conn, read_timeout, conn.read_tag_values, list(tags)
+                )
+            else:
+                tag_values = await self._read_coalesced(
+                    job_id, conn, tags, read_timeout
+                )
             if not tag_values:
                 log.warning(f"No data read for job '{job_id}'!")
                 return
 
             read_time = time.time() - start_time
+            metrics.read_time.add(read_time)
+            if read_time * 1000 > refresh_rate_ms:
+                metrics.overruns += 1
+            if self._is_adaptive(options):
+                self._adapt_scan_rate(job_id, payload_format, read_time)
 
-            payload = {
-                "sample_id": self._job_state[job_id]["iter_counter"],
-                "data": tag_values,
-            }
+            # Report by exception - keep only tags which changed since last published
+            keyframe = positions = None
+            if options["report_by_exception"]:
+                deadband_filter, keyframe = self._deadband_filter(job_id, tags, options)
+                positions = deadband_filter.filter(tag_values, keyframe=keyframe)
+                if not positions:
+                    return
+
+                tag_values = {
+                    tags[i]: tag_values[tags[i]]
+                    for i in positions
+                    if tags[i] in tag_values
+                }
 
-            msg = json.dumps(payload, sort_keys=True, default=str).encode()
+            sample = self._sample_frame(
+                payload_format,
+                job_id,
+                tags,
+                tag_values,
+                self._job_state[job_id]["iter_counter"],
+                keyframe=keyframe,
+                positions=positions,
+            )
+
+            # Indexed values refer to the schema (ordered tags) - publish it once per change
+            if payload_format == PAYLOAD_FORMAT_INDEXED:
+                self._publish_schema(job_id, broker, tags)
 
             # Publish
-            to_publish = [f'{t}={tag_values[t]["Value"]}' for t in tag_values]
             self._total_iterations_counter += 1
             self._job_state[job_id]["iter_counter"] += 1
-            log.debug(
-                f"(#{self._total_iterations_counter}): Job {job_id}: "
-                f'Data publish (read time={read_time:.2f}s): {", ".join(to_publish[:120])}'
-            )
-            broker.publish_data(msg, headers={"job_id": job_id})
+            if log.isEnabledFor(logging.DEBUG):
+                to_publish = [
+                    f'{t}={tag_values[t]["Value"]}' for t in list(tag_values)[:120]
+                ]
+                log.debug(
+                    f"(#{self._total_iterations_counter}): Job {job_id}: "
+                    f'Data publish (read time={read_time:.2f}s): {", ".join(to_publish)}'
+                )
+            if options["batch_samples"] or options["batch_ms"]:
+                self._batch_sample(job_id, broker, payload_format, options, sample)
+            else:
+                self._publish_samples(job_id, broker, payload_format, [sample])
 
+        except asyncio.TimeoutError:
+            metrics.timeouts += 1
+            metrics.record_error(f"Read timeout after {read_timeout}s")
+            # Coalesced reads count their timeout once per batch (see _fire_batch)
+            if options["period_ms"]:
+                self._connection_manager.record_failure(conn.name)
+            if self._is_adaptive(options):
+                self._adapt_scan_rate(job_id, payload_format, read_timeout)
+        except ConnectionCircuitOpen as e:
+            # Dead target - skip the scan without waiting for the read timeout
+            metrics.record_error(e)
+            log.debug(f'Job "{job_id}": {e}')
+            self._publish_status(job_id, broker, payload_format, "circuit_open")
         except Exception as e:
+            metrics.record_error(e)
             log.exception(f'Exception in job "{job_id}" - {e}')
 
+    def _is_adaptive(self, options):
+        # High-rate jobs keep their period (missed ticks are skipped)
+        if options["period_ms"]:
+            return False
+        if options["adaptive_rate"] is None:
+            return self._default_adaptive_rate
+        return options["adaptive_rate"]
+
+    def _adapt_scan_rate(self, job_id, payload_format, read_time):
+        """Stretch job interval on sustained overruns and restore it once reads recover.
+
+        After 'overruns' consecutive reads longer than the current interval, the interval
+        is multiplied by 'step' (up to 'max_factor' times the configured interval). After
+        'recover_scans' consecutive reads fitting into ADAPTIVE_RECOVER_RATIO of the lower
+        step interval, it is divided back. Each change is published as 'degraded' (or
+        'recovered') status sample.
+        """
+        job = self.get_job(job_id)
+        if job is None:
+            return  # Removed while reading
+
+        state = self._job_state[job_id]
+        _, conn, broker, _, from_cache, _, options = job.args
+
+        factor = state["rate_factor"]
+        current = job.trigger.interval.total_seconds()
+        if read_time > current:
+            state["overrun_streak"] += 1
+            state["recover_streak"] = 0
+            if (
+                state["overrun_streak"] < self._adaptive_overruns
+                or factor >= self._adaptive_max_factor
+            ):
+                return
+            factor = min(factor * self._adaptive_step, self._adaptive_max_factor)
+
+        elif factor > 1 and read_time <= (
+            ADAPTIVE_RECOVER_RATIO * current / self._adaptive_step
+        ):
+            state["recover_streak"] += 1
+            state["overrun_streak"] = 0
+            if state["recover_streak"] < self._adaptive_recover_scans:
+                return
+            factor = max(1, factor / self._adaptive_step)
+
+        else:
+            state["overrun_streak"] = state["recover_streak"] = 0
+            return
+
+        seconds = current / state["rate_factor"] * factor
+        state["rate_factor"] = factor
+        state["overrun_streak"] = state["recover_streak"] = 0
+        self._job_metrics[job_id].rate_factor = factor
+
+        job.reschedule(
+            self._scan_trigger(job_id, conn.name, seconds, from_cache, options)
+        )
+        self._join_scan_group(self.get_job(job_id))
+
+        if factor > 1:
+            log.warning(
+                f"Job '{job_id}': sustained overruns (read time {read_time:.2f}s), "
+                f"interval stretched to {seconds:g}s."
+            )
+            self._publish_status(
+                job_id,
+                broker,
+                payload_format,
+                "degraded",
+                rate_factor=factor,
+                interval=seconds,
+            )
+        else:
+            log.info(f"Job '{job_id}': read time recovered, interval {seconds:g}s.")
+            self._publish_status(
+                job_id,
+                broker,
+                payload_format,
+                "recovered",
+                rate_factor=factor,
+                interval=seconds,
+            )
+
+    def _on_job_max_instances(self, event):
+        # Scan fired while the previous one is still running
+        if event.job_id in self._job_metrics:
+            self._job_metrics[event.job_id].skipped += 1
+            log.warning(f"Job '{event.job_id}': previous scan still running, skipped.")
+
+    def job_stats(self, job_id=None):
+        """Return scan metrics of a single job (or of all the jobs)
+
+        :param job_id: job id, all the jobs if None
+        :return: metrics dict (or {job_id: metrics dict})
+        """
+        if job_id is not None:
+            if job_id not in self._job_metrics:
+                raise JobLookupError(job_id)
+            return self._job_metrics[job_id].as_dict()
+
+        return {j: self._job_metrics[j].as_dict() for j in sorted(self._job_metrics)}
+
+    async def _publish_stats_loop(self):
+        while True:
+            await asyncio.sleep(self._stats_interval)
+            try:
+                if self._job_metrics:
+                    self._broker_conn.publish_data(
+                        json.dumps({"jobs": self.job_stats()}).encode(),
+                        headers={"codec": SCAN_CODEC_JSON, "frame_type": "stats"},
+                    )
+            except Exception as e:
+                log.exception(f"Error publishing DAQ jobs stats - {e}")
+
+    def _publish_schema(self, job_id, broker, tags):
+        state = self._job_state[job_id]
+        if state["published_schema_version"] == state["schema_version"]:
+            return
+
+        self._publish(
+            broker,
+            encode_schema_frame(job_id, state["schema_version"], tags),
+            {
+                "job_id": job_id,
+                "codec": SCAN_CODEC_MSGPACK,
+                "frame_type": "schema",
+            },
+        )
+        state["published_schema_version"] = state["schema_version"]
+        log.debug(
+            f"Job {job_id}: schema version {state['schema_version']} published ({len(tags)} tags)"
+        )
+
+    def _bump_schema_version(self, job_id):
+        # Samples of the batch refer to the previous schema
+        self._flush_batch(job_id)
+        self._job_state[job_id]["schema_version"] += 1
+
     def list_jobs(self, conn_name=None):
         if conn_name:
             # Filter jobs by connection name
@@ -118,7 +1010,31 @@ class DAQScheduler(AsyncIOScheduler):
         seconds=1,
         update_on_conflict=False,
         from_cache=True,
+        **options,
     ):
+        """Create (or modify) a periodic scan job
+
+        :param options: Optional job settings:
+            read_timeout - Seconds before a stuck read is abandoned (None - agent default)
+            payload_format - 'json', 'columnar' (msgpack + zstd encoded arrays) or
+                'indexed' (schema frame once per tags change followed by positional value frames)
+            report_by_exception - Publish only tags which changed (value beyond deadband or quality)
+            deadband - Deadband for all tags or {tag: deadband} (default 0 - any change)
+            deadband_type - 'absolute' or 'percent' (of last published value)
+            keyframe_seconds - Period of full snapshots for report-by-exception jobs
+            phase_policy - 'auto' (start now, in phase with jobs of the same connection/interval),
+                'stagger' (spread evenly with other connections jobs of the same interval) or
+                'align' (fire on wall-clock interval boundaries)
+            phase_offset - Seconds after the wall-clock interval boundary ('align' policy)
+            period_ms - Scan period of high-rate jobs (min 50ms), scheduled against monotonic
+                clock with drift correction instead of 'seconds' interval
+            batch_samples - Publish samples in batches of N samples (single message with samples axis)
+            batch_ms - Publish batch no later than T milliseconds after its first sample
+            adaptive_rate - Stretch the interval after sustained overruns (publishing 'degraded'
+                status) and restore it once reads recover (None - agent default)
+        """
+        options = self._job_options(**options)
+
         # order tags alphabetically
         tags.sort()
 
@@ -130,46 +1046,38 @@ class DAQScheduler(AsyncIOScheduler):
             job = self.get_job(job_id)
 
             # Modify interval
-            if timedelta(seconds=seconds) != job.trigger.interval:
-                job.reschedule(interval.IntervalTrigger(seconds=seconds))
-                self._config.set(
-                    f"{DAQ_CONFIG_KEY}.{job_id}",
-                    {
-                        "conn_name": conn_name,
-                        "tags": tags,
-                        "seconds": seconds,
-                        "from_cache": from_cache,
-                    },
+            if (
+                timedelta(seconds=seconds) != job.trigger.interval
+                and not options["period_ms"]
+            ):
+                job.reschedule(
+                    self._scan_trigger(job_id, conn_name, seconds, from_cache, options)
                 )
+                job = self.get_job(job_id)
+                self._join_scan_group(job)
+                self._reset_rate(job_id)
+                self._persist_job(job_id, conn_name, tags, seconds, from_cache, options)
 
             # Modify args
-            if job.args[1].name != conn_name or job.args[3] != tags:
-                self._create_scan_job(job_id, conn_name, tags, seconds, from_cache)
-                self._config.set(
-                    f"{DAQ_CONFIG_KEY}.{job_id}",
-                    {
-                        "conn_name": conn_name,
-                        "tags": tags,
-                        "seconds": seconds,
-                        "from_cache": from_cache,
-                    },
+            if (
+                job.args[1].name != conn_name
+                or job.args[3] != tags
+                or job.args[6] != options
+            ):
+                self._create_scan_job(
+                    job_id, conn_name, tags, seconds, from_cache, **options
                 )
+                self._persist_job(job_id, conn_name, tags, seconds, from_cache, options)
             log.info(
                 f"Job  '{job_id}' modified (Connection: '{conn_name}', Seconds: {seconds}  "
                 f"with tags: '{tags}'  from_cache: '{from_cache}')."
             )
 
         else:
-            job = self._create_scan_job(job_id, conn_name, tags, seconds, from_cache)
-            self._config.set(
-                f"{DAQ_CONFIG_KEY}.{job_id}",
-                {
-                    "conn_name": conn_name,
-                    "tags": tags,
-                    "seconds": seconds,
-                    "from_cache": from_cache,
-                },
+            job = self._create_scan_job(
+                job_id, conn_name, tags, seconds, from_cache, **options
             )
+            self._persist_job(job_id, conn_name, tags, seconds, from_cache, options)
             log.info(
                 f"Job  '{job_id}' created (Connection: '{conn_name}', Seconds: {seconds}  "
                 f"with tags: '{tags}'  from_cache:'{from_cache}')."
@@ -178,24 +1086,79 @@ class DAQScheduler(AsyncIOScheduler):
         return job
 
     @staticmethod
-    def _group_id(job_id):
-        return f"scan_job_{job_id}"
+    def _job_options(**options):
+        unknown = set(options) - set(JOB_OPTIONS)
+        if unknown:
+            raise TypeError(f"Unsupported DAQ job options: {sorted(unknown)}")
 
-    def _create_scan_job(self, job_id, conn_name, tags, seconds, from_cache):
-        refresh_rate_ms = seconds * 1000
+        payload_format = options.get("payload_format")
+        if payload_format is not None and payload_format not in PAYLOAD_CODECS:
+            raise ValueError(f"Unsupported payload format '{payload_format}'")
 
+        deadband_type = options.get("deadband_type", DEADBAND_ABSOLUTE)
+        if deadband_type not in DEADBAND_TYPES:
+            raise ValueError(f"Unsupported deadband type '{deadband_type}'")
+
+        phase_policy = options.get("phase_policy")
+        if phase_policy is not None and phase_policy not in PHASE_POLICIES:
+            raise ValueError(f"Unsupported phase policy '{phase_policy}'")
+
+        period_ms = options.get("period_ms")
+        if period_ms is not None and period_ms < HIGH_RATE_MIN_PERIOD_MS:
+            raise ValueError(
+                f"High-rate scan period must be at least {HIGH_RATE_MIN_PERIOD_MS}ms"
+            )
+
+        for option in ["batch_samples", "batch_ms"]:
+            if options.get(option) is not None and options[option] <= 0:
+                raise ValueError(f"Job option '{option}' must be positive")
+
+        return {**JOB_OPTIONS, **options}
+
+    def _persist_job(self, job_id, conn_name, tags, seconds, from_cache, options):
+        self._config.set(
+            f"{DAQ_CONFIG_KEY}.{job_id}",
+            {
+                "conn_name": conn_name,
+                "tags": list(tags),
+                "seconds": seconds,
+                "from_cache": from_cache,
+                **options,
+            },
+        )
+
+    def _read_timeout(self, read_timeout):
+        return self._default_read_timeout if read_timeout is None else read_timeout
+
+    @staticmethod
+    def _group_id(key):
+        _, seconds, phase, from_cache = key
+        return f"scan_{seconds:g}s_{round(phase * 1000)}ms_{'cache' if from_cache else 'device'}"
+
+    def _create_scan_job(self, job_id, conn_name, tags, seconds, from_cache, **options):
         conn = self._connection_manager.connection(conn_name, check_enabled=False)
 
-        # if conn.connected:
-        #     conn.register_group(
-        #         group_name=self._group_id(job_id),
-        #         tags=tags,
-        #         refresh_rate_ms=refresh_rate_ms,
-        #     )
-        #
-        trigger = interval.IntervalTrigger(seconds=seconds)
+        # Shared by job args and state - modified in place by tags updates
+        tags = TagSet(tags)
+        options = self._job_options(**options)
+        self._stop_high_rate(job_id)
+        self._flush_batch(job_id)
+
+        high_rate = bool(options["period_ms"])
+        if high_rate:
+            # Registered paused - scans are driven by the high-rate loop
+            refresh_rate_ms = options["period_ms"]
+            trigger = interval.IntervalTrigger(seconds=refresh_rate_ms / 1000)
+            run_options = {"next_run_time": None}
+        else:
+            refresh_rate_ms = seconds * 1000
+            trigger = self._scan_trigger(
+                job_id, conn_name, seconds, from_cache, options
+            )
+            run_options = {}
 
         job = self.add_job(
+            **run_options,
             func=self._job_func,
             trigger=trigger,
             # seconds=seconds,
@@ -203,43 +1166,99 @@ class DAQScheduler(AsyncIOScheduler):
             id=job_id,
             max_instances=1,
             replace_existing=True,
-            args=[job_id, conn, self._broker_conn, tags, from_cache, refresh_rate_ms],
+            args=[
+                job_id,
+                conn,
+                self._broker_conn,
+                tags,
+                from_cache,
+                refresh_rate_ms,
+                options,
+            ],
         )
 
-        self._job_state[job_id] = {"iter_counter": 0}
+        # Schema version keeps growing across job modifications
+        prev_schema_version = self._job_state.get(job_id, {}).get("schema_version", -1)
+        self._job_state[job_id] = {
+            "iter_counter": 0,
+            "schema_version": prev_schema_version + 1,
+            "published_schema_version": None,
+            "scan_group": self._job_state.get(job_id, {}).get("scan_group"),
+            "tags": tags,
+        }
+        # Metrics are kept across job modifications
+        self._job_metrics.setdefault(job_id, ScanJobMetrics())
+        self._reset_rate(job_id)
+
+        if high_rate:
+            self._leave_scan_group(job_id)
+            self._job_state[job_id]["scan_group"] = None
+            if self.running:
+                self._start_high_rate(job_id)
+        else:
+            self._join_scan_group(job)
 
         return job
 
+    def _reset_rate(self, job_id):
+        # Job (re)scheduled at its configured interval
+        self._job_state[job_id].update(
+            {"rate_factor": 1, "overrun_streak": 0, "recover_streak": 0}
+        )
+        self._job_metrics[job_id].rate_factor = 1
+
     def remove_job(self, job_id, persist=True):
         if not isinstance(job_id, list):
             job_id = [job_id]
 
         for j in job_id:
-            # job = self.get_job(j)
-            # conn = job.args[1]
-
             super().remove_job(j)
+            self._stop_high_rate(j)
+            self._flush_batch(j)
+            self._pending_reads.pop(j, None)
+            self._job_metrics.pop(j, None)
+            self._leave_scan_group(j)
 
-            # conn.unregister_group(self._group_id(j))
-            #
             if persist:
                 self._config.remove(f"{DAQ_CONFIG_KEY}.{j}")
 
-    def list_tags(self, job_id):
+    def _job_tags(self, job_id):
         job = self.get_job(job_id)
+        if job is None:
+            raise JobLookupError(job_id)
         return job.args[3]
 
-    def add_tags(self, job_id, tags):
-        existing_tags = self.list_tags(job_id)
+    def list_tags(self, job_id):
+        return list(self._job_tags(job_id))
+
+    def update_tags(self, job_id, add=None, remove=None):
+        """Remove and add job tags in a single step
 
-        # Add tags to list unless already exist
-        for tag in tags:
-            existing_tags.append(tag) if tag not in existing_tags else existing_tags
+        The job schema version is bumped and the job tags are persisted once
+        for the whole change.
+
+        :param job_id:
+        :param add: tags to add (existing tags are ignored)
+        :param remove: tags to remove (missing tags are ignored)
+        :return: {"added": [...], "removed": [...]} - tags actually changed
+        """
+        tags = self._job_tags(job_id)
+        added, removed = tags.update(add=add or [], remove=remove or [])
+
+        if added or removed:
+            self._bump_schema_version(job_id)
+            self._config.set(f"{DAQ_CONFIG_KEY}.{job_id}.tags", list(tags))
+            log.info(
+                f"Job '{job_id}' tags updated: {len(added)} added, {len(removed)} removed."
+            )
+
+        return {"added": added, "removed": removed}
+
+    def add_tags(self, job_id, tags):
+        self.update_tags(job_id, add=tags)
 
     def remove_tags(self, job_id, tags):
-        existing_tags = self.list_tags(job_id)
-        for tag in tags:
-            existing_tags.remove(tag)
+        self.update_tags(job_id, remove=tags)
 
 
 def create_daq_scheduler(
@@ -0,0 +1,458 @@
+import asyncio
+import contextlib
+import itertools
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import zlib
+
+from amqp_fabric.amq_broker_connector import AmqBrokerConnector
+from apscheduler.jobstores.base import JobLookupError
+
+from data_agent.config_manager import ConfigManager
+from data_agent.connection_manager import ConnectionManager
+from data_agent.daq_scheduler import (
+    DAQ_CONFIG_KEY,
+    SPOOL_SETTINGS_KEY,
+    create_daq_scheduler,
+)
+from data_agent.exceptions import (
+    DaqJobAlreadyExists,
+    DaqWorkerError,
+    UnrecognizedConnection,
+)
+
+log = logging.getLogger(__name__)
+
+WORKER_REPLY_TIMEOUT = 60  # Seconds (includes worker startup on the first command)
+WORKER_STOP_TIMEOUT = 10
+
+
+def worker_index(conn_name, workers):
+    """Worker process owning the connection (stable across agent restarts)"""
+    return zlib.crc32(conn_name.encode()) % workers
+
+
+def _plain(value):
+    # Config values are Box objects - send plain containers between processes
+    return value.to_dict() if hasattr(value, "to_dict") else value
+
+
+class AmqBrokerFactory:
+    """Opens the broker connection of a worker process.
+
+    Workers only publish data - RPC and keep-alive messages are served by the
+    parent agent connection.
+    """
+
+    def __init__(self, amqp_uri, service_domain, service_id, service_type, timeout=5):
+        self._amqp_uri = amqp_uri
+        self._service_domain = service_domain
+        self._service_id = service_id
+        self._service_type = service_type
+        self._timeout = timeout
+
+    async def open(self):
+        broker = AmqBrokerConnector(
+            amqp_uri=self._amqp_uri,
+            service_domain=self._service_domain,
+            service_id=self._service_id,
+            service_type=self._service_type,
+            keep_alive_seconds=0,
+        )
+        await broker.open(timeout=self._timeout)
+        return broker
+
+    @staticmethod
+    async def close(broker):
+        await broker.close()
+
+
+class _DAQWorker:
+    """Worker process side - owns connectors and DAQ scheduler of its shard"""
+
+    def __init__(self, index, pipe, config_file, broker_factory, extra_connectors):
+        self._index = index
+        self._pipe = pipe
+        self._config_file = config_file
+        self._broker_factory = broker_factory
+        self._extra_connectors = extra_connectors
+        self._config = None
+        self._connection_manager = None
+        self._scheduler = None
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+
+        # Worker logs go to its own files (file handlers are not shared by processes)
+        self._config = ConfigManager(
+            config_file=self._config_file,
+            enable_persistence=False,
+            log_suffix=f"worker-{self._index}",
+        )
+        # Connections and jobs of the shard are created on parent's request
+        self._config.set("connections", {}, persist=False)
+        self._config.set(DAQ_CONFIG_KEY, {}, persist=False)
+        self._config.set(
+            f"{SPOOL_SETTINGS_KEY}.directory",
+            os.path.join(
+                self._config.get(f"{SPOOL_SETTINGS_KEY}.directory", "spool"),
+                f"worker-{self._index}",
+            ),
+            persist=False,
+        )
+
+        broker = await self._broker_factory.open()
+        self._connection_manager = ConnectionManager(
+            self._config, extra_connectors=self._extra_connectors
+        )
+        self._scheduler = create_daq_scheduler(
+            broker, self._connection_manager, self._config
+        )
+
+        stopped = loop.create_future()
+        threading.Thread(
+            target=self._serve,
+            args=(loop, stopped),
+            name="daq-worker-commands",
+            daemon=True,
+        ).start()
+        log.info(f"DAQ worker {self._index} started (pid {os.getpid()}).")
+
+        try:
+            await stopped
+        finally:
+            self._scheduler.shutdown()
+            self._connection_manager.close()
+            await self._broker_factory.close(broker)
+            log.info(f"DAQ worker {self._index} terminated.")
+
+    def _serve(self, loop, stopped):
+        # Commands are received in a thread, so the event loop keeps scanning
+        while True:
+            try:
+                seq, method, args, kwargs, job_ids = self._pipe.recv()
+            except EOFError:
+                method = "stop"  # Parent has gone
+
+            if method == "stop":
+                loop.call_soon_threadsafe(
+                    lambda: stopped.done() or stopped.set_result(None)
+                )
+                return
+
+            future = asyncio.run_coroutine_threadsafe(
+                self._execute(method, args, kwargs, job_ids), loop
+            )
+            try:
+                reply = (seq, None, *future.result())
+            except Exception as e:
+                reply = (seq, e, None, {})
+
+            try:
+                self._pipe.send(reply)
+            except Exception as e:
+                # Result (or error) could not be pickled
+                self._pipe.send((seq, DaqWorkerError(str(e)), None, {}))
+
+    async def _execute(self, method, args, kwargs, job_ids):
+        if method == "create_scan_job":
+            self._ensure_connection(kwargs["conn_name"], kwargs.pop("conn_spec"))
+
+        try:
+            result = getattr(self._scheduler, method)(*args, **kwargs)
+        finally:
+            self._drop_idle_connections()
+
+        if method == "create_scan_job":
+            result = None  # The job itself stays in the worker
+
+        return result, {
+            job_id: _plain(self._config.get(f"{DAQ_CONFIG_KEY}.{job_id}"))
+            for job_id in job_ids
+        }
+
+    def _ensure_connection(self, conn_name, conn_spec):
+        if conn_name in self._connection_manager.list_connections(
+            include_details=False
+        ):
+            return
+
+        self._connection_manager.create_connection(
+            conn_name,
+            conn_spec["type"],
+            pool_size=conn_spec.get("pool_size", 1),
+            limits=conn_spec.get("limits"),
+            circuit_breaker=conn_spec.get("circuit_breaker"),
+            **conn_spec["params"],
+        )
+        if conn_spec["enabled"]:
+            try:
+                self._connection_manager.enable_connection(conn_name)
+            except Exception as e:
+                # Scan jobs keep reconnecting
+                log.error(f"Error enabling connection {conn_name} - {e}.")
+
+    def _drop_idle_connections(self):
+        for conn_name in self._connection_manager.list_connections(
+            include_details=False
+        ):
+            if not self._scheduler.list_jobs(conn_name=conn_name):
+                self._connection_manager.delete_connection(conn_name)
+
+
+def _worker_main(index, pipe, config_file, broker_factory, extra_connectors):
+    asyncio.run(
+        _DAQWorker(index, pipe, config_file, broker_factory, extra_connectors).run()
+    )
+
+
+class DAQWorkerPool:
+    """DAQ scheduler sharding connections (with their scan jobs) across worker processes.
+
+    Each worker process runs its own event loop, connectors, DAQ scheduler and broker
+    connection, so reading, serialization and publishing scale with CPU cores. The
+    pool exposes the DAQScheduler API to the parent process (RPC, config) and routes
+    every job to the worker owning its connection. Jobs configuration is persisted by
+    the parent only - workers send back the resulting job config of each change.
+
+    Pool methods wait for the worker replies - call them off the event loop. The
+    parent agent connects the connections scanned by workers only once an API call
+    needs them (see ConnectionManager deferred_connections).
+    """
+
+    def __init__(
+        self,
+        config,
+        broker_factory,
+        processes,
+        extra_connectors=None,
+        timeout=WORKER_REPLY_TIMEOUT,
+    ):
+        self._config = config
+        self._timeout = timeout
+        self._jobs = {}  # job_id -> conn_name
+        self._seq = itertools.count()
+        self._workers = []
+
+        ctx = multiprocessing.get_context("spawn")
+        for index in range(processes):
+            pipe, worker_pipe = ctx.Pipe()
+            process = ctx.Process(
+                target=_worker_main,
+                args=(
+                    index,
+                    worker_pipe,
+                    config.dynamic_config,
+                    broker_factory,
+                    extra_connectors,
+                ),
+                name=f"daq-worker-{index}",
+                daemon=True,
+            )
+            process.start()
+            worker_pipe.close()
+            self._workers.append((process, pipe, threading.Lock()))
+
+        log.info(f"DAQ worker pool of {processes} processes started.")
+
+        # Recreate jobs from config
+        jobs = self._config.get(f"{DAQ_CONFIG_KEY}")
+        for job_id in jobs:
+            log.debug(f'Starting preconfigured job "{job_id}"...')
+
+            try:
+                self._create_scan_job(job_id, persist=False, **_plain(jobs[job_id]))
+            except Exception as e:
+                log.exception(f'Error starting job - "{job_id}" - {e}')
+
+    def _call(self, index, method, *args, job_ids=(), **kwargs):
+        return self._call_workers([index], method, *args, job_ids=job_ids, **kwargs)[0]
+
+    def _call_workers(self, indexes, method, *args, job_ids=(), **kwargs):
+        """Send the command to all the workers first, so that they process it
+        concurrently, then collect their replies
+
+        :return: results list (in indexes order)
+        """
+        with contextlib.ExitStack() as stack:
+            seqs = []
+            for index in indexes:
+                process, pipe, lock = self._workers[index]
+                stack.enter_context(lock)
+                seqs.append(next(self._seq))
+                pipe.send((seqs[-1], method, args, kwargs, list(job_ids)))
+
+            deadline = time.monotonic() + self._timeout
+            replies = [
+                self._reply(index, seq, method, deadline)
+                for index, seq in zip(indexes, seqs)
+            ]
+
+        results = []
+        for error, result, jobs_config in replies:
+            if error is not None:
+                raise error
+
+            for job_id, job_config in jobs_config.items():
+                if job_config is None:
+                    self._config.remove(f"{DAQ_CONFIG_KEY}.{job_id}")
+                else:
+                    self._config.set(f"{DAQ_CONFIG_KEY}.{job_id}", job_config)
+            results.append(result)
+
+        return results
+
+    def _reply(self, index, seq, method, deadline):
+        process, pipe, _ = self._workers[index]
+        while True:
+            if pipe.poll(max(0, min(1, deadline - time.monotonic()))):
+                reply_seq, error, result, jobs_config = pipe.recv()
+                if reply_seq == seq:
+                    return error, result, jobs_config
+                continue  # Late reply of a timed out command
+
+            if not process.is_alive():
+                raise DaqWorkerError(
+                    f"DAQ worker {index} terminated (exit code {process.exitcode})."
+                )
+            if time.monotonic() >= deadline:
+                raise DaqWorkerError(
+                    f"DAQ worker {index} did not respond to '{method}'."
+                )
+
+    def _job_worker(self, job_id):
+        if job_id not in self._jobs:
+            raise JobLookupError(job_id)
+        return worker_index(self._jobs[job_id], len(self._workers))
+
+    def reset(self, persist=False):
+        self.remove_job(self.list_jobs(), persist=persist)
+
+    def shutdown(self, wait=True):
+        for process, pipe, lock in self._workers:
+            with lock:
+                try:
+                    pipe.send((next(self._seq), "stop", (), {}, []))
+                except (BrokenPipeError, OSError):
+                    pass
+
+        for process, pipe, _ in self._workers:
+            if wait:
+                process.join(WORKER_STOP_TIMEOUT)
+            if process.is_alive():
+                process.terminate()
+            pipe.close()
+
+        self._workers = []
+        self._jobs = {}
+        log.info("DAQ worker pool terminated.")
+
+    def job_stats(self, job_id=None):
+        if job_id is not None:
+            return self._call(self._job_worker(job_id), "job_stats", job_id)
+
+        stats = {}
+        for worker_stats in self._call_workers(range(len(self._workers)), "job_stats"):
+            stats.update(worker_stats)
+        return {j: stats[j] for j in sorted(stats)}
+
+    def list_jobs(self, conn_name=None):
+        jobs = [j for j, c in self._jobs.items() if not conn_name or c == conn_name]
+        jobs.sort()
+        return jobs
+
+    def create_scan_job(
+        self,
+        job_id,
+        conn_name,
+        tags,
+        seconds=1,
+        update_on_conflict=False,
+        from_cache=True,
+        **options,
+    ):
+        """Create (or modify) a periodic scan job in the worker owning the connection
+
+        See DAQScheduler.create_scan_job for the options.
+        """
+        self._create_scan_job(
+            job_id,
+            conn_name,
+            tags,
+            seconds=seconds,
+            update_on_conflict=update_on_conflict,
+            from_cache=from_cache,
+            **options,
+        )
+
+    def _create_scan_job(
+        self,
+        job_id,
+        conn_name,
+        tags,
+        seconds=1,
+        update_on_conflict=False,
+        from_cache=True,
+        persist=True,
+        **options,
+    ):
+        if job_id in self._jobs and not update_on_conflict:
+            raise DaqJobAlreadyExists(f"DAQ Job {job_id} already exists.")
+
+        conn_spec = self._config.get(f"connections.{conn_name}")
+        if conn_spec is None:
+            raise UnrecognizedConnection(f'Connection "{conn_name}" does not exists.')
+
+        index = worker_index(conn_name, len(self._workers))
+
+        # Job moved to a connection of another worker
+        if job_id in self._jobs and self._job_worker(job_id) != index:
+            self._call(self._job_worker(job_id), "remove_job", job_id)
+            del self._jobs[job_id]
+
+        self._call(
+            index,
+            "create_scan_job",
+            job_ids=[job_id] if persist else [],
+            job_id=job_id,
+            conn_name=conn_name,
+            tags=list(tags),
+            seconds=seconds,
+            update_on_conflict=update_on_conflict,
+            from_cache=from_cache,
+            conn_spec=_plain(conn_spec),
+            **options,
+        )
+        self._jobs[job_id] = conn_name
+
+    def remove_job(self, job_id, persist=True):
+        if not isinstance(job_id, list):
+            job_id = [job_id]
+
+        for j in job_id:
+            self._call(
+                self._job_worker(j), "remove_job", j, job_ids=[j] if persist else []
+            )
+            del self._jobs[j]
+
+    def list_tags(self, job_id):
+        return self._call(self._job_worker(job_id), "list_tags", job_id)
+
+    def update_tags(self, job_id, add=None, remove=None):
+        return self._call(
+            self._job_worker(job_id),
+            "update_tags",
+            job_id,
+            job_ids=[job_id],
+            add=add,
+            remove=remove,
+        )
+
+    def add_tags(self, job_id, tags):
+        self.update_tags(job_id, add=tags)
+
+    def remove_tags(self, job_id, tags):
+        self.update_tags(job_id, remove=tags)
@@ -14,6 +14,10 @@ class ConnectionNotActive(Exception):
     pass
 
 
+class ConnectionCircuitOpen(Exception):
+    pass
+
+
 class TargetConnectionError(Exception):
     pass
 
@@ -80,3 +84,11 @@ class DaqJobAlreadyExists(Exception):
 
 class HistoryHarvesterJobAlreadyExists(Exception):
     pass
+
+
+class DaqWorkerError(Exception):
+    pass
+
+
+class StreamingNotAvailable(Exception):
+    pass
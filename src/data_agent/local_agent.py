@@ -57,6 +57,7 @@ class LocalAgent:
             connection_manager=self._connection_manager,
             data_exchanger=self._exchanger,
             safe_manipulator=self._safe_manipulator,
+            config=self._config,
         )
 
         log.info("")
@@ -64,7 +65,7 @@ class LocalAgent:
             "************ Data Agent Service Initialized *************************"
         )
         log.info(
-            f" Supported connectors: {list(self._connection_manager.list_supported_connectors().keys())}"
+            f" Supported connectors: {self._connection_manager.list_connector_types()}"
         )
         log.info(
             "***********************************************************************"
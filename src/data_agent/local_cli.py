@@ -90,6 +90,7 @@ def exec_command(config, cmd, kwargs):
         connection_manager=connection_manager,
         data_exchanger=exchanger,
         safe_manipulator=safe_manipulator,
+        config=config,
     )
 
     api_func = getattr(api, cmd)
@@ -0,0 +1,151 @@
+import bisect
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+PERCENTILES = [50, 90, 99]
+
+# Upper bounds (seconds) of API latency histogram buckets - the last bucket is unbounded
+LATENCY_BUCKETS = [0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10]
+
+
+def result_size(result):
+    """Size of a call result: rows of a frame, items of a collection (1 otherwise)"""
+    if result is None:
+        return 0
+    if isinstance(result, (pd.DataFrame, pd.Series, dict, list, tuple)):
+        return len(result)
+    return 1
+
+
+class RollingStats:
+    """Latest samples window (e.g. latencies) summarized with percentiles"""
+
+    def __init__(self, size=1000):
+        self._samples = deque(maxlen=size)
+        self._count = 0
+
+    def add(self, value):
+        self._samples.append(value)
+        self._count += 1
+
+    @property
+    def last(self):
+        return self._samples[-1] if self._samples else None
+
+    def summary(self):
+        if not self._samples:
+            return {"count": self._count}
+
+        samples = np.fromiter(self._samples, dtype=np.float64, count=len(self._samples))
+        summary = {
+            "count": self._count,
+            "last": self._samples[-1],
+            "mean": float(samples.mean()),
+            "max": float(samples.max()),
+        }
+        summary.update(
+            {
+                f"p{p}": float(v)
+                for p, v in zip(PERCENTILES, np.percentile(samples, PERCENTILES))
+            }
+        )
+        return summary
+
+
+class Histogram:
+    """Counts of samples falling into fixed buckets (all samples since start)"""
+
+    def __init__(self, bounds):
+        self._bounds = list(bounds)
+        self._counts = [0] * (len(self._bounds) + 1)
+
+    def add(self, value):
+        self._counts[bisect.bisect_left(self._bounds, value)] += 1
+
+    def as_dict(self):
+        return {"bounds": self._bounds + [None], "counts": list(self._counts)}
+
+
+class ApiCallMetrics:
+    """Metrics of a single API method"""
+
+    def __init__(self, window_size=1000):
+        self.latency = RollingStats(window_size)
+        self.latency_histogram = Histogram(LATENCY_BUCKETS)
+        self.result_size = RollingStats(window_size)
+        self.calls = 0
+        self.errors = 0
+        self.slow_calls = 0
+        self.last_error = None
+        self.last_error_time = None
+
+    def record_error(self, error):
+        self.errors += 1
+        self.last_error = str(error)
+        self.last_error_time = time.time()
+
+    def as_dict(self):
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "slow_calls": self.slow_calls,
+            "last_error": self.last_error,
+            "last_error_time": self.last_error_time,
+            "latency": self.latency.summary(),
+            "latency_histogram": self.latency_histogram.as_dict(),
+            "result_size": self.result_size.summary(),
+        }
+
+
+class ScanJobMetrics:
+    """Rolling metrics of a single DAQ scan job"""
+
+    def __init__(self, window_size=1000):
+        self.read_time = RollingStats(window_size)
+        self.serialize_time = RollingStats(window_size)
+        self.publish_time = RollingStats(window_size)
+        self.payload_bytes = RollingStats(window_size)
+        self.jitter = RollingStats(
+            window_size
+        )  # Scan start lateness (ms, high-rate jobs)
+        self.runs = 0
+        self.published = 0
+        self.skipped = 0
+        self.coalesced = 0
+        self.overruns = 0
+        self.timeouts = 0
+        self.disconnected = 0
+        self.spooled = 0
+        self.errors = 0
+        self.rate_factor = 1  # Current interval stretch of adaptive rate jobs
+        self.last_error = None
+        self.last_error_time = None
+
+    def record_error(self, error):
+        self.errors += 1
+        self.last_error = str(error)
+        self.last_error_time = time.time()
+
+    def as_dict(self):
+        return {
+            "runs": self.runs,
+            "published": self.published,
+            "skipped": self.skipped,
+            "coalesced": self.coalesced,
+            "overruns": self.overruns,
+            "timeouts": self.timeouts,
+            "disconnected": self.disconnected,
+            "spooled": self.spooled,
+            "errors": self.errors,
+            "rate_factor": self.rate_factor,
+            "last_error": self.last_error,
+            "last_error_time": self.last_error_time,
+            "read_time": self.read_time.summary(),
+            "serialize_time": self.serialize_time.summary(),
+            "publish_time": self.publish_time.summary(),
+            "payload_bytes": self.payload_bytes.summary(),
+            "jitter_ms": self.jitter.summary(),
+        }
@@ -109,3 +109,197 @@ def decode_payload(blob):
     df = df[meta["orig_cols"]]
 
     return df
+
+
+# ---------------- DAQ scan payloads ----------------
+
+SCAN_CODEC_JSON = "json"
+SCAN_CODEC_MSGPACK = "msgpack+zstd"
+
+
+def _msgpack_default(obj):
+    # numpy scalars, datetimes and other non-native values
+    if hasattr(obj, "item"):
+        return obj.item()
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    return str(obj)
+
+
+def encode_frame(frame, zstd_level=3):
+    raw = msgpack.packb(frame, use_bin_type=True, default=_msgpack_default)
+    return zstd.ZstdCompressor(level=zstd_level).compress(raw)
+
+
+def decode_frame(blob):
+    raw = zstd.ZstdDecompressor().decompress(blob)
+    return msgpack.unpackb(raw, raw=False)
+
+
+def scan_values_frame(tag_values, sample_id, keyframe=None):
+    """Build (not yet encoded) columnar frame of scan results ({tag: {Value, Quality, Timestamp}})
+
+    keyframe is included only for report-by-exception jobs (None otherwise).
+    """
+    tags = list(tag_values)
+    frame = {
+        "codec": SCAN_CODEC_MSGPACK,
+        "sample_id": sample_id,
+        "tags": tags,
+        "values": [tag_values[t]["Value"] for t in tags],
+        "qualities": [tag_values[t]["Quality"] for t in tags],
+        "timestamps": [tag_values[t]["Timestamp"] for t in tags],
+    }
+    if keyframe is not None:
+        frame["keyframe"] = keyframe
+
+    return frame
+
+
+def encode_scan_values(tag_values, sample_id, keyframe=None, zstd_level=3):
+    """Encode scan results as columnar arrays"""
+    return encode_frame(
+        scan_values_frame(tag_values, sample_id, keyframe=keyframe),
+        zstd_level=zstd_level,
+    )
+
+
+def decode_scan_values(blob):
+    """Decode columnar scan payload into the same structure as JSON scan payload"""
+    return _scan_values_payload(decode_frame(blob))
+
+
+def _scan_values_payload(frame):
+    payload = {
+        "sample_id": frame["sample_id"],
+        "data": {
+            tag: {"Value": value, "Quality": quality, "Timestamp": timestamp}
+            for tag, value, quality, timestamp in zip(
+                frame["tags"], frame["values"], frame["qualities"], frame["timestamps"]
+            )
+        },
+    }
+    if "keyframe" in frame:
+        payload["keyframe"] = frame["keyframe"]
+
+    return payload
+
+
+def encode_schema_frame(job_id, schema_version, tags, zstd_level=3):
+    """Encode ordered tag list referenced by subsequent indexed value frames"""
+    return encode_frame(
+        {
+            "codec": SCAN_CODEC_MSGPACK,
+            "frame_type": "schema",
+            "job_id": job_id,
+            "schema_version": schema_version,
+            "tags": list(tags),
+        },
+        zstd_level=zstd_level,
+    )
+
+
+def indexed_values_frame(
+    tag_values, tags, schema_version, sample_id, positions=None, keyframe=None
+):
+    """Build (not yet encoded) frame of scan results as positional arrays following schema tags order
+
+    Tags missing in the scan results are encoded as None values and qualities.
+    If positions (schema indices) are provided - only those tags are encoded.
+    """
+    missing = {"Value": None, "Quality": None, "Timestamp": None}
+    if positions is None:
+        samples = [tag_values.get(t, missing) for t in tags]
+    else:
+        samples = [tag_values.get(tags[i], missing) for i in positions]
+
+    frame = {
+        "codec": SCAN_CODEC_MSGPACK,
+        "frame_type": "values",
+        "schema_version": schema_version,
+        "sample_id": sample_id,
+        "values": [s["Value"] for s in samples],
+        "qualities": [s["Quality"] for s in samples],
+        "timestamps": [s["Timestamp"] for s in samples],
+    }
+    if positions is not None:
+        frame["positions"] = list(positions)
+    if keyframe is not None:
+        frame["keyframe"] = keyframe
+
+    return frame
+
+
+def encode_indexed_values(
+    tag_values,
+    tags,
+    schema_version,
+    sample_id,
+    positions=None,
+    keyframe=None,
+    zstd_level=3,
+):
+    """Encode scan results as positional arrays following schema tags order"""
+    return encode_frame(
+        indexed_values_frame(
+            tag_values,
+            tags,
+            schema_version,
+            sample_id,
+            positions=positions,
+            keyframe=keyframe,
+        ),
+        zstd_level=zstd_level,
+    )
+
+
+def decode_indexed_values(blob, schema):
+    """Decode indexed value frame using previously received (decoded) schema frame"""
+    return _indexed_values_payload(decode_frame(blob), schema)
+
+
+def _indexed_values_payload(frame, schema):
+    if frame["schema_version"] != schema["schema_version"]:
+        raise ValueError(
+            f"Frame schema version {frame['schema_version']} does not match "
+            f"schema version {schema['schema_version']}"
+        )
+
+    tags = schema["tags"]
+    if "positions" in frame:
+        tags = [tags[i] for i in frame["positions"]]
+
+    payload = {
+        "sample_id": frame["sample_id"],
+        "data": {
+            tag: {"Value": value, "Quality": quality, "Timestamp": timestamp}
+            for tag, value, quality, timestamp in zip(
+                tags, frame["values"], frame["qualities"], frame["timestamps"]
+            )
+            if quality is not None
+        },
+    }
+    if "keyframe" in frame:
+        payload["keyframe"] = frame["keyframe"]
+
+    return payload
+
+
+def encode_batch_frame(frames, zstd_level=3):
+    """Encode several scan frames (columnar or indexed) as a single frame with samples axis"""
+    return encode_frame(
+        {"codec": SCAN_CODEC_MSGPACK, "frame_type": "batch", "samples": list(frames)},
+        zstd_level=zstd_level,
+    )
+
+
+def decode_batch_frame(blob, schema=None):
+    """Decode batch frame into a list of scan payloads (schema is required for indexed frames)"""
+    return [
+        (
+            _indexed_values_payload(frame, schema)
+            if "schema_version" in frame
+            else _scan_values_payload(frame)
+        )
+        for frame in decode_frame(blob)["samples"]
+    ]
@@ -0,0 +1,182 @@
+import asyncio
+import collections
+import functools
+import logging
+import time
+import uuid
+
+import pandas as pd
+
+from data_agent.msg_packer import SCAN_CODEC_MSGPACK, encode_dataframe, encode_frame
+
+log = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SECONDS = 24 * 3600
+DEFAULT_CHUNK_TAGS = 100
+DEFAULT_CHUNK_ROWS = 10000
+MAX_PENDING_CHUNKS = 4  # Published chunks not yet sent before reading on
+
+
+class PeriodStreamer:
+    """Streams tag values period to the data exchange as ordered chunks.
+
+    The period is read window by window ('chunk_seconds') and tags group by tags
+    group ('chunk_tags'). Each read is split into 'chunk_rows' rows frames published
+    as msg_packer encoded dataframes, followed by a final summary frame. Only a
+    single read (and up to MAX_PENDING_CHUNKS encoded chunks waiting for the broker)
+    is held in memory at a time, regardless of the period length.
+
+    Adjacent windows share their boundary timestamp - its rows are streamed with
+    the earlier window only.
+
+    Chunks are published with headers: data_category='historical', stream_id,
+    frame_type ('chunk' or 'summary') and chunk_num (ordering within the stream).
+    """
+
+    def __init__(self, connection_manager, broker, executor=None):
+        """
+        :param connection_manager:
+        :param broker:
+        :param executor: Executor of the window reads (e.g. bounded executor of heavy
+            API calls, loop default executor if None)
+        """
+        self._connection_manager = connection_manager
+        self._broker = broker
+        self._executor = executor
+
+    async def stream(
+        self,
+        conn_name,
+        tags,
+        first_timestamp,
+        last_timestamp,
+        time_frequency=None,
+        stream_id=None,
+        chunk_seconds=DEFAULT_CHUNK_SECONDS,
+        chunk_tags=DEFAULT_CHUNK_TAGS,
+        chunk_rows=DEFAULT_CHUNK_ROWS,
+    ):
+        """Stream period values
+
+        :return: summary (also published as the last frame of the stream)
+        """
+        if chunk_seconds <= 0 or chunk_tags < 1 or chunk_rows < 1:
+            raise ValueError("Chunk sizes must be positive")
+
+        conn = self._connection_manager.connection(conn_name)
+        stream_id = stream_id or uuid.uuid4().hex
+        first_timestamp = pd.Timestamp(first_timestamp).to_pydatetime()
+        last_timestamp = pd.Timestamp(last_timestamp).to_pydatetime()
+        window = pd.Timedelta(seconds=chunk_seconds).to_pytimedelta()
+        tag_groups = [tags[i : i + chunk_tags] for i in range(0, len(tags), chunk_tags)]
+
+        loop = asyncio.get_running_loop()
+        summary = {
+            "stream_id": stream_id,
+            "connection": conn_name,
+            "first_timestamp": first_timestamp.isoformat(),
+            "last_timestamp": last_timestamp.isoformat(),
+            "status": "completed",
+            "chunks": 0,
+            "rows": 0,
+            "error": None,
+        }
+        start_time = time.time()
+        pending = collections.deque()  # Publishing tasks of the chunks
+
+        try:
+            window_start = first_timestamp
+            while window_start < last_timestamp:
+                window_end = min(last_timestamp, window_start + window)
+
+                for group in tag_groups:
+                    df = await loop.run_in_executor(
+                        self._executor,
+                        functools.partial(
+                            conn.read_tag_values_period,
+                            tags=group,
+                            first_timestamp=window_start,
+                            last_timestamp=window_end,
+                            time_frequency=time_frequency,
+                        ),
+                    )
+
+                    if window_start > first_timestamp:
+                        df = self._drop_boundary(df, window_start)
+
+                    for i in range(0, len(df), chunk_rows):
+                        pending.extend(
+                            self._publish_chunk(
+                                stream_id,
+                                conn_name,
+                                summary,
+                                df.iloc[i : i + chunk_rows],
+                            )
+                        )
+                        # Wait for the broker before encoding more chunks
+                        while len(pending) > MAX_PENDING_CHUNKS:
+                            await pending.popleft()
+                        await asyncio.sleep(0)
+                    del df
+
+                window_start = window_end
+
+        except asyncio.CancelledError:
+            summary["status"] = "cancelled"
+            raise
+
+        except Exception as e:
+            summary["status"] = "failed"
+            summary["error"] = str(e)
+            raise
+
+        finally:
+            summary["read_time"] = time.time() - start_time
+            self._broker.publish_data(
+                encode_frame(
+                    {"codec": SCAN_CODEC_MSGPACK, "frame_type": "summary", **summary}
+                ),
+                headers=self._headers(stream_id, conn_name, "summary", summary),
+            )
+            log.debug(
+                f"Stream '{stream_id}' of '{conn_name}' {summary['status']}: "
+                f"{summary['chunks']} chunks, {summary['rows']} rows."
+            )
+
+        return summary
+
+    def _publish_chunk(self, stream_id, conn_name, summary, df):
+        """
+        :return: tasks publishing the chunk (broker connection publishes in background)
+        """
+        tasks = asyncio.all_tasks()
+        self._broker.publish_data(
+            encode_dataframe(df),
+            headers=self._headers(stream_id, conn_name, "chunk", summary),
+        )
+        summary["chunks"] += 1
+        summary["rows"] += len(df)
+        return asyncio.all_tasks() - tasks
+
+    @staticmethod
+    def _drop_boundary(df, boundary):
+        # Rows of the window start were streamed with the previous window
+        if not isinstance(df.index, pd.DatetimeIndex):
+            return df
+
+        boundary = pd.Timestamp(boundary)
+        if df.index.tz is not None and boundary.tz is None:
+            boundary = boundary.tz_localize(df.index.tz)
+        elif df.index.tz is None and boundary.tz is not None:
+            boundary = boundary.tz_convert(None)
+        return df[df.index != boundary]
+
+    @staticmethod
+    def _headers(stream_id, conn_name, frame_type, summary):
+        return {
+            "data_category": "historical",
+            "connection": conn_name,
+            "stream_id": stream_id,
+            "frame_type": frame_type,
+            "chunk_num": summary["chunks"],
+        }
@@ -0,0 +1,190 @@
+import json
+import logging
+import mmap
+import os
+import struct
+from collections import deque
+
+log = logging.getLogger(__name__)
+
+SEGMENT_SUFFIX = ".seg"
+
+# Segment starts with the read offset, followed by records
+_SEGMENT_HEADER = struct.Struct("<Q")
+# Record: body length (0 - no more records), headers length, headers (json), data
+_RECORD_HEADER = struct.Struct("<II")
+
+
+class _Segment:
+    """Fixed size, memory-mapped segment file of spooled records"""
+
+    def __init__(self, path, size=None):
+        if size is not None:
+            with open(path, "wb") as f:
+                f.truncate(size)
+
+        self.path = path
+        self._file = open(path, "r+b")
+        self._mm = mmap.mmap(self._file.fileno(), 0)
+        self.size = len(self._mm)
+
+        self.read_offset = (
+            _SEGMENT_HEADER.unpack_from(self._mm, 0)[0] or _SEGMENT_HEADER.size
+        )
+
+        # Recover write position - records are committed by writing their length last
+        self.count = 0
+        offset = _SEGMENT_HEADER.size
+        while offset + _RECORD_HEADER.size <= self.size:
+            length, _ = _RECORD_HEADER.unpack_from(self._mm, offset)
+            if length == 0:
+                break
+            if offset >= self.read_offset:
+                self.count += 1
+            offset += _RECORD_HEADER.size + length
+        self.write_offset = offset
+
+    @property
+    def exhausted(self):
+        return self.read_offset >= self.write_offset
+
+    def append(self, headers_blob, data):
+        length = len(headers_blob) + len(data)
+        end = self.write_offset + _RECORD_HEADER.size + length
+        if end > self.size:
+            return False
+
+        body = self.write_offset + _RECORD_HEADER.size
+        self._mm[body : body + len(headers_blob)] = headers_blob
+        self._mm[body + len(headers_blob) : end] = data
+        _RECORD_HEADER.pack_into(self._mm, self.write_offset, length, len(headers_blob))
+
+        self.write_offset = end
+        self.count += 1
+        return True
+
+    def peek(self):
+        length, headers_length = _RECORD_HEADER.unpack_from(self._mm, self.read_offset)
+        body = self.read_offset + _RECORD_HEADER.size
+        headers = json.loads(self._mm[body : body + headers_length])
+        return self._mm[body + headers_length : body + length], headers
+
+    def pop(self):
+        length, _ = _RECORD_HEADER.unpack_from(self._mm, self.read_offset)
+        self.read_offset += _RECORD_HEADER.size + length
+        _SEGMENT_HEADER.pack_into(self._mm, 0, self.read_offset)
+        self.count -= 1
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+
+class Spool:
+    """Disk-backed FIFO of messages (data with headers) awaiting publishing.
+
+    Messages are appended to memory-mapped segment files of fixed size. Once the
+    total size of the segments reaches max_size, the oldest segment is evicted
+    (with its unpublished messages). Segments survive restarts - both read and
+    write positions are recovered from the segment files.
+    """
+
+    def __init__(self, path, max_size=512 * 2**20, segment_size=16 * 2**20):
+        if max_size < segment_size:
+            raise ValueError("Spool max size must be at least one segment size")
+
+        self._path = path
+        self._max_size = max_size
+        self._segment_size = segment_size
+        self._segments = deque()
+        self.dropped = 0
+
+        os.makedirs(path, exist_ok=True)
+        for file_name in sorted(os.listdir(path)):
+            if file_name.endswith(SEGMENT_SUFFIX):
+                self._segments.append(
+                    (
+                        int(file_name[: -len(SEGMENT_SUFFIX)]),
+                        _Segment(os.path.join(path, file_name)),
+                    )
+                )
+        self._drop_exhausted()
+
+        if self._segments:
+            log.info(f"Spool '{path}' opened with {len(self)} pending messages.")
+
+    def __len__(self):
+        return sum(segment.count for _, segment in self._segments)
+
+    @property
+    def size(self):
+        return sum(segment.size for _, segment in self._segments)
+
+    def append(self, data, headers):
+        """Append message to the spool
+
+        :return: False if the message can't fit into a segment (dropped)
+        """
+        headers_blob = json.dumps(headers).encode()
+        record_size = _RECORD_HEADER.size + len(headers_blob) + len(data)
+        if record_size > self._segment_size - _SEGMENT_HEADER.size:
+            self.dropped += 1
+            log.error(
+                f"Message of {len(data)} bytes exceeds spool segment size - dropped."
+            )
+            return False
+
+        if not self._segments or not self._segments[-1][1].append(headers_blob, data):
+            self._new_segment().append(headers_blob, data)
+        return True
+
+    def peek(self):
+        """Return the oldest message (data, headers) or None if spool is empty"""
+        self._drop_exhausted()
+        if not self._segments or self._segments[0][1].exhausted:
+            return None
+        return self._segments[0][1].peek()
+
+    def pop(self):
+        """Remove the oldest message (once published)"""
+        self._drop_exhausted()
+        if self._segments and not self._segments[0][1].exhausted:
+            self._segments[0][1].pop()
+
+    def close(self):
+        for _, segment in self._segments:
+            segment.close()
+        self._segments.clear()
+
+    def _new_segment(self):
+        self._drop_exhausted(keep_last=False)
+
+        # Oldest-first eviction
+        while self._segments and self.size + self._segment_size > self._max_size:
+            _, segment = self._segments.popleft()
+            self.dropped += segment.count
+            log.warning(
+                f"Spool size limit reached - {segment.count} oldest messages dropped."
+            )
+            self._remove_segment(segment)
+
+        seq = self._segments[-1][0] + 1 if self._segments else 0
+        segment = _Segment(
+            os.path.join(self._path, f"{seq:012d}{SEGMENT_SUFFIX}"),
+            size=self._segment_size,
+        )
+        self._segments.append((seq, segment))
+        return segment
+
+    def _drop_exhausted(self, keep_last=True):
+        while (
+            len(self._segments) > (1 if keep_last else 0)
+            and self._segments[0][1].exhausted
+        ):
+            _, segment = self._segments.popleft()
+            self._remove_segment(segment)
+
+    @staticmethod
+    def _remove_segment(segment):
+        segment.close()
+        os.remove(segment.path)
@@ -0,0 +1,58 @@
+class TagSet:
+    """Ordered set of job tags.
+
+    Keeps tags in insertion order (positions are referenced by indexed payloads and
+    deadband filters) along with tag -> position index, so membership checks and
+    bulk changes of large jobs do not scan the whole list for every tag.
+    """
+
+    def __init__(self, tags=()):
+        self._tags = list(dict.fromkeys(tags))
+        self._index = {tag: i for i, tag in enumerate(self._tags)}
+
+    def __len__(self):
+        return len(self._tags)
+
+    def __iter__(self):
+        return iter(self._tags)
+
+    def __contains__(self, tag):
+        return tag in self._index
+
+    def __getitem__(self, position):
+        return self._tags[position]
+
+    def __eq__(self, other):
+        if isinstance(other, TagSet):
+            return self._tags == other._tags
+        if isinstance(other, (list, tuple)):
+            return self._tags == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"TagSet({self._tags})"
+
+    def index(self, tag):
+        return self._index[tag]
+
+    def update(self, add=(), remove=()):
+        """Remove and then add tags in a single step
+
+        :param add: tags to append (existing tags are ignored)
+        :param remove: tags to remove (missing tags are ignored)
+        :return: (added, removed) lists of tags actually changed
+        """
+        remove = set(remove)
+        removed = [tag for tag in self._tags if tag in remove]
+        if removed:
+            self._tags = [tag for tag in self._tags if tag not in remove]
+            self._index = {tag: i for i, tag in enumerate(self._tags)}
+
+        added = []
+        for tag in add:
+            if tag not in self._index:
+                self._index[tag] = len(self._tags)
+                self._tags.append(tag)
+                added.append(tag)
+
+        return added, removed
@@ -12,7 +12,10 @@ from data_agent.win32.win_service import SMWinservice
 class DataAgentService(SMWinservice):
     _svc_name_ = "data_agent"
     _svc_display_name_ = "Data Agent"
-    _svc_description_ = f"Data Agent with {ConnectionManager.list_supported_connectors()} connectors supported."
+    _svc_description_ = (
+        f"Data Agent with {[entry.name for entry in ConnectionManager.list_plugins()]} "
+        f"connectors supported."
+    )
     _loop = None
 
     def start(self):
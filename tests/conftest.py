@@ -27,6 +27,21 @@ RPC_EXCHANGE_NAME = os.environ.get(
 DATA_EXCHANGE_NAME = os.environ.get("DATA_EXCHANGE_NAME", f"{SERVICE_DOMAIN}.data")
 
 
+class DataSink:
+    """Collects data published by DAQ jobs (for tests not requiring a broker)"""
+
+    def __init__(self):
+        self.messages = []
+
+    def publish_data(self, data, headers):
+        self.messages.append((data, headers))
+
+
+@pytest.fixture
+def data_sink():
+    yield DataSink()
+
+
 @pytest.fixture
 def temp_config_file(tmp_path):
     """Creates a temporary config file location"""
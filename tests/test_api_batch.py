@@ -0,0 +1,74 @@
+import threading
+import time
+
+import pytest
+
+from data_agent.api import ServiceApi
+from data_agent.connection_manager import ConnectionManager
+from data_agent.connectors.fake_connector import FakeConnector
+from data_agent.exchanger import DataExchanger
+from data_agent.safe_manipulator import SafeManipulator
+
+
+class SlowReadConnector(FakeConnector):
+    TYPE = "slow_read"
+    threads = set()
+
+    def read_tag_values(self, tags: list):
+        SlowReadConnector.threads.add(threading.get_ident())
+        time.sleep(0.3)
+        return super().read_tag_values(tags)
+
+
+def test_execute_batch(config_manager):
+    connection_manager = ConnectionManager(
+        config_manager, extra_connectors={"slow_read": SlowReadConnector}
+    )
+    api = ServiceApi(
+        None,
+        connection_manager,
+        DataExchanger(connection_manager),
+        SafeManipulator(connection_manager, config=config_manager),
+    )
+
+    read = {
+        "method": "read_tag_values",
+        "kwargs": {"conn_name": "conn", "tags": ["Static.Int4"]},
+    }
+    start = time.monotonic()
+    results = api.execute_batch(
+        [
+            {
+                "method": "create_connection",
+                "kwargs": {"conn_name": "conn", "conn_type": "slow_read"},
+            },
+            read,  # Connection not enabled yet
+            {"method": "enable_connection", "kwargs": {"conn_name": "conn"}},
+            read,
+            read,
+            read,
+            {"method": "is_connected", "kwargs": {"conn_name": "conn"}},
+        ]
+    )
+    elapsed = time.monotonic() - start
+
+    assert results[0]["result"]["name"] == "conn"
+    assert results[1]["error_type"] == "ConnectionNotActive"
+    assert "result" in results[2]
+    assert [r["result"]["Static.Int4"]["Value"] for r in results[3:6]] == [12345] * 3
+    assert results[6] == {"result": True}
+
+    # Reads after enabling the connection ran concurrently
+    assert elapsed < 0.3 * 3
+    assert len(SlowReadConnector.threads) == 3
+
+    # Sequential execution
+    SlowReadConnector.threads.clear()
+    results = api.execute_batch([read, read], parallel=False)
+    assert len(results) == 2 and len(SlowReadConnector.threads) == 1
+
+    with pytest.raises(ValueError):
+        api.execute_batch([{"method": "_connection_manager"}])
+    with pytest.raises(ValueError):
+        api.execute_batch([{"method": "execute_batch", "kwargs": {"calls": []}}])
+    connection_manager.close()
@@ -0,0 +1,156 @@
+import asyncio
+import inspect
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import MethodType
+
+import pytest
+
+from data_agent.api import ServiceApi
+from data_agent.api_dispatcher import AsyncApiDispatcher
+from data_agent.connection_manager import ConnectionManager
+from data_agent.connectors.fake_connector import FakeConnector
+from data_agent.exceptions import UnrecognizedConnection
+from data_agent.exchanger import DataExchanger
+from data_agent.safe_manipulator import SafeManipulator
+
+
+class HistorianConnector(FakeConnector):
+    TYPE = "historian"
+
+    threads = []
+
+    def read_tag_values_period(self, tags: list, *args, **kwargs):
+        HistorianConnector.threads.append(threading.current_thread().name)
+        time.sleep(0.3)
+        return super().read_tag_values_period(tags, *args, **kwargs)
+
+    def read_tag_values(self, tags: list):
+        HistorianConnector.threads.append(threading.current_thread().name)
+        return super().read_tag_values(tags)
+
+
+@pytest.mark.asyncio
+async def test_heavy_calls_off_loop(config_manager):
+    connection_manager = ConnectionManager(
+        config_manager, extra_connectors={"historian": HistorianConnector}
+    )
+    api = ServiceApi(
+        None,
+        connection_manager,
+        DataExchanger(connection_manager),
+        SafeManipulator(connection_manager, config=config_manager),
+    )
+    executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="api-heavy")
+    target_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="api-target")
+    dispatcher = AsyncApiDispatcher(api, executor, target_executor)
+
+    # Same RPC surface as the API
+    assert isinstance(dispatcher.list_connections, MethodType)
+    assert inspect.iscoroutinefunction(dispatcher.read_tag_values_period)
+    assert not hasattr(dispatcher, "_connection_manager")
+    assert not hasattr(dispatcher, "close")
+
+    await dispatcher.create_connection("conn", "historian", enabled=True)
+
+    async def read_period():
+        return await dispatcher.read_tag_values_period(
+            "conn", ["Random.Real8"], first_timestamp="2021-01-01", max_results=10
+        )
+
+    # Introspection stays responsive while heavy calls run (2 at a time)
+    start = time.monotonic()
+    reads = [asyncio.create_task(read_period()) for _ in range(3)]
+    await asyncio.sleep(0.05)
+    connections = await dispatcher.list_connections()
+    assert time.monotonic() - start < 0.2
+    assert connections[0]["name"] == "conn"
+
+    results = await asyncio.gather(*reads)
+    assert 0.6 <= time.monotonic() - start < 0.9
+    assert all(len(df) == 10 for df in results)
+
+    # Heavy call errors reach the caller
+    with pytest.raises(UnrecognizedConnection):
+        await dispatcher.read_tag_values_period("unknown", ["Random.Real8"])
+
+    # Batch calls are dispatched one by one - heavy ones off the loop
+    HistorianConnector.threads.clear()
+    results = await dispatcher.execute_batch(
+        [
+            {
+                "method": "create_connection",
+                "kwargs": {"conn_name": "conn2", "conn_type": "historian"},
+            },
+            {"method": "enable_connection", "kwargs": {"conn_name": "conn2"}},
+            {
+                "method": "read_tag_values_period",
+                "kwargs": {
+                    "conn_name": "conn2",
+                    "tags": ["Random.Real8"],
+                    "first_timestamp": "2021-01-01",
+                    "max_results": 5,
+                },
+            },
+            {"method": "is_connected", "kwargs": {"conn_name": "conn2"}},
+        ]
+    )
+    assert results[1] == {"result": None}
+    assert len(results[2]["result"]) == 5
+    assert results[3] == {"result": True}
+    assert HistorianConnector.threads[0].startswith("api-heavy")
+
+    # Batch and its calls are recorded in the API metrics as RPC calls
+    stats = api.get_api_stats()
+    assert stats["execute_batch"]["calls"] == 1
+    assert stats["enable_connection"]["calls"] == 1
+    assert stats["is_connected"]["calls"] == 1
+
+    # Calls reaching targets may wait on connection limits - off the loop too
+    HistorianConnector.threads.clear()
+    values = await dispatcher.read_tag_values("conn2", ["Static.Int4"])
+    assert values["Static.Int4"]["Value"] == 12345
+    assert HistorianConnector.threads[0].startswith("api-target")
+
+    executor.shutdown()
+    target_executor.shutdown()
+    connection_manager.close()
+
+
+class PoolScheduler:
+    """Scheduler waiting on worker replies (as DAQWorkerPool)"""
+
+    def __init__(self):
+        self.threads = []
+
+    def list_jobs(self, conn_name=None):
+        self.threads.append(threading.current_thread().name)
+        return []
+
+
+@pytest.mark.asyncio
+async def test_job_calls_off_loop(config_manager, connection_manager):
+    scheduler = PoolScheduler()
+    api = ServiceApi(
+        scheduler,
+        connection_manager,
+        DataExchanger(connection_manager),
+        SafeManipulator(connection_manager, config=config_manager),
+    )
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="api-heavy")
+    target_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="api-target")
+
+    # In-process scheduler - job calls run on the loop
+    dispatcher = AsyncApiDispatcher(api, executor, target_executor)
+    assert await dispatcher.list_jobs() == []
+    assert scheduler.threads[-1] == threading.current_thread().name
+
+    dispatcher = AsyncApiDispatcher(
+        api, executor, target_executor, job_executor=target_executor
+    )
+    assert await dispatcher.list_jobs() == []
+    assert scheduler.threads[-1].startswith("api-target")
+
+    executor.shutdown()
+    target_executor.shutdown()
@@ -0,0 +1,68 @@
+import time
+
+from data_agent.api import ServiceApi
+from data_agent.connection_manager import ConnectionManager
+from data_agent.connectors.fake_connector import FakeConnector
+from data_agent.exchanger import DataExchanger
+from data_agent.safe_manipulator import SafeManipulator
+
+
+class SlowConnector(FakeConnector):
+    TYPE = "slow"
+
+    def read_tag_values(self, tags: list):
+        time.sleep(0.3 if self.name != "stuck" else 2)
+        return super().read_tag_values(tags)
+
+
+def test_read_tag_values_multi(config_manager):
+    connection_manager = ConnectionManager(
+        config_manager, extra_connectors={"slow": SlowConnector}
+    )
+    api = ServiceApi(
+        None,
+        connection_manager,
+        DataExchanger(connection_manager),
+        SafeManipulator(connection_manager, config=config_manager),
+    )
+    for conn_name in ["conn1", "conn2", "conn3", "stuck"]:
+        api.create_connection(conn_name, "slow", enabled=True)
+    api.create_connection("disabled", "slow")
+
+    start = time.monotonic()
+    result = api.read_tag_values_multi(
+        {
+            "conn1": ["Static.Int4"],
+            "conn2": ["Static.Int4", "Static.Float"],
+            "conn3": ["Static.Float"],
+            "stuck": ["Static.Int4"],
+            "disabled": ["Static.Int4"],
+        },
+        timeout=1,
+    )
+    elapsed = time.monotonic() - start
+
+    # Bound by the timeout rather than the sum of the reads
+    assert 1 <= elapsed < 1.5
+    assert sorted(result["values"]) == ["conn1", "conn2", "conn3"]
+    assert result["values"]["conn1"]["Static.Int4"]["Value"] == 12345
+    assert sorted(result["values"]["conn2"]) == ["Static.Float", "Static.Int4"]
+
+    assert result["errors"]["stuck"]["error_type"] == "TimeoutError"
+    assert result["errors"]["disabled"]["error_type"] == "ConnectionNotActive"
+
+    # Stuck connection is not read again until its previous read finishes
+    start = time.monotonic()
+    result = api.read_tag_values_multi(
+        {"conn1": ["Static.Int4"], "stuck": ["Static.Int4"]}, timeout=1
+    )
+    assert time.monotonic() - start < 0.5
+    assert sorted(result["values"]) == ["conn1"]
+    assert result["errors"]["stuck"]["error"] == "Previous read still running"
+
+    time.sleep(1)
+    result = api.read_tag_values_multi({"stuck": ["Static.Int4"]}, timeout=3)
+    assert result["values"]["stuck"]["Static.Int4"]["Value"] == 12345
+
+    assert api.read_tag_values_multi({}) == {"values": {}, "errors": {}}
+    connection_manager.close()
@@ -0,0 +1,131 @@
+import time
+
+import pytest
+
+from data_agent.circuit_breaker import (
+    CIRCUIT_CLOSED,
+    CIRCUIT_HALF_OPEN,
+    CIRCUIT_OPEN,
+    CircuitBreaker,
+)
+from data_agent.connection_manager import ConnectionManager
+from data_agent.connectors.fake_connector import FakeConnector
+from data_agent.exceptions import ConnectionCircuitOpen, TargetConnectionError
+
+
+class FlakyConnector(FakeConnector):
+    TYPE = "flaky"
+    failing = False
+    calls = 0
+
+    def read_tag_values(self, tags: list):
+        FlakyConnector.calls += 1
+        if not tags:
+            raise ValueError("No tags")
+        if FlakyConnector.failing:
+            raise TargetConnectionError("Target not responding")
+        return super().read_tag_values(tags)
+
+
+def _circuit(connection_manager, conn_name):
+    return next(
+        c.get("circuit")
+        for c in connection_manager.list_connections()
+        if c["name"] == conn_name
+    )
+
+
+def test_breaker_states():
+    breaker = CircuitBreaker("conn", failure_threshold=2, reset_timeout=0.2)
+    assert breaker.before_call() is False
+
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CIRCUIT_CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == CIRCUIT_OPEN
+    with pytest.raises(ConnectionCircuitOpen):
+        breaker.before_call()
+
+    # Single probe once the reset timeout passed
+    time.sleep(0.2)
+    assert breaker.state == CIRCUIT_HALF_OPEN
+    assert breaker.before_call() is True
+    with pytest.raises(ConnectionCircuitOpen):
+        breaker.before_call()
+
+    breaker.record_success(probe=True)
+    assert breaker.stats() == {
+        "state": CIRCUIT_CLOSED,
+        "failures": 0,
+        "trips": 1,
+        "rejected": 2,
+    }
+
+
+def test_connection_circuit(config_manager):
+    connection_manager = ConnectionManager(
+        config_manager, extra_connectors={"flaky": FlakyConnector}
+    )
+    connection_manager.create_connection(
+        "conn",
+        conn_type="flaky",
+        enabled=True,
+        circuit_breaker={"enabled": True, "failure_threshold": 2, "reset_timeout": 0.3},
+    )
+    connection_manager.create_connection("unguarded", conn_type="flaky")
+    assert _circuit(connection_manager, "conn") == CIRCUIT_CLOSED
+    assert _circuit(connection_manager, "unguarded") is None
+    assert config_manager.get("connections.conn.circuit_breaker.failure_threshold") == 2
+
+    conn = connection_manager.connection("conn")
+
+    # Caller errors don't trip the circuit
+    with pytest.raises(ValueError):
+        conn.read_tag_values([])
+    with pytest.raises(ValueError):
+        conn.read_tag_values([])
+    assert _circuit(connection_manager, "conn") == CIRCUIT_CLOSED
+
+    FlakyConnector.failing = True
+    for _ in range(2):
+        with pytest.raises(TargetConnectionError):
+            conn.read_tag_values(["Static.Int4"])
+    assert _circuit(connection_manager, "conn") == CIRCUIT_OPEN
+
+    # Open circuit fails fast without reaching the target
+    calls = FlakyConnector.calls
+    with pytest.raises(ConnectionCircuitOpen):
+        conn.read_tag_values(["Static.Int4"])
+    assert FlakyConnector.calls == calls
+
+    # Failed probe opens the circuit again
+    time.sleep(0.3)
+    assert _circuit(connection_manager, "conn") == CIRCUIT_HALF_OPEN
+    with pytest.raises(TargetConnectionError):
+        conn.read_tag_values(["Static.Int4"])
+    assert _circuit(connection_manager, "conn") == CIRCUIT_OPEN
+
+    # Successful probe closes it
+    FlakyConnector.failing = False
+    time.sleep(0.3)
+    assert conn.read_tag_values(["Static.Int4"])["Static.Int4"]["Value"] == 12345
+    assert _circuit(connection_manager, "conn") == CIRCUIT_CLOSED
+
+    # Abandoned reads count as failures, reconnecting closes the circuit
+    connection_manager.record_failure("conn")
+    connection_manager.record_failure("conn")
+    assert _circuit(connection_manager, "conn") == CIRCUIT_OPEN
+    conn.disconnect()
+    conn.connect()
+    assert _circuit(connection_manager, "conn") == CIRCUIT_CLOSED
+    connection_manager.close()
+
+    # Circuit breaker is recreated from config
+    connection_manager = ConnectionManager(
+        config_manager, extra_connectors={"flaky": FlakyConnector}
+    )
+    assert _circuit(connection_manager, "conn") == CIRCUIT_CLOSED
+    connection_manager.close()
@@ -1,3 +1,5 @@
+import os
+
 from data_agent.config_manager import ConfigManager
 
 
@@ -51,3 +53,33 @@ def test_persist_and_reload(temp_config_file):
 def test_dot_access(config_manager):
     config_manager.set("dot.access.test", "dotty")
     assert config_manager.dot.access.test == "dotty"
+
+
+def test_replace_and_reload(temp_config_file):
+    manager = ConfigManager(config_file=temp_config_file)
+    manager.set("jobs.job1", {"tags": ["a", "b"], "seconds": 1})
+    manager.set("jobs.job2", {"tags": ["c"], "seconds": 1})
+
+    # Lists are replaced (not merged), removed keys are gone from persisted file
+    manager.set("jobs.job1.tags", ["b"])
+    manager.remove("jobs.job2")
+    assert manager.get("jobs") == {"job1": {"tags": ["b"], "seconds": 1}}
+
+    new_manager = ConfigManager(config_file=temp_config_file)
+    assert new_manager.get("jobs") == {"job1": {"tags": ["b"], "seconds": 1}}
+
+    # Top level keys are replaced as well
+    new_manager.set("jobs", {}, persist=False)
+    assert new_manager.get("jobs") == {}
+
+
+def test_log_suffix(temp_config_file):
+    manager = ConfigManager(
+        config_file=temp_config_file, enable_persistence=False, log_suffix="worker-0"
+    )
+    assert manager.get("log.handlers.file.filename") == os.path.join(
+        manager.logs_dir, "data-agent-worker-0.log"
+    )
+    assert manager.get("log.handlers.err_file.filename").endswith(
+        "data-agent-err-worker-0.log"
+    )
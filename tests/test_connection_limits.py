@@ -0,0 +1,155 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from data_agent.connection_limits import (
+    ConnectionLimiter,
+    LimitedConnection,
+    TokenBucket,
+)
+from data_agent.connection_manager import ConnectionManager
+from data_agent.connectors.fake_connector import FakeConnector
+from data_agent.exchanger import DataExchanger
+
+
+class BusyConnector(FakeConnector):
+    TYPE = "busy"
+    lock = threading.Lock()
+    active_reads = 0
+    max_active_reads = 0
+
+    def read_tag_values(self, tags: list):
+        cls = BusyConnector
+        with cls.lock:
+            cls.active_reads += 1
+            cls.max_active_reads = max(cls.max_active_reads, cls.active_reads)
+        try:
+            time.sleep(0.2)
+            return super().read_tag_values(tags)
+        finally:
+            with cls.lock:
+                cls.active_reads -= 1
+
+
+class HistorianConnector(FakeConnector):
+    TYPE = "historian"
+
+    def write_group_values_period(self, group_name, df, on_conflict="append"):
+        self.written = len(df)
+
+    def write_tag_attributes(self, attributes: dict):
+        self.attributes = attributes
+
+
+def test_token_bucket():
+    bucket = TokenBucket(rate=10)
+    start = time.monotonic()
+    for _ in range(15):
+        bucket.acquire()
+    # Burst of 10, then 10 per second
+    assert 0.4 <= time.monotonic() - start < 0.7
+
+    # Charged debt delays the next acquirer (capped at burst)
+    bucket = TokenBucket(rate=10)
+    assert bucket.reserve(15) == 0.5
+    assert 0.45 <= bucket.reserve(0) <= 0.5
+    bucket = TokenBucket(rate=10)
+    assert bucket.reserve(30) == 1
+    assert 0.95 <= bucket.reserve(0) <= 1
+
+
+def test_rows_rate():
+    limiter = ConnectionLimiter(rows_per_second=5)
+    start = time.monotonic()
+    assert limiter.call(lambda: list(range(10))) == list(range(10))
+    assert time.monotonic() - start < 0.1
+
+    # 5 rows burst - the next call waits for the remaining 5 rows
+    limiter.call(lambda: 1)
+    assert 0.9 <= time.monotonic() - start < 1.3
+    assert limiter.stats()["rows"] == 11
+
+    # Large read delays the next call by one second of rows at most
+    limiter.call(lambda: list(range(1000)))
+    start = time.monotonic()
+    limiter.call(lambda: 1)
+    assert time.monotonic() - start < 1.2
+
+
+def test_connection_limits(config_manager):
+    connection_manager = ConnectionManager(
+        config_manager, extra_connectors={"busy": BusyConnector}
+    )
+    connection_manager.create_connection(
+        "conn",
+        conn_type="busy",
+        enabled=True,
+        limits={"max_concurrency": 2, "rows_per_second": 20},
+    )
+    connection_manager.create_connection("unlimited", conn_type="busy")
+    assert connection_manager.connection_stats("unlimited") is None
+    assert config_manager.get("connections.conn.limits.max_concurrency") == 2
+
+    conn = connection_manager.connection("conn")
+    assert isinstance(conn, LimitedConnection)
+    assert conn.TYPE == "busy"
+
+    # Concurrency cap
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        futures = [
+            executor.submit(conn.read_tag_values, ["Static.Int4", "Static.Float"])
+            for _ in range(6)
+        ]
+        time.sleep(0.1)
+        stats = connection_manager.connection_stats("conn")
+        assert stats["active"] == 2 and stats["queued"] == 4
+        results = [f.result() for f in futures]
+
+    assert BusyConnector.max_active_reads == 2
+    assert results[0]["Static.Int4"]["Value"] == 12345
+
+    stats = connection_manager.connection_stats("conn")
+    assert stats["calls"] == 6 and stats["rows"] == 12
+    assert stats["queued"] == 0 and stats["active"] == 0
+    assert stats["wait_time"]["max"] >= 0.35
+
+    connection_manager.close()
+
+    # Limits are recreated from config
+    connection_manager = ConnectionManager(
+        config_manager, extra_connectors={"busy": BusyConnector}
+    )
+    assert connection_manager.connection_stats("conn")["max_concurrency"] == 2
+    connection_manager.close()
+
+
+def test_exchanger_limits(config_manager):
+    connection_manager = ConnectionManager(
+        config_manager, extra_connectors={"historian": HistorianConnector}
+    )
+    connection_manager.create_connection("src", conn_type="historian", enabled=True)
+    connection_manager.create_connection(
+        "dest",
+        conn_type="historian",
+        enabled=True,
+        limits={"requests_per_second": 100},
+        circuit_breaker={"enabled": True},
+    )
+    exchanger = DataExchanger(connection_manager)
+
+    # Exchanger writes go through the destination limits
+    exchanger.copy_period(
+        "src",
+        ["Random.Real8"],
+        "dest",
+        "group1",
+        first_timestamp="2021-01-01",
+        last_timestamp="2021-01-02",
+        on_conflict="append",
+        batch_process=True,
+    )
+    exchanger.copy_attributes("src", ["Random.Real8"], "dest", dest_group="")
+    assert connection_manager.connection_stats("dest")["calls"] == 2
+    assert list(connection_manager.connection("dest").attributes) == ["Random.Real8"]
+
+    connection_manager.close()
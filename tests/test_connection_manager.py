@@ -1,3 +1,6 @@
+import threading
+import time
+
 import pytest
 
 from data_agent.abstract_connector import SupportedOperation
@@ -5,6 +8,7 @@ from data_agent.connection_manager import ConnectionManager
 from data_agent.connectors.fake_connector import FakeConnector
 from data_agent.exceptions import (
     ConnectionAlreadyExists,
+    ConnectionNotActive,
     ConnectionRedefinitionNotSupported,
     UnrecognizedConnectionType,
 )
@@ -241,3 +245,205 @@ def test_error_handling(connection_manager):
     # Try with invalid type
     with pytest.raises(UnrecognizedConnectionType):
         connection_manager.create_connection(conn_name="test2", conn_type="bbb")
+
+
+class FlakyConnector(FakeConnector):
+    TYPE = "flaky"
+
+    def __init__(self, conn_name="flaky_client", failures=0, **kwargs):
+        super(FlakyConnector, self).__init__(conn_name, **kwargs)
+        self.failures = failures
+        self.connect_attempts = []
+
+    def connect(self):
+        self.connect_attempts.append(time.monotonic())
+        if len(self.connect_attempts) <= self.failures:
+            raise ConnectionError("Target unreachable")
+        super(FlakyConnector, self).connect()
+
+
+def test_reconnect_backoff(config_manager):
+    config_manager.set("reconnect.initial_delay", 0.1)
+    config_manager.set("reconnect.max_delay", 0.4)
+    connection_manager = ConnectionManager(
+        config_manager, extra_connectors={"flaky": FlakyConnector}
+    )
+    connection_manager.create_connection("test1", conn_type="flaky", failures=4)
+    conn = connection_manager.connection("test1", check_enabled=False)
+
+    assert connection_manager.reconnect("test1")
+    # Single supervisor per connection
+    assert connection_manager.reconnect("test1")
+    assert connection_manager.is_reconnecting("test1")
+
+    time.sleep(1.5)
+    assert conn.connected
+    assert not connection_manager.is_reconnecting("test1")
+    assert connection_manager.reconnect("test1") is False
+
+    # Exponential backoff with jitter (50%-100% of the nominal delay)
+    delays = [b - a for a, b in zip(conn.connect_attempts, conn.connect_attempts[1:])]
+    assert len(delays) == 4
+    for delay, nominal in zip(delays, [0.1, 0.2, 0.4, 0.4]):
+        assert nominal * 0.5 - 0.01 <= delay <= nominal + 0.05
+
+    # Disabling connection stops reconnecting
+    conn.failures = 100
+    conn.disconnect()
+    connection_manager.reconnect("test1")
+    connection_manager.disable_connection("test1")
+    attempts = len(conn.connect_attempts)
+    time.sleep(0.5)
+    assert len(conn.connect_attempts) == attempts
+    assert not connection_manager.is_reconnecting("test1")
+
+    connection_manager.close()
+
+
+class SlowStartConnector(FakeConnector):
+    TYPE = "slow_start"
+
+    def __init__(self, conn_name="slow_start_client", delay=0, fail=False, **kwargs):
+        super(SlowStartConnector, self).__init__(conn_name, **kwargs)
+        self.delay = delay
+        self.fail = fail
+
+    def connect(self):
+        time.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("Target unreachable")
+        super(SlowStartConnector, self).connect()
+
+
+def test_parallel_startup(config_manager):
+    config_manager.set("startup.max_parallel_connects", 4)
+    config_manager.set("startup.connect_timeout", 1)
+    connections = {
+        f"conn{i}": {"type": "slow_start", "params": {"delay": 0.5}, "enabled": True}
+        for i in range(4)
+    }
+    connections["hanging"] = {
+        "type": "slow_start",
+        "params": {"delay": 3},
+        "enabled": True,
+    }
+    connections["failing"] = {
+        "type": "slow_start",
+        "params": {"fail": True},
+        "enabled": True,
+    }
+    connections["disabled"] = {"type": "slow_start", "params": {}, "enabled": False}
+    config_manager.set("connections", connections)
+
+    # Connected concurrently, hanging connection given up after timeout
+    start = time.monotonic()
+    connection_manager = ConnectionManager(
+        config_manager, extra_connectors={"slow_start": SlowStartConnector}
+    )
+    assert time.monotonic() - start < 2.5
+
+    assert [connection_manager.connection_status(f"conn{i}") for i in range(4)] == [
+        "connected"
+    ] * 4
+    assert connection_manager.connection_status("hanging") == "timeout"
+    assert connection_manager.connection_status("failing") == "failed"
+    assert connection_manager.connection_status("disabled") == "disconnected"
+
+    # Hanging connection completes in background
+    assert connection_manager.reconnect("hanging")
+    time.sleep(2.5)
+    assert connection_manager.connection_status("hanging") == "connected"
+    connection_manager.close()
+
+    # Background startup - status becomes visible as each connection finishes
+    start = time.monotonic()
+    connection_manager = ConnectionManager(
+        config_manager,
+        extra_connectors={"slow_start": SlowStartConnector},
+        background_startup=True,
+    )
+    assert time.monotonic() - start < 0.5
+    assert connection_manager.connection_status("conn0") == "connecting"
+    time.sleep(1)
+    assert connection_manager.connection_status("conn0") == "connected"
+    assert connection_manager.connection_status("hanging") == "connecting"
+    assert connection_manager.wait_startup(timeout=5)
+    connection_manager.close()
+
+
+class CountingConnector(SlowStartConnector):
+    TYPE = "counting"
+    lock = threading.Lock()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.connecting = 0
+        self.max_connecting = 0
+
+    def connect(self):
+        with CountingConnector.lock:
+            self.connecting += 1
+            self.max_connecting = max(self.max_connecting, self.connecting)
+        try:
+            super().connect()
+        finally:
+            with CountingConnector.lock:
+                self.connecting -= 1
+
+
+def test_reconnect_waiting_startup(config_manager):
+    config_manager.set("startup.max_parallel_connects", 1)
+    config_manager.set(
+        "connections",
+        {
+            f"conn{i}": {"type": "counting", "params": {"delay": 0.3}, "enabled": True}
+            for i in range(3)
+        },
+    )
+    connection_manager = ConnectionManager(
+        config_manager,
+        extra_connectors={"counting": CountingConnector},
+        background_startup=True,
+    )
+
+    # Connections waiting for a startup slot are not reconnected concurrently
+    time.sleep(0.1)
+    for i in range(3):
+        assert connection_manager.reconnect(f"conn{i}")
+        assert not connection_manager.is_reconnecting(f"conn{i}")
+
+    assert connection_manager.wait_startup(timeout=5)
+    for i in range(3):
+        conn = connection_manager.connection(f"conn{i}")
+        assert conn.connected and conn.max_connecting == 1
+        assert connection_manager.connection_status(f"conn{i}") == "connected"
+
+    connection_manager.close()
+
+
+def test_deferred_connections(config_manager):
+    config_manager.set(
+        "connections",
+        {
+            f"conn{i}": {"type": "counting", "params": {}, "enabled": True}
+            for i in range(2)
+        },
+    )
+    connection_manager = ConnectionManager(
+        config_manager,
+        extra_connectors={"counting": CountingConnector},
+        deferred_connections={"conn1"},
+    )
+
+    # Deferred connection is connected on its first use only
+    assert connection_manager.connection_status("conn0") == "connected"
+    assert connection_manager.connection_status("conn1") == "disconnected"
+    assert connection_manager.connection("conn1").connected
+    assert connection_manager.connection_status("conn1") == "connected"
+
+    # Once disconnected, it is not connected implicitly again
+    connection_manager.disable_connection("conn1")
+    with pytest.raises(ConnectionNotActive):
+        connection_manager.connection("conn1")
+
+    connection_manager.close()
@@ -0,0 +1,89 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from data_agent.connection_manager import ConnectionManager
+from data_agent.connection_pool import ConnectionPool
+from data_agent.connectors.fake_connector import FakeConnector
+from data_agent.exceptions import ConnectionNotActive
+
+
+class SessionConnector(FakeConnector):
+    TYPE = "session"
+    lock = threading.Lock()
+    active_reads = 0
+    max_active_reads = 0
+
+    def read_tag_values(self, tags: list):
+        cls = SessionConnector
+        with cls.lock:
+            cls.active_reads += 1
+            cls.max_active_reads = max(cls.max_active_reads, cls.active_reads)
+        try:
+            time.sleep(0.2)
+            return {"session": id(self), **super().read_tag_values(tags)}
+        finally:
+            with cls.lock:
+                cls.active_reads -= 1
+
+
+def test_pooled_reads(config_manager):
+    connection_manager = ConnectionManager(
+        config_manager, extra_connectors={"session": SessionConnector}
+    )
+    connection_manager.create_connection(
+        "conn", conn_type="session", enabled=True, pool_size=3
+    )
+    conn = connection_manager.connection("conn")
+    assert isinstance(conn, ConnectionPool)
+    assert conn.pool_size == 3
+    assert conn.TYPE == "session" and conn.name == "conn"
+    assert config_manager.get("connections.conn.pool_size") == 3
+
+    # Reads are served by idle sessions in parallel
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        results = list(
+            executor.map(lambda _: conn.read_tag_values(["Static.Int4"]), range(6))
+        )
+    assert time.monotonic() - start < 0.55
+    assert SessionConnector.max_active_reads == 3
+    assert len({r["session"] for r in results}) == 3
+    assert results[0]["Static.Int4"]["Value"] == 12345
+
+    # Sessions checked out across a reconnect are not returned twice
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        read = executor.submit(conn.read_tag_values, ["Static.Int4"])
+        time.sleep(0.05)
+        conn.connect()
+        assert read.result()["Static.Int4"]["Value"] == 12345
+    assert conn._idle.qsize() == 3
+
+    # Stateful calls go to the primary session
+    conn.register_group("group1", ["Static.Int4"])
+    assert conn.list_groups() == ["group1"]
+
+    conn.disconnect()
+    with pytest.raises(ConnectionNotActive):
+        conn.read_tag_values(["Static.Int4"])
+    connection_manager.close()
+
+    # Pool is recreated from config
+    connection_manager = ConnectionManager(
+        config_manager, extra_connectors={"session": SessionConnector}
+    )
+    assert connection_manager.connection("conn").pool_size == 3
+    connection_manager.close()
+
+    # Single session connections are not pooled (nor pool size persisted)
+    connection_manager = ConnectionManager(
+        config_manager, extra_connectors={"session": SessionConnector}
+    )
+    connection_manager.create_connection("single", conn_type="session")
+    assert isinstance(
+        connection_manager.connection("single", check_enabled=False), SessionConnector
+    )
+    assert "pool_size" not in config_manager.get("connections.single")
+    connection_manager.close()
@@ -0,0 +1,57 @@
+import pytest
+
+from data_agent import connector_registry
+from data_agent.connector_registry import ConnectorRegistry, supported_connectors
+from data_agent.connectors.fake_connector import FakeConnector
+from data_agent.exceptions import UnrecognizedConnectionType
+
+
+class PluginConnector(FakeConnector):
+    @staticmethod
+    def plugin_supported():
+        return True
+
+
+class FakeEntryPoint:
+    def __init__(self, name, cls):
+        self.name = name
+        self.value = f"fake_plugins:{name}"
+        self._cls = cls
+        self.loads = 0
+
+    def load(self):
+        self.loads += 1
+        return self._cls
+
+
+def test_lazy_loading(monkeypatch):
+    entries = [
+        FakeEntryPoint("plugin1", PluginConnector),
+        FakeEntryPoint("plugin2", FakeConnector),  # Not supported on this platform
+    ]
+    monkeypatch.setattr(connector_registry, "list_plugins", lambda: entries)
+    monkeypatch.setattr(connector_registry, "_metadata_cache", {})
+
+    registry = ConnectorRegistry(extra_connectors={"fake": FakeConnector})
+    assert registry.types() == ["plugin1", "plugin2", "fake"]
+    assert "plugin1" in registry and "unknown" not in registry
+    assert [entry.loads for entry in entries] == [0, 0]
+
+    assert registry.connector_class("plugin1") is PluginConnector
+    assert registry.connector_class("plugin1") is PluginConnector
+    assert registry.connector_class("fake") is FakeConnector
+    assert [entry.loads for entry in entries] == [1, 0]
+
+    with pytest.raises(UnrecognizedConnectionType):
+        registry.connector_class("unknown")
+
+    # Metadata is cached - unsupported plugins are skipped
+    expected = {
+        "plugin1": {
+            "category": PluginConnector.CATEGORY,
+            "connection_fields": PluginConnector.list_connection_fields(),
+        }
+    }
+    assert supported_connectors() == expected
+    assert supported_connectors() == expected
+    assert [entry.loads for entry in entries] == [2, 1]
@@ -0,0 +1,48 @@
+import pytest
+
+from data_agent.daq_deadband import DeadbandFilter
+
+
+def _sample(value, quality="Good"):
+    return {"Value": value, "Quality": quality, "Timestamp": None}
+
+
+def test_absolute_deadband():
+    tags = ["A", "B", "C"]
+    db_filter = DeadbandFilter(tags, deadband={"A": 1.0, "B": 0.5})
+
+    # First scan - everything reported
+    assert db_filter.filter(
+        {"A": _sample(10), "B": _sample(10), "C": _sample("on")}
+    ) == [0, 1, 2]
+
+    # Within deadband / unchanged
+    assert (
+        db_filter.filter({"A": _sample(10.5), "B": _sample(10.4), "C": _sample("on")})
+        == []
+    )
+
+    # Beyond deadband, compared with last *published* value
+    assert db_filter.filter(
+        {"A": _sample(11.1), "B": _sample(10.6), "C": _sample("off")}
+    ) == [0, 1, 2]
+    assert db_filter.filter({"A": _sample(11.5), "B": _sample(10.6)}) == []
+
+
+def test_quality_change_and_keyframe():
+    db_filter = DeadbandFilter(["A", "B"], deadband=100)
+    assert db_filter.filter({"A": _sample(1), "B": _sample(1)}) == [0, 1]
+
+    assert db_filter.filter({"A": _sample(1, "Bad"), "B": _sample(2)}) == [0]
+    assert db_filter.filter({"A": _sample(1, "Bad"), "B": _sample(2)}) == []
+    assert db_filter.filter({"A": _sample(1, "Bad"), "B": _sample(2)}, True) == [0, 1]
+
+
+def test_percent_deadband():
+    db_filter = DeadbandFilter(["A"], deadband=10, deadband_type="percent")
+    assert db_filter.filter({"A": _sample(200)}) == [0]
+    assert db_filter.filter({"A": _sample(219)}) == []
+    assert db_filter.filter({"A": _sample(221)}) == [0]
+
+    with pytest.raises(ValueError):
+        DeadbandFilter(["A"], deadband_type="relative")
@@ -1,13 +1,22 @@
 import asyncio
 import json
+import os
+import time
 
 import pytest
-from conftest import DATA_EXCHANGE_NAME, SERVICE_ID
+from apscheduler.jobstores.base import JobLookupError
+from conftest import DATA_EXCHANGE_NAME, SERVICE_ID, DataSink
 
 from data_agent.connection_manager import ConnectionManager
 from data_agent.connectors.fake_connector import FakeConnector
 from data_agent.daq_scheduler import create_daq_scheduler
 from data_agent.exceptions import DaqJobAlreadyExists, UnrecognizedConnection
+from data_agent.msg_packer import (
+    decode_batch_frame,
+    decode_frame,
+    decode_indexed_values,
+    decode_scan_values,
+)
 
 
 @pytest.mark.asyncio
@@ -285,3 +294,751 @@ async def test_job_reconnect2(
     await mock_queue.unbind(DATA_EXCHANGE_NAME, "")
     conn.disconnect()
     connection_manager.delete_connection(conn_name)
+
+
+class SlowConnector(FakeConnector):
+    TYPE = "slow"
+
+    def read_tag_values(self, tags: list):
+        time.sleep(3)
+        return super(SlowConnector, self).read_tag_values(tags)
+
+
+@pytest.mark.asyncio
+async def test_job_read_timeout(config_manager, data_sink):
+    connection_manager = ConnectionManager(
+        config=config_manager,
+        extra_connectors={"fake": FakeConnector, "slow": SlowConnector},
+    )
+    connection_manager.create_connection("fast_conn", conn_type="fake", enabled=True)
+    connection_manager.create_connection(
+        "slow_conn",
+        conn_type="slow",
+        enabled=True,
+        circuit_breaker={"enabled": True, "failure_threshold": 3},
+    )
+
+    scheduler = create_daq_scheduler(
+        data_sink, connection_manager, config=config_manager
+    )
+    for job_id in ["slow_job", "slow_job2"]:
+        scheduler.create_scan_job(
+            job_id=job_id,
+            conn_name="slow_conn",
+            tags=["Static.Int4"],
+            seconds=1,
+            read_timeout=0.5,
+        )
+    scheduler.create_scan_job(
+        job_id="fast_job", conn_name="fast_conn", tags=["Static.Int4"], seconds=1
+    )
+    assert config_manager.get("daq_jobs.slow_job.read_timeout") == 0.5
+
+    # Slow reads run on their own workers and do not block the loop
+    start_time = time.time()
+    await asyncio.sleep(2.5)
+    assert time.time() - start_time < 3
+
+    published = [headers["job_id"] for _, headers in data_sink.messages]
+    assert "fast_job" in published
+    assert "slow_job" not in published
+
+    # Single abandoned read of both jobs counts as a single failure
+    assert scheduler.job_stats("slow_job")["timeouts"] == 1
+    assert scheduler.job_stats("slow_job2")["timeouts"] == 1
+    breaker = connection_manager.connection("slow_conn").breaker
+    assert breaker.stats()["failures"] == 1
+
+    # Abandoned reads don't hold the shutdown
+    start_time = time.time()
+    scheduler.shutdown()
+    assert time.time() - start_time < 1
+    connection_manager.close()
+
+
+@pytest.mark.asyncio
+async def test_job_columnar_payload(config_manager, connection_manager, data_sink):
+    connection_manager.create_connection("fake_conn", conn_type="fake", enabled=True)
+
+    scheduler = create_daq_scheduler(
+        data_sink, connection_manager, config=config_manager
+    )
+    scheduler.create_scan_job(
+        job_id="job1",
+        conn_name="fake_conn",
+        tags=["Static.Int4", "Random.String"],
+        seconds=1,
+        payload_format="columnar",
+    )
+    scheduler.create_scan_job(
+        job_id="job2", conn_name="fake_conn", tags=["Static.Int4"], seconds=1
+    )
+
+    with pytest.raises(ValueError):
+        scheduler.create_scan_job(
+            job_id="job3",
+            conn_name="fake_conn",
+            tags=["Static.Int4"],
+            payload_format="xml",
+        )
+
+    await asyncio.sleep(1.5)
+
+    messages = {
+        headers["job_id"]: (msg, headers) for msg, headers in data_sink.messages
+    }
+
+    msg, headers = messages["job1"]
+    assert headers["codec"] == "msgpack+zstd"
+    payload = decode_scan_values(msg)
+    assert payload["sample_id"] == 0
+    assert payload["data"]["Static.Int4"]["Value"] == 12345
+
+    msg, headers = messages["job2"]
+    assert headers["codec"] == "json"
+    assert json.loads(msg.decode())["data"]["Static.Int4"]["Value"] == 12345
+
+    scheduler.shutdown(wait=False)
+
+
+@pytest.mark.asyncio
+async def test_job_indexed_payload(config_manager, connection_manager, data_sink):
+    connection_manager.create_connection("fake_conn", conn_type="fake", enabled=True)
+
+    scheduler = create_daq_scheduler(
+        data_sink, connection_manager, config=config_manager
+    )
+    scheduler.create_scan_job(
+        job_id="job1",
+        conn_name="fake_conn",
+        tags=["Static.Int4", "Random.String"],
+        seconds=1,
+        payload_format="indexed",
+    )
+
+    await asyncio.sleep(2.2)
+
+    # Schema frame once, followed by value frames
+    frame_types = [headers["frame_type"] for _, headers in data_sink.messages]
+    assert frame_types == ["schema", "values", "values"]
+
+    schema = decode_frame(data_sink.messages[0][0])
+    assert schema["job_id"] == "job1"
+    assert schema["schema_version"] == 0
+    assert schema["tags"] == ["Random.String", "Static.Int4"]
+
+    payload = decode_indexed_values(data_sink.messages[2][0], schema)
+    assert payload["sample_id"] == 1
+    assert payload["data"]["Static.Int4"]["Value"] == 12345
+
+    # Changing tags publishes a new schema
+    data_sink.messages.clear()
+    scheduler.add_tags("job1", ["Static.Float"])
+
+    await asyncio.sleep(1)
+
+    frame_types = [headers["frame_type"] for _, headers in data_sink.messages]
+    assert frame_types == ["schema", "values"]
+
+    new_schema = decode_frame(data_sink.messages[0][0])
+    assert new_schema["schema_version"] == 1
+    assert new_schema["tags"] == ["Random.String", "Static.Int4", "Static.Float"]
+
+    with pytest.raises(ValueError):
+        decode_indexed_values(data_sink.messages[1][0], schema)
+
+    payload = decode_indexed_values(data_sink.messages[1][0], new_schema)
+    assert payload["data"]["Static.Float"]["Value"] == 83289.48243
+
+    # Recreating the job with different tags bumps the version as well
+    scheduler.create_scan_job(
+        job_id="job1",
+        conn_name="fake_conn",
+        tags=["Static.Int4"],
+        seconds=1,
+        payload_format="indexed",
+        update_on_conflict=True,
+    )
+    data_sink.messages.clear()
+
+    await asyncio.sleep(1)
+
+    assert decode_frame(data_sink.messages[0][0])["schema_version"] == 2
+
+    scheduler.shutdown(wait=False)
+
+
+class CountingConnector(FakeConnector):
+    TYPE = "counting"
+
+    def __init__(self, conn_name="counting_client", **kwargs):
+        super(CountingConnector, self).__init__(conn_name, **kwargs)
+        self.reads = []
+
+    def read_tag_values(self, tags: list):
+        self.reads.append(list(tags))
+        return super(CountingConnector, self).read_tag_values(tags)
+
+
+@pytest.mark.asyncio
+async def test_job_coalesced_reads(config_manager, data_sink):
+    connection_manager = ConnectionManager(
+        config=config_manager,
+        extra_connectors={"counting": CountingConnector},
+    )
+    connection_manager.create_connection("conn", conn_type="counting", enabled=True)
+    conn = connection_manager.connection("conn")
+
+    scheduler = create_daq_scheduler(
+        data_sink, connection_manager, config=config_manager
+    )
+    scheduler.create_scan_job(
+        job_id="job1", conn_name="conn", tags=["Static.Int4", "Random.Real8"]
+    )
+    await asyncio.sleep(0.3)
+    scheduler.create_scan_job(
+        job_id="job2", conn_name="conn", tags=["Static.Int4", "Static.Float"]
+    )
+    scheduler.create_scan_job(
+        job_id="job3", conn_name="conn", tags=["Static.Float"], from_cache=False
+    )
+
+    # Jobs of the same group are scheduled in the same phase
+    assert (
+        scheduler.get_job("job1").next_run_time
+        == scheduler.get_job("job2").next_run_time
+    )
+
+    await asyncio.sleep(1.9)
+
+    # One union read per tick for job1 + job2 and separate ones for job3 (device read)
+    reads = [sorted(tags) for tags in conn.reads]
+    assert reads.count(["Random.Real8", "Static.Float", "Static.Int4"]) == 2
+    assert reads.count(["Static.Float"]) >= 1
+    assert len(reads) <= 4
+
+    # Each job publishes its own tags with its own sample counter
+    payloads = {}
+    for msg, headers in data_sink.messages:
+        payloads.setdefault(headers["job_id"], []).append(json.loads(msg.decode()))
+
+    assert [p["sample_id"] for p in payloads["job1"]] == [0, 1]
+    assert [p["sample_id"] for p in payloads["job2"]] == [0, 1]
+    assert list(payloads["job1"][0]["data"]) == ["Random.Real8", "Static.Int4"]
+    assert list(payloads["job2"][0]["data"]) == ["Static.Float", "Static.Int4"]
+    assert list(payloads["job3"][0]["data"]) == ["Static.Float"]
+
+    scheduler.shutdown(wait=False)
+    connection_manager.close()
+
+
+@pytest.mark.asyncio
+async def test_job_report_by_exception(config_manager, connection_manager, data_sink):
+    connection_manager.create_connection("fake_conn", conn_type="fake", enabled=True)
+
+    scheduler = create_daq_scheduler(
+        data_sink, connection_manager, config=config_manager
+    )
+    scheduler.create_scan_job(
+        job_id="job1",
+        conn_name="fake_conn",
+        tags=["Static.Int4", "Random.Real8"],
+        seconds=1,
+        report_by_exception=True,
+        deadband={"Random.Real8": 0.0001},
+    )
+
+    await asyncio.sleep(2.2)
+
+    payloads = [json.loads(msg.decode()) for msg, _ in data_sink.messages]
+    assert len(payloads) == 2
+
+    # Keyframe with all the tags and then only the changing one
+    assert payloads[0]["keyframe"] is True
+    assert list(payloads[0]["data"]) == ["Random.Real8", "Static.Int4"]
+    assert payloads[1]["keyframe"] is False
+    assert payloads[1]["sample_id"] == 1
+    assert list(payloads[1]["data"]) == ["Random.Real8"]
+
+    with pytest.raises(ValueError):
+        scheduler.create_scan_job(
+            job_id="job2",
+            conn_name="fake_conn",
+            tags=["Static.Int4"],
+            report_by_exception=True,
+            deadband_type="relative",
+        )
+
+    scheduler.shutdown(wait=False)
+
+
+class GroupsTrackingConnector(FakeConnector):
+    TYPE = "groups_tracking"
+
+    def __init__(self, conn_name="groups_tracking_client", **kwargs):
+        super(GroupsTrackingConnector, self).__init__(conn_name, **kwargs)
+        self.registrations = []
+        self.group_reads = []
+
+    def register_group(self, group_name: str, tags: list, refresh_rate_ms: int = 1000):
+        self.registrations.append((group_name, list(tags), refresh_rate_ms))
+        super(GroupsTrackingConnector, self).register_group(
+            group_name, tags, refresh_rate_ms
+        )
+
+    def read_group_values(self, group_name: str, from_cache: bool = True):
+        self.group_reads.append((group_name, from_cache))
+        return super(GroupsTrackingConnector, self).read_group_values(
+            group_name, from_cache
+        )
+
+
+@pytest.mark.asyncio
+async def test_job_group_reads(config_manager, data_sink):
+    connection_manager = ConnectionManager(
+        config=config_manager,
+        extra_connectors={"groups_tracking": GroupsTrackingConnector},
+    )
+    connection_manager.create_connection(
+        "conn", conn_type="groups_tracking", enabled=True
+    )
+    conn = connection_manager.connection("conn")
+
+    scheduler = create_daq_scheduler(
+        data_sink, connection_manager, config=config_manager
+    )
+    scheduler.create_scan_job(
+        job_id="job1", conn_name="conn", tags=["Static.Int4"], from_cache=False
+    )
+
+    await asyncio.sleep(1.2)
+
+    assert len(conn.registrations) == 1
+    group_name, tags, refresh_rate_ms = conn.registrations[0]
+    assert tags == ["Static.Int4"]
+    assert refresh_rate_ms == 1000
+    assert conn.group_reads == [(group_name, False)]
+
+    # Group is registered again after reconnect (the scan on disconnected connection is skipped)
+    conn.disconnect()
+    await asyncio.sleep(2)
+
+    assert conn.connected
+    assert data_sink.messages[1][1]["frame_type"] == "status"
+    assert len(conn.registrations) == 2
+    assert conn.group_reads == [(group_name, False), (group_name, False)]
+
+    # ... and when the tags change
+    scheduler.add_tags("job1", ["Static.Float"])
+    await asyncio.sleep(1)
+
+    assert conn.registrations[-1][1] == ["Static.Int4", "Static.Float"]
+    payload = json.loads(data_sink.messages[-1][0].decode())
+    assert list(payload["data"]) == ["Static.Float", "Static.Int4"]
+
+    # Removing the last job of a group unregisters it
+    scheduler.remove_job("job1")
+    await asyncio.sleep(0.1)
+    assert conn.list_groups() == []
+
+    scheduler.shutdown(wait=False)
+    connection_manager.close()
+
+
+@pytest.mark.asyncio
+async def test_job_stats(config_manager, connection_manager, data_sink):
+    connection_manager.create_connection("fake_conn", conn_type="fake", enabled=True)
+    # Stats messages are opt-in
+    assert config_manager.get("daq.stats_interval") == 0
+    config_manager.set("daq.stats_interval", 1.5)
+
+    scheduler = create_daq_scheduler(
+        data_sink, connection_manager, config=config_manager
+    )
+    scheduler.create_scan_job(
+        job_id="job1",
+        conn_name="fake_conn",
+        tags=["Static.Int4", "Random.Real8"],
+        seconds=1,
+    )
+
+    await asyncio.sleep(2.2)
+
+    stats = scheduler.job_stats("job1")
+    assert stats["runs"] == 2
+    assert stats["published"] == 2
+    assert stats["errors"] == 0 and stats["last_error"] is None
+    assert stats["read_time"]["count"] == 2
+    assert 0 <= stats["read_time"]["p50"] <= stats["read_time"]["p99"]
+    assert stats["payload_bytes"]["last"] == len(data_sink.messages[-1][0])
+    assert list(scheduler.job_stats()) == ["job1"]
+
+    # Periodic stats message
+    stats_msgs = [
+        json.loads(msg.decode())
+        for msg, headers in data_sink.messages
+        if headers.get("frame_type") == "stats"
+    ]
+    assert len(stats_msgs) == 1
+    assert stats_msgs[0]["jobs"]["job1"]["published"] >= 1
+
+    scheduler.remove_job("job1")
+    assert scheduler.job_stats() == {}
+
+    scheduler.shutdown(wait=False)
+
+
+@pytest.mark.asyncio
+async def test_job_phase_policy(config_manager, connection_manager, data_sink):
+    for conn_name in ["fake_conn1", "fake_conn2", "fake_conn3"]:
+        connection_manager.create_connection(conn_name, conn_type="fake", enabled=True)
+
+    scheduler = create_daq_scheduler(
+        data_sink, connection_manager, config=config_manager
+    )
+
+    def phase(job_id):
+        return scheduler._job_state[job_id]["scan_group"][2]
+
+    # Scan groups of the same interval are spread evenly
+    for i, conn_name in enumerate(["fake_conn1", "fake_conn2", "fake_conn3"]):
+        scheduler.create_scan_job(
+            job_id=f"job{i}",
+            conn_name=conn_name,
+            tags=["Static.Int4"],
+            seconds=4,
+            phase_policy="stagger",
+        )
+    assert [phase(f"job{i}") for i in range(3)] == [0, 2, 1]
+
+    # Jobs of the same connection stay in phase (read together)
+    scheduler.create_scan_job(
+        job_id="job3",
+        conn_name="fake_conn2",
+        tags=["Random.Real8"],
+        seconds=4,
+        phase_policy="stagger",
+    )
+    assert phase("job3") == 2
+
+    # Wall-clock aligned
+    scheduler.create_scan_job(
+        job_id="job4",
+        conn_name="fake_conn1",
+        tags=["Random.Real8"],
+        seconds=10,
+        phase_policy="align",
+        phase_offset=0.5,
+    )
+    assert phase("job4") == 0.5
+    assert scheduler.get_job("job4").next_run_time.timestamp() % 10 == pytest.approx(
+        0.5, abs=0.01
+    )
+
+    with pytest.raises(ValueError):
+        scheduler.create_scan_job(
+            job_id="job5",
+            conn_name="fake_conn1",
+            tags=["Static.Int4"],
+            phase_policy="random",
+        )
+
+    scheduler.shutdown(wait=False)
+
+
+@pytest.mark.asyncio
+async def test_job_high_rate(config_manager, connection_manager, data_sink):
+    connection_manager.create_connection("fake_conn", conn_type="fake", enabled=True)
+
+    scheduler = create_daq_scheduler(
+        data_sink, connection_manager, config=config_manager
+    )
+
+    with pytest.raises(ValueError):
+        scheduler.create_scan_job(
+            job_id="job1", conn_name="fake_conn", tags=["Static.Int4"], period_ms=10
+        )
+
+    scheduler.create_scan_job(
+        job_id="job1",
+        conn_name="fake_conn",
+        tags=["Static.Int4", "Random.Real8"],
+        period_ms=100,
+    )
+    assert scheduler.list_jobs() == ["job1"]
+    assert config_manager.get("daq_jobs.job1.period_ms") == 100
+
+    await asyncio.sleep(1.05)
+
+    payloads = [json.loads(msg.decode()) for msg, _ in data_sink.messages]
+    assert 9 <= len(payloads) <= 10
+    assert [p["sample_id"] for p in payloads] == list(range(len(payloads)))
+
+    stats = scheduler.job_stats("job1")
+    assert stats["jitter_ms"]["count"] == len(payloads)
+    assert stats["jitter_ms"]["p50"] < 20
+
+    scheduler.remove_job("job1")
+    published = len(data_sink.messages)
+    await asyncio.sleep(0.3)
+    assert len(data_sink.messages) == published
+
+    scheduler.shutdown(wait=False)
+
+
+@pytest.mark.asyncio
+async def test_job_batched_payload(config_manager, connection_manager, data_sink):
+    connection_manager.create_connection("fake_conn", conn_type="fake", enabled=True)
+
+    scheduler = create_daq_scheduler(
+        data_sink, connection_manager, config=config_manager
+    )
+
+    # Batch by samples count
+    scheduler.create_scan_job(
+        job_id="job1",
+        conn_name="fake_conn",
+        tags=["Static.Int4", "Random.Real8"],
+        period_ms=100,
+        batch_samples=5,
+    )
+    await asyncio.sleep(1.07)
+
+    assert len(data_sink.messages) == 2
+    for i, (msg, headers) in enumerate(data_sink.messages):
+        assert headers["frame_type"] == "batch"
+        samples = json.loads(msg.decode())["samples"]
+        assert [s["sample_id"] for s in samples] == list(range(i * 5, i * 5 + 5))
+        assert list(samples[0]["data"]) == ["Random.Real8", "Static.Int4"]
+
+    # Batch latency bound - partially filled batch published on time
+    scheduler.create_scan_job(
+        job_id="job1",
+        conn_name="fake_conn",
+        tags=["Static.Int4", "Random.Real8"],
+        update_on_conflict=True,
+        period_ms=100,
+        batch_samples=100,
+        batch_ms=350,
+        payload_format="columnar",
+    )
+    data_sink.messages.clear()
+    await asyncio.sleep(0.5)
+
+    assert len(data_sink.messages) == 1
+    msg, headers = data_sink.messages[0]
+    assert headers == {
+        "job_id": "job1",
+        "codec": "msgpack+zstd",
+        "frame_type": "batch",
+    }
+    samples = decode_batch_frame(msg)
+    assert [s["sample_id"] for s in samples] == [0, 1, 2, 3]
+    assert samples[0]["data"]["Static.Int4"]["Value"] == 12345
+
+    # Pending samples are published when the job is removed
+    await asyncio.sleep(0.15)
+    scheduler.remove_job("job1")
+    assert len(data_sink.messages) == 2
+
+    scheduler.shutdown(wait=False)
+
+
+class UnreachableConnector(FakeConnector):
+    TYPE = "unreachable"
+
+    def __init__(self, conn_name="unreachable_client", **kwargs):
+        super(UnreachableConnector, self).__init__(conn_name, **kwargs)
+        self.connect_attempts = 0
+
+    def connect(self):
+        self.connect_attempts += 1
+        raise ConnectionError("Target unreachable")
+
+
+@pytest.mark.asyncio
+async def test_job_disconnected(config_manager, data_sink):
+    config_manager.set("reconnect.initial_delay", 10)
+    connection_manager = ConnectionManager(
+        config=config_manager, extra_connectors={"unreachable": UnreachableConnector}
+    )
+    connection_manager.create_connection("conn", conn_type="unreachable")
+    conn = connection_manager.connection("conn", check_enabled=False)
+
+    scheduler = create_daq_scheduler(
+        data_sink, connection_manager, config=config_manager
+    )
+    for job_id in ["job1", "job2"]:
+        scheduler.create_scan_job(
+            job_id=job_id, conn_name="conn", tags=["Static.Int4"], seconds=1
+        )
+
+    await asyncio.sleep(2.2)
+
+    # Jobs don't connect by themselves - a single supervisor backs off retrying
+    assert conn.connect_attempts == 1
+    assert connection_manager.is_reconnecting("conn")
+
+    assert len(data_sink.messages) == 4
+    for msg, headers in data_sink.messages:
+        assert headers["frame_type"] == "status"
+        assert json.loads(msg.decode())["status"] == "disconnected"
+    assert scheduler.job_stats("job1")["disconnected"] == 2
+
+    scheduler.shutdown(wait=False)
+    connection_manager.close()
+
+
+@pytest.mark.asyncio
+async def test_job_update_tags(config_manager, connection_manager, data_sink):
+    connection_manager.create_connection("fake_conn", conn_type="fake", enabled=True)
+
+    scheduler = create_daq_scheduler(
+        data_sink, connection_manager, config=config_manager
+    )
+    scheduler.create_scan_job(
+        job_id="job1",
+        conn_name="fake_conn",
+        tags=["Static.Int4", "Random.Real8"],
+        payload_format="indexed",
+    )
+    await asyncio.sleep(1.1)
+
+    result = scheduler.update_tags(
+        "job1", add=["Static.Float", "Static.Int4"], remove=["Random.Real8"]
+    )
+    assert result == {"added": ["Static.Float"], "removed": ["Random.Real8"]}
+    assert scheduler.list_tags("job1") == ["Static.Int4", "Static.Float"]
+    assert config_manager.get("daq_jobs.job1.tags") == ["Static.Int4", "Static.Float"]
+
+    # No change - schema is kept
+    assert scheduler.update_tags("job1", add=["Static.Int4"]) == {
+        "added": [],
+        "removed": [],
+    }
+
+    scheduler.remove_tags("job1", ["Static.Int4"])
+    assert config_manager.get("daq_jobs.job1.tags") == ["Static.Float"]
+    await asyncio.sleep(1)
+
+    schemas = [
+        decode_frame(msg)
+        for msg, headers in data_sink.messages
+        if headers["frame_type"] == "schema"
+    ]
+    assert [s["schema_version"] for s in schemas] == [0, 2]
+    assert schemas[-1]["tags"] == ["Static.Float"]
+
+    with pytest.raises(JobLookupError):
+        scheduler.update_tags("job2", add=["Static.Int4"])
+
+    scheduler.shutdown(wait=False)
+
+
+class _AmqpConnection:
+    def __init__(self):
+        self.is_closed = False
+        self.transport = object()
+
+
+class BrokerSink(DataSink):
+    """Data sink mimicking AmqBrokerConnector connection state"""
+
+    def __init__(self):
+        super(BrokerSink, self).__init__()
+        self._broker_conn = _AmqpConnection()
+
+
+@pytest.mark.asyncio
+async def test_job_spool(config_manager, connection_manager):
+    connection_manager.create_connection("fake_conn", conn_type="fake", enabled=True)
+    config_manager.set("spool.enabled", True)
+    broker = BrokerSink()
+
+    scheduler = create_daq_scheduler(broker, connection_manager, config=config_manager)
+    scheduler.create_scan_job(
+        job_id="job1", conn_name="fake_conn", tags=["Static.Int4"], seconds=1
+    )
+    await asyncio.sleep(1.1)
+    assert len(broker.messages) == 1
+
+    # Broker is down - samples are spooled
+    broker._broker_conn.transport = None
+    await asyncio.sleep(2)
+    assert len(broker.messages) == 1
+    assert scheduler.job_stats("job1")["spooled"] == 2
+    assert os.listdir(os.path.join(config_manager.base_path, "spool"))
+
+    # ... and replayed in order after reconnect
+    broker._broker_conn.transport = object()
+    await asyncio.sleep(1.2)
+
+    sample_ids = [json.loads(msg.decode())["sample_id"] for msg, _ in broker.messages]
+    assert sample_ids == [0, 1, 2, 3]
+
+    scheduler.shutdown(wait=False)
+
+
+class LaggingConnector(FakeConnector):
+    TYPE = "lagging"
+    read_delay = 0
+
+    def read_tag_values(self, tags):
+        time.sleep(self.read_delay)
+        return super(LaggingConnector, self).read_tag_values(tags)
+
+
+@pytest.mark.asyncio
+async def test_job_adaptive_rate(config_manager, data_sink):
+    # Adaptive rate is opt-in
+    assert config_manager.get("daq.adaptive_rate.enabled") is False
+    config_manager.set(
+        "daq.adaptive_rate",
+        {
+            "enabled": True,
+            "overruns": 2,
+            "step": 2,
+            "max_factor": 4,
+            "recover_scans": 2,
+        },
+    )
+    connection_manager = ConnectionManager(
+        config=config_manager, extra_connectors={"lagging": LaggingConnector}
+    )
+    connection_manager.create_connection("conn", conn_type="lagging", enabled=True)
+    conn = connection_manager.connection("conn")
+
+    scheduler = create_daq_scheduler(
+        data_sink, connection_manager, config=config_manager
+    )
+    scheduler.create_scan_job(
+        job_id="job1", conn_name="conn", tags=["Static.Int4"], seconds=0.2
+    )
+
+    # Sustained overruns - interval stretched up to max factor
+    conn.read_delay = 0.5
+    await asyncio.sleep(3.5)
+    assert scheduler.job_stats("job1")["rate_factor"] == 4
+    assert scheduler.get_job("job1").trigger.interval.total_seconds() == 0.8
+
+    # Latency recovered - back to configured interval step by step
+    conn.read_delay = 0
+    await asyncio.sleep(3.5)
+    assert scheduler.job_stats("job1")["rate_factor"] == 1
+    assert scheduler.get_job("job1").trigger.interval.total_seconds() == 0.2
+
+    statuses = [
+        json.loads(msg.decode())
+        for msg, headers in data_sink.messages
+        if headers.get("frame_type") == "status"
+    ]
+    assert [s["status"] for s in statuses] == [
+        "degraded",
+        "degraded",
+        "degraded",
+        "recovered",
+    ]
+    assert [s["rate_factor"] for s in statuses] == [2, 4, 2, 1]
+
+    scheduler.shutdown(wait=False)
+    connection_manager.close()
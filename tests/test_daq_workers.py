@@ -0,0 +1,129 @@
+import multiprocessing
+import time
+
+import pytest
+from apscheduler.jobstores.base import JobLookupError
+
+from data_agent.connectors.fake_connector import FakeConnector
+from data_agent.daq_workers import DAQWorkerPool, worker_index
+from data_agent.exceptions import DaqJobAlreadyExists, UnrecognizedConnection
+
+
+class QueueSink:
+    def __init__(self, queue):
+        self._queue = queue
+
+    def publish_data(self, data, headers):
+        self._queue.put((data, headers))
+
+
+class QueueSinkFactory:
+    """Worker 'broker' forwarding published messages back to the test process"""
+
+    def __init__(self, queue):
+        self._queue = queue
+
+    async def open(self):
+        return QueueSink(self._queue)
+
+    @staticmethod
+    async def close(broker):
+        pass
+
+
+def wait_for_jobs(queue, job_ids, timeout=30):
+    pending = set(job_ids)
+    deadline = time.time() + timeout
+    while pending and time.time() < deadline:
+        try:
+            data, headers = queue.get(timeout=1)
+        except Exception:
+            continue
+        if headers.get("frame_type", "values") == "values":
+            pending.discard(headers["job_id"])
+    return pending
+
+
+def test_worker_index():
+    assert worker_index("conn1", 4) == worker_index("conn1", 4)
+    assert {worker_index(f"conn{i}", 4) for i in range(100)} == {0, 1, 2, 3}
+
+
+def test_worker_pool(config_manager, connection_manager):
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+
+    conns = ["conn1", "conn2", "conn4"]
+    for conn in conns:
+        connection_manager.create_connection(conn, "fake", enabled=True)
+    assert len({worker_index(conn, 2) for conn in conns}) == 2
+
+    pool = DAQWorkerPool(
+        config_manager,
+        broker_factory=QueueSinkFactory(queue),
+        processes=2,
+        extra_connectors={"fake": FakeConnector},
+    )
+    try:
+        for i, conn in enumerate(conns):
+            pool.create_scan_job(f"job{i}", conn, ["Random.Real8"], seconds=1)
+
+        with pytest.raises(DaqJobAlreadyExists):
+            pool.create_scan_job("job0", "conn1", ["Random.Real8"])
+        with pytest.raises(UnrecognizedConnection):
+            pool.create_scan_job("job9", "unknown", ["Random.Real8"])
+
+        assert pool.list_jobs() == ["job0", "job1", "job2"]
+        assert pool.list_jobs(conn_name="conn2") == ["job1"]
+        assert not wait_for_jobs(queue, ["job0", "job1", "job2"])
+
+        # Config is persisted by the parent process
+        assert config_manager.get("daq_jobs.job1.conn_name") == "conn2"
+        assert pool.update_tags("job1", add=["Random.String"]) == {
+            "added": ["Random.String"],
+            "removed": [],
+        }
+        assert pool.list_tags("job1") == ["Random.Real8", "Random.String"]
+        assert config_manager.get("daq_jobs.job1.tags") == [
+            "Random.Real8",
+            "Random.String",
+        ]
+
+        assert pool.job_stats("job0")["runs"] > 0
+        assert list(pool.job_stats()) == ["job0", "job1", "job2"]
+
+        # Move job to a connection of another worker
+        target = next(
+            c for c in conns if worker_index(c, 2) != worker_index("conn1", 2)
+        )
+        pool.create_scan_job(
+            "job0", target, ["Random.Real8"], seconds=1, update_on_conflict=True
+        )
+        assert pool.list_jobs(conn_name=target) == sorted(
+            ["job0", f"job{conns.index(target)}"]
+        )
+        assert config_manager.get("daq_jobs.job0.conn_name") == target
+
+        pool.remove_job("job2")
+        assert pool.list_jobs() == ["job0", "job1"]
+        assert config_manager.get("daq_jobs.job2") is None
+        with pytest.raises(JobLookupError):
+            pool.list_tags("job2")
+
+        with pytest.raises(ValueError):
+            pool.create_scan_job("job3", "conn1", ["Random.Real8"], phase_policy="x")
+    finally:
+        pool.shutdown()
+
+    # Jobs are recreated from config in workers
+    pool = DAQWorkerPool(
+        config_manager,
+        broker_factory=QueueSinkFactory(queue),
+        processes=2,
+        extra_connectors={"fake": FakeConnector},
+    )
+    try:
+        assert pool.list_jobs() == ["job0", "job1"]
+        assert not wait_for_jobs(queue, ["job0", "job1"])
+    finally:
+        pool.shutdown()
@@ -0,0 +1,78 @@
+import logging
+
+import pytest
+
+from data_agent.api import ServiceApi
+from data_agent.exceptions import UnrecognizedConnection
+from data_agent.metrics import Histogram, RollingStats, ScanJobMetrics
+
+
+def test_rolling_stats():
+    stats = RollingStats(size=100)
+    assert stats.summary() == {"count": 0}
+    assert stats.last is None
+
+    for i in range(200):
+        stats.add(i)
+
+    summary = stats.summary()
+    assert summary["count"] == 200
+    assert summary["last"] == 199
+    assert summary["max"] == 199
+    assert summary["p50"] == 149.5
+    assert summary["p90"] < summary["p99"] < 199
+
+
+def test_scan_job_metrics():
+    metrics = ScanJobMetrics()
+    metrics.record_error(TimeoutError("read timeout"))
+
+    stats = metrics.as_dict()
+    assert stats["errors"] == 1
+    assert stats["last_error"] == "read timeout"
+    assert stats["last_error_time"] is not None
+    assert stats["read_time"] == {"count": 0}
+
+
+def test_histogram():
+    histogram = Histogram([1, 10])
+    for value in [0.5, 1, 5, 20, 30]:
+        histogram.add(value)
+    assert histogram.as_dict() == {"bounds": [1, 10, None], "counts": [2, 1, 2]}
+
+
+def test_api_stats(
+    config_manager, connection_manager, data_exchanger, safe_manipulator, caplog
+):
+    config_manager.set("trace.api_slow_call_seconds", 0)
+    api = ServiceApi(
+        None, connection_manager, data_exchanger, safe_manipulator, config_manager
+    )
+    assert api.get_api_stats() == {}
+
+    api.create_connection("conn", "fake", enabled=True)
+    with caplog.at_level(logging.WARNING, logger="data_agent.api"):
+        values = api.read_tag_values_period(
+            "conn", ["Random.Real8"], first_timestamp="2021-01-01", max_results=100
+        )
+    with pytest.raises(UnrecognizedConnection):
+        api.read_tag_values("unknown", ["Random.Real8"])
+
+    stats = api.get_api_stats()
+    assert set(stats) == {
+        "create_connection",
+        "read_tag_values_period",
+        "read_tag_values",
+    }
+
+    period_stats = api.get_api_stats("read_tag_values_period")
+    assert period_stats["calls"] == 1 and period_stats["slow_calls"] == 1
+    assert period_stats["result_size"]["last"] == len(values)
+    assert sum(period_stats["latency_histogram"]["counts"]) == 1
+
+    # Slow calls are logged with result summary rather than rendered frame
+    assert f"=> DataFrame[{len(values)}]" in caplog.text
+
+    assert stats["read_tag_values"]["errors"] == 1
+    assert "unknown" in stats["read_tag_values"]["last_error"].lower()
+    assert api.get_api_stats("delete_connection") is None
@@ -1,6 +1,20 @@
+import datetime as dt
+
+import numpy as np
 import pandas as pd
 
-from data_agent.msg_packer import decode_payload, encode_dataframe
+from data_agent.msg_packer import (
+    decode_batch_frame,
+    decode_frame,
+    decode_payload,
+    decode_scan_values,
+    encode_batch_frame,
+    encode_dataframe,
+    encode_scan_values,
+    encode_schema_frame,
+    indexed_values_frame,
+    scan_values_frame,
+)
 
 
 def test_encode_decode_roundtrip(test_dataframe):
@@ -40,3 +54,55 @@ def test_metadata_preserved(test_dataframe):
         assert (
             df_decoded[col].dtype == test_dataframe[col].dtype
         ), f"Column {col} dtype should be preserved"
+
+
+def test_scan_values_roundtrip():
+    tag_values = {
+        "Static.Float": {
+            "Value": np.float64(83289.48243),
+            "Quality": "Good",
+            "Timestamp": "09/02/2021T07:42:22.040",
+        },
+        "Static.Int4": {
+            "Value": np.int64(12345),
+            "Quality": "Good",
+            "Timestamp": dt.datetime(2021, 2, 9, 7, 40, 22),
+        },
+        "Random.String": {"Value": "Hello", "Quality": "Bad", "Timestamp": None},
+    }
+
+    payload = encode_scan_values(tag_values, sample_id=7)
+    assert isinstance(payload, (bytes, bytearray)), "Payload should be bytes"
+
+    decoded = decode_scan_values(payload)
+    assert decoded["sample_id"] == 7
+    assert list(decoded["data"]) == list(tag_values)
+    assert decoded["data"]["Static.Float"]["Value"] == 83289.48243
+    assert decoded["data"]["Static.Int4"] == {
+        "Value": 12345,
+        "Quality": "Good",
+        "Timestamp": "2021-02-09T07:40:22",
+    }
+    assert decoded["data"]["Random.String"]["Quality"] == "Bad"
+
+
+def test_batch_frame_roundtrip():
+    tag_values = {
+        "tag1": {"Value": 1.5, "Quality": "Good", "Timestamp": 1700000000.0},
+        "tag2": {"Value": "on", "Quality": "Good", "Timestamp": 1700000000.0},
+    }
+    schema = decode_frame(encode_schema_frame("job1", 3, ["tag1", "tag2"]))
+
+    samples = decode_batch_frame(
+        encode_batch_frame(
+            [
+                scan_values_frame(tag_values, 0),
+                indexed_values_frame(tag_values, ["tag1", "tag2"], 3, 1, positions=[1]),
+            ]
+        ),
+        schema=schema,
+    )
+    assert samples == [
+        {"sample_id": 0, "data": tag_values},
+        {"sample_id": 1, "data": {"tag2": tag_values["tag2"]}},
+    ]
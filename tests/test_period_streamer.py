@@ -0,0 +1,149 @@
+import asyncio
+
+import pandas as pd
+import pytest
+
+from data_agent.api import ServiceApi
+from data_agent.connection_manager import ConnectionManager
+from data_agent.connectors.fake_connector import FakeConnector
+from data_agent.exceptions import StreamingNotAvailable
+from data_agent.msg_packer import decode_frame, decode_payload
+from data_agent.period_streamer import MAX_PENDING_CHUNKS, PeriodStreamer
+
+
+class HourlyConnector(FakeConnector):
+    """Reads hourly values of the period, including both of its ends"""
+
+    TYPE = "hourly"
+
+    def read_tag_values_period(
+        self, tags: list, first_timestamp=None, last_timestamp=None, **kwargs
+    ):
+        index = pd.date_range(first_timestamp, last_timestamp, freq="h", tz="UTC")
+        return pd.DataFrame({tag: range(len(index)) for tag in tags}, index=index)
+
+
+class SlowBroker:
+    """Publishes in background tasks (as the broker connector)"""
+
+    def __init__(self):
+        self.pending = 0
+        self.max_pending = 0
+        self.published = 0
+
+    def publish_data(self, data, headers):
+        asyncio.create_task(self._publish())
+
+    async def _publish(self):
+        self.pending += 1
+        self.max_pending = max(self.max_pending, self.pending)
+        await asyncio.sleep(0.01)
+        self.pending -= 1
+        self.published += 1
+
+
+@pytest.mark.asyncio
+async def test_stream_period(
+    connection_manager, data_exchanger, safe_manipulator, data_sink
+):
+    api = ServiceApi(
+        None,
+        connection_manager,
+        data_exchanger,
+        safe_manipulator,
+        period_streamer=PeriodStreamer(connection_manager, data_sink),
+    )
+    connection_manager.create_connection("conn", conn_type="fake", enabled=True)
+    tags = ["Random.Real8", "Static.Float", "Static.Int4"]
+
+    # 3 windows x 2 tag groups, 100 rows read each time (fake connector)
+    summary = await api.stream_tag_values_period(
+        "conn",
+        tags,
+        first_timestamp="2021-01-01",
+        last_timestamp="2021-01-04",
+        stream_id="stream1",
+        chunk_seconds=24 * 3600,
+        chunk_tags=2,
+        chunk_rows=40,
+    )
+    assert summary["status"] == "completed"
+    assert summary["chunks"] == 3 * 2 * 3 and summary["rows"] == 3 * 2 * 100
+
+    *chunks, (summary_msg, summary_headers) = data_sink.messages
+    assert [h["chunk_num"] for _, h in chunks] == list(range(18))
+    assert all(h["stream_id"] == "stream1" for _, h in data_sink.messages)
+    assert {h["frame_type"] for _, h in chunks} == {"chunk"}
+
+    frames = [decode_payload(data) for data, _ in chunks]
+    assert [len(df) for df in frames[:3]] == [40, 40, 20]
+    assert list(frames[0].columns) == tags[:2]
+    assert list(frames[3].columns) == tags[2:]
+
+    assert summary_headers["frame_type"] == "summary"
+    assert summary_headers["chunk_num"] == 18
+    frame = decode_frame(summary_msg)
+    assert frame["rows"] == 600 and frame["status"] == "completed"
+
+    # Failed stream is closed with a summary frame as well
+    data_sink.messages.clear()
+    with pytest.raises(KeyError):
+        await api.stream_tag_values_period(
+            "conn", ["Unknown.Tag"], "2021-01-01", "2021-01-02", stream_id="stream2"
+        )
+    assert len(data_sink.messages) == 1
+    assert decode_frame(data_sink.messages[0][0])["status"] == "failed"
+
+    # Streams are not part of batches
+    with pytest.raises(ValueError):
+        api.execute_batch([{"method": "stream_tag_values_period"}])
+
+    # No data exchange to stream to
+    api = ServiceApi(None, connection_manager, data_exchanger, safe_manipulator)
+    with pytest.raises(StreamingNotAvailable):
+        await api.stream_tag_values_period("conn", tags, "2021-01-01", "2021-01-02")
+
+
+@pytest.mark.asyncio
+async def test_stream_window_boundaries(config_manager, data_sink):
+    connection_manager = ConnectionManager(
+        config_manager, extra_connectors={"hourly": HourlyConnector}
+    )
+    connection_manager.create_connection("conn", conn_type="hourly", enabled=True)
+
+    # Window boundary rows are streamed once - as a single 3 days read would
+    summary = await PeriodStreamer(connection_manager, data_sink).stream(
+        "conn",
+        ["Random.Real8"],
+        first_timestamp="2021-01-01",
+        last_timestamp="2021-01-04",
+        chunk_seconds=24 * 3600,
+    )
+    assert summary["chunks"] == 3 and summary["rows"] == 3 * 24 + 1
+
+    index = pd.concat(
+        [decode_payload(data) for data, _ in data_sink.messages[:-1]]
+    ).index
+    assert index.is_unique and index.is_monotonic_increasing
+    assert len(index) == 3 * 24 + 1
+
+    connection_manager.close()
+
+
+@pytest.mark.asyncio
+async def test_stream_backpressure(connection_manager):
+    connection_manager.create_connection("conn", conn_type="fake", enabled=True)
+    broker = SlowBroker()
+
+    summary = await PeriodStreamer(connection_manager, broker).stream(
+        "conn",
+        ["Random.Real8"],
+        first_timestamp="2021-01-01",
+        last_timestamp="2021-01-02",
+        chunk_rows=5,
+    )
+    assert summary["chunks"] == 20
+
+    # Chunks wait for the broker instead of piling up
+    assert broker.max_pending <= MAX_PENDING_CHUNKS + 1
+    assert broker.published >= 20 - MAX_PENDING_CHUNKS
@@ -0,0 +1,59 @@
+import os
+
+from data_agent.spool import Spool
+
+
+def test_spool_fifo(tmp_path):
+    spool = Spool(str(tmp_path), max_size=4096, segment_size=1024)
+    assert len(spool) == 0
+    assert spool.peek() is None
+
+    for i in range(20):
+        assert spool.append(f"message {i}".encode() * 10, {"job_id": "job1", "i": i})
+    assert len(spool) == 20
+    assert len(os.listdir(tmp_path)) == 3
+
+    for i in range(20):
+        data, headers = spool.peek()
+        assert data == f"message {i}".encode() * 10
+        assert headers == {"job_id": "job1", "i": i}
+        spool.pop()
+
+    assert len(spool) == 0
+    assert spool.peek() is None
+    assert len(os.listdir(tmp_path)) == 1
+    spool.close()
+
+
+def test_spool_reopen(tmp_path):
+    spool = Spool(str(tmp_path), max_size=4096, segment_size=1024)
+    for i in range(10):
+        spool.append(b"x" * 100, {"i": i})
+    for _ in range(3):
+        spool.pop()
+    spool.close()
+
+    # Read and write positions are recovered
+    spool = Spool(str(tmp_path), max_size=4096, segment_size=1024)
+    assert len(spool) == 7
+    assert spool.peek()[1] == {"i": 3}
+
+    spool.append(b"y", {"i": 10})
+    assert len(spool) == 8
+    spool.close()
+
+
+def test_spool_eviction(tmp_path):
+    spool = Spool(str(tmp_path), max_size=2048, segment_size=1024)
+
+    # ~8 messages per segment - the oldest segment is evicted when the 3rd is needed
+    for i in range(20):
+        spool.append(b"x" * 100, {"i": i})
+
+    assert spool.size <= 2048
+    assert spool.dropped == 20 - len(spool) > 0
+    assert spool.peek()[1]["i"] == spool.dropped
+
+    # Message which doesn't fit into a segment is dropped
+    assert not spool.append(b"x" * 2048, {})
+    spool.close()
@@ -0,0 +1,20 @@
+from data_agent.tag_set import TagSet
+
+
+def test_tag_set():
+    tags = TagSet(["b", "a", "b", "c"])
+    assert list(tags) == ["b", "a", "c"]
+    assert len(tags) == 3
+    assert "a" in tags and "d" not in tags
+    assert tags[2] == "c"
+    assert tags.index("c") == 2
+    assert tags == ["b", "a", "c"]
+    assert tags == TagSet(["b", "a", "c"])
+
+    added, removed = tags.update(add=["d", "a", "e"], remove=["a", "x"])
+    assert added == ["d", "a", "e"]
+    assert removed == ["a"]
+    assert list(tags) == ["b", "c", "d", "a", "e"]
+    assert [tags.index(t) for t in tags] == [0, 1, 2, 3, 4]
+
+    assert tags.update(add=["b"], remove=["x"]) == ([], [])